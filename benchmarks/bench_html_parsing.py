@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for JobScraper HTML parsing over saved result pages
+
+Compares the original parsing path (html.parser plus a separate regex tree
+walk per field) against the current single-pass extractors on every
+available BeautifulSoup backend.
+
+Usage: python benchmarks/bench_html_parsing.py [iterations]
+"""
+import re
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from job_scraper import JobScraper  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+def legacy_parse_indeed(html: str, max_results: int):
+    """Reference copy of the pre-optimization Indeed parser"""
+    jobs = []
+    soup = BeautifulSoup(html, 'html.parser')
+    for card in soup.find_all(['div'], class_=re.compile(r'job_seen_beacon|result|jobsearch-SerpJobCard'))[:max_results]:
+        title_elem = card.find(['h2', 'a'], attrs={'data-jk': True}) or card.find('a', href=re.compile(r'/viewjob'))
+        if not title_elem:
+            title_elem = card.find(['span', 'a'], class_=re.compile(r'jobTitle'))
+        title, link = "Unknown Title", "#"
+        if title_elem:
+            target = title_elem if title_elem.name == 'a' else title_elem.find('a')
+            if target:
+                title = target.get_text(strip=True)
+                href = target.get('href', '')
+                link = f"https://www.indeed.com{href}" if href.startswith('/') else href
+            else:
+                title = title_elem.get_text(strip=True)
+        company_elem = card.find(['span', 'div', 'a'], class_=re.compile(r'companyName'))
+        location_elem = card.find(['div', 'span'], attrs={'data-testid': 'job-location'}) or \
+            card.find(class_=re.compile(r'companyLocation'))
+        salary_elem = card.find(['span', 'div'], class_=re.compile(r'salary'))
+        date_elem = card.find(['span'], class_=re.compile(r'date'))
+        snippet_elem = card.find(['div', 'span'], class_=re.compile(r'summary'))
+        jobs.append({
+            "title": title,
+            "company": company_elem.get_text(strip=True) if company_elem else "Unknown Company",
+            "location": location_elem.get_text(strip=True) if location_elem else "Remote/Unknown",
+            "salary": salary_elem.get_text(strip=True) if salary_elem else "Not specified",
+            "link": link,
+            "source": "Indeed",
+            "posted_date": date_elem.get_text(strip=True) if date_elem else "Recently",
+            "snippet": snippet_elem.get_text(strip=True)[:200] + "..." if snippet_elem else "",
+            "match_keywords": []
+        })
+    return jobs
+
+
+def legacy_parse_glassdoor(html: str, max_results: int):
+    """Reference copy of the pre-optimization Glassdoor parser"""
+    jobs = []
+    soup = BeautifulSoup(html, 'html.parser')
+    for card in soup.find_all(['li', 'div'], class_=re.compile(r'job.*result|JobSearchCard'))[:max_results]:
+        title_elem = card.find('a', class_=re.compile(r'jobTitle'))
+        company_elem = card.find(['span', 'div'], class_=re.compile(r'employer'))
+        location_elem = card.find(['span', 'div'], class_=re.compile(r'location'))
+        salary_elem = card.find(['span', 'div'], class_=re.compile(r'salary'))
+        jobs.append({
+            "title": title_elem.get_text(strip=True) if title_elem else "Unknown Title",
+            "company": company_elem.get_text(strip=True) if company_elem else "Unknown Company",
+            "location": location_elem.get_text(strip=True) if location_elem else "Unknown Location",
+            "salary": salary_elem.get_text(strip=True) if salary_elem else "Not specified",
+            "link": "https://www.glassdoor.com" + title_elem.get('href', '#') if title_elem else "#",
+            "source": "Glassdoor",
+            "posted_date": "Recently",
+            "snippet": "",
+            "match_keywords": []
+        })
+    return jobs
+
+
+def available_backends():
+    backends = ['html.parser']
+    for name, module in (('lxml', 'lxml'), ('html5lib', 'html5lib')):
+        try:
+            __import__(module)
+            backends.append(name)
+        except ImportError:
+            pass
+    return backends
+
+
+def time_call(func, iterations: int) -> float:
+    """Return mean milliseconds per call"""
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    max_results = 15
+    scraper = JobScraper()
+    pages = {
+        "indeed": ((FIXTURES / "indeed_serp.html").read_text(), legacy_parse_indeed, scraper.parse_indeed_page),
+        "glassdoor": ((FIXTURES / "glassdoor_serp.html").read_text(), legacy_parse_glassdoor, scraper.parse_glassdoor_page),
+    }
+
+    print(f"HTML parsing benchmark ({iterations} iterations per case)")
+    print(f"{'page':<10} {'path':<28} {'ms/page':>9} {'speedup':>8}")
+    for page, (html, legacy, current) in pages.items():
+        baseline = time_call(lambda: legacy(html, max_results), iterations)
+        print(f"{page:<10} {'legacy (html.parser)':<28} {baseline:>9.2f} {'1.00x':>8}")
+        reference = legacy(html, max_results)
+        for backend in available_backends():
+            scraper.html_parser = backend
+            result = current(html, max_results)
+            same = "" if result == reference else "  (output differs)"
+            elapsed = time_call(lambda: current(html, max_results), iterations)
+            print(f"{page:<10} {'single-pass (' + backend + ')':<28} {elapsed:>9.2f} {baseline / elapsed:>7.2f}x{same}")
+
+
+if __name__ == "__main__":
+    main()
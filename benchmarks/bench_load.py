@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Offline load benchmark for /match, /extract-skills and /search-jobs
+
+Generates a PDF corpus, starts the stub job boards and the API (with the
+fake Gemini backend) in a subprocess, then drives each endpoint at a fixed
+concurrency and reports p50/p95/p99 latency and requests per second.
+Nothing leaves the machine, so it runs in CI.
+
+Each endpoint gets its own corpus, by default one document per request, so
+results measure cold extractions; pass a smaller --corpus-size to include
+skill cache hits. A few warm-up requests (not counted) start the PDF and
+parser worker pools first.
+
+With --baseline, the run is compared against an earlier --json report and
+exits with status 1 if any endpoint's p95 grew by more than --tolerance.
+
+--workers runs the API as a multi-worker server to measure how throughput
+scales with processes. The requests the stub boards received are reported
+too; with --scrape-rate they should stay within one budget per board,
+however many workers there are.
+
+Usage: python benchmarks/bench_load.py [--requests 50] [--concurrency 8] [--pages 1] [--workers 1]
+                                       [--endpoints match,extract-skills,search-jobs] [--scrape-rate 2]
+                                       [--json report.json] [--baseline report.json]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import aiohttp
+
+from pdf_corpus import SKILLS, ROLES, create_corpus
+from stub_boards import start_stub_boards
+
+ENDPOINTS = ("match", "extract-skills", "search-jobs")
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(q / 100 * len(sorted_values)) - 1)]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "rps": round((len(latencies) + errors) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 1),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 1),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 1),
+        "max_ms": round(ordered[-1] * 1000, 1) if ordered else 0.0,
+    }
+
+
+def request_factory(endpoint: str, corpus: Dict[str, List[str]]):
+    """Return a function building the (method, path, kwargs) of the n-th request"""
+    documents = {path: Path(path).read_bytes() for paths in corpus.values() for path in paths}
+    resumes, jobs = corpus["resumes"], corpus["job_descriptions"]
+
+    def upload(form: aiohttp.FormData, field: str, path: str):
+        form.add_field(field, documents[path], filename=Path(path).name, content_type="application/pdf")
+
+    def build(n: int):
+        if endpoint == "match":
+            form = aiohttp.FormData()
+            upload(form, "resume", resumes[n % len(resumes)])
+            # Offset pairing so consecutive passes over the corpus send new pairs
+            upload(form, "job_desc", jobs[(n + n // len(jobs)) % len(jobs)])
+            return "POST", "/match", {"data": form}
+        if endpoint == "extract-skills":
+            form = aiohttp.FormData()
+            upload(form, "file", (resumes + jobs)[n % (len(resumes) + len(jobs))])
+            return "POST", "/extract-skills", {"data": form}
+        skills = [SKILLS[(n * 7 + i) % len(SKILLS)] for i in range(3)]
+        return "POST", "/search-jobs", {"json": {"skills": skills, "roles": [ROLES[n % len(ROLES)]]}}
+
+    return build
+
+
+async def run_endpoint(session: aiohttp.ClientSession, base_url: str, endpoint: str, corpus: Dict[str, List[str]],
+                       requests: int, concurrency: int) -> Dict[str, float]:
+    build = request_factory(endpoint, corpus)
+    counter = itertools.count()
+    latencies, errors = [], 0
+
+    async def worker():
+        nonlocal errors
+        while (n := next(counter)) < requests:
+            method, path, kwargs = build(n)
+            start = time.perf_counter()
+            try:
+                async with session.request(method, base_url + path, **kwargs) as response:
+                    await response.read()
+                    ok = response.status == 200
+            except aiohttp.ClientError:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+async def warm_up(session: aiohttp.ClientSession, base_url: str):
+    """Start the server's worker pools with documents outside the corpus"""
+    form = aiohttp.FormData()
+    form.add_field("file", (Path(__file__).resolve().parent.parent / "dummy_resume.pdf").read_bytes(),
+                   filename="dummy_resume.pdf", content_type="application/pdf")
+    async with session.post(base_url + "/extract-skills", data=form) as response:
+        await response.read()
+    async with session.post(base_url + "/search-jobs", json={"skills": ["warm-up"], "roles": []}) as response:
+        await response.read()
+
+
+async def board_requests(session: aiohttp.ClientSession, board_port: int) -> Dict[str, int]:
+    """Requests the stub job boards have served so far"""
+    async with session.get(f"http://127.0.0.1:{board_port}/stats") as response:
+        return await response.json()
+
+
+async def wait_until_ready(session: aiohttp.ClientSession, base_url: str, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            async with session.get(base_url + "/ready") as response:
+                if response.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.25)
+    raise RuntimeError(f"API at {base_url} did not become ready within {timeout:.0f}s")
+
+
+def start_server(args) -> subprocess.Popen:
+    env = dict(os.environ)
+    env["SCRAPER_INDEED_URL"] = env["SCRAPER_GLASSDOOR_URL"] = f"http://127.0.0.1:{args.board_port}"
+    if args.scrape_rate:
+        env["SCRAPER_RATE"] = env["SCRAPER_RATE_GLASSDOOR"] = str(args.scrape_rate)
+        env["SCRAPER_BURST"] = env["SCRAPER_BURST_GLASSDOOR"] = "1"
+    command = [
+        sys.executable, str(Path(__file__).resolve().parent / "bench_server.py"),
+        "--port", str(args.port), "--seed", str(args.seed), "--workers", str(args.workers),
+        "--llm-latency-ms", str(args.llm_latency_ms), "--llm-jitter-ms", str(args.llm_jitter_ms),
+    ]
+    if args.llm_responses:
+        command += ["--llm-responses", args.llm_responses]
+    output = None if args.verbose else subprocess.DEVNULL
+    return subprocess.Popen(command, env=env, stdout=output, stderr=output)
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Endpoints whose p95 regressed beyond the tolerance"""
+    regressions = []
+    for endpoint, result in report["results"].items():
+        before = baseline.get("results", {}).get(endpoint)
+        if before and before["p95_ms"] and result["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{endpoint}: p95 {before['p95_ms']} ms -> {result['p95_ms']} ms")
+    return regressions
+
+
+async def run(args) -> Dict:
+    corpus_dir = Path(args.corpus_dir or tempfile.mkdtemp(prefix="skillmatch-bench-"))
+    corpus_size = args.corpus_size or args.requests
+    corpora = {
+        endpoint: create_corpus(str(corpus_dir / endpoint), corpus_size, args.pages, args.seed + index)
+        for index, endpoint in enumerate(args.endpoints)
+    }
+
+    boards = await start_stub_boards(port=args.board_port, latency=args.board_latency_ms / 1000)
+    server = None if args.url else start_server(args)
+    base_url = args.url or f"http://127.0.0.1:{args.port}"
+    try:
+        timeout = aiohttp.ClientTimeout(total=args.timeout)
+        connector = aiohttp.TCPConnector(limit=args.concurrency)
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+            await wait_until_ready(session, base_url)
+            await warm_up(session, base_url)
+            results = {}
+            board_start = await board_requests(session, args.board_port)
+            start = time.perf_counter()
+            for endpoint in args.endpoints:
+                results[endpoint] = await run_endpoint(session, base_url, endpoint, corpora[endpoint],
+                                                       args.requests, args.concurrency)
+            elapsed = time.perf_counter() - start
+            board_end = await board_requests(session, args.board_port)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+        await boards.cleanup()
+
+    return {
+        "config": {
+            "requests": args.requests, "concurrency": args.concurrency, "pages": args.pages,
+            "corpus_size": corpus_size, "llm_latency_ms": args.llm_latency_ms,
+            "llm_jitter_ms": args.llm_jitter_ms, "board_latency_ms": args.board_latency_ms, "seed": args.seed,
+            "workers": args.workers, "scrape_rate": args.scrape_rate,
+        },
+        "results": results,
+        "board_requests": {
+            board: {"requests": count - board_start[board], "rps": round((count - board_start[board]) / elapsed, 2)}
+            for board, count in board_end.items()
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS),
+                        type=lambda value: [name.strip() for name in value.split(",") if name.strip() in ENDPOINTS])
+    parser.add_argument("--requests", type=int, default=50, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--pages", type=int, default=1, help="approximate pages per generated PDF")
+    parser.add_argument("--corpus-size", type=int, default=0,
+                        help="resumes (and job descriptions) per endpoint (default: one per request)")
+    parser.add_argument("--corpus-dir", help="where to write the PDFs (default: a temporary directory)")
+    parser.add_argument("--llm-latency-ms", type=float, default=800)
+    parser.add_argument("--llm-jitter-ms", type=float, default=200)
+    parser.add_argument("--llm-responses", help="JSON file of recorded extractions to replay")
+    parser.add_argument("--board-latency-ms", type=float, default=200)
+    parser.add_argument("--scrape-rate", type=float, default=0,
+                        help="per-board scraper budget in requests/sec (default: unlimited)")
+    parser.add_argument("--workers", type=int, default=1, help="API server processes")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--board-port", type=int, default=8765)
+    parser.add_argument("--url", help="benchmark an already running API instead of starting one")
+    parser.add_argument("--timeout", type=float, default=120, help="per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--baseline", help="earlier --json report to compare p95 latencies against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 growth over the baseline")
+    parser.add_argument("--verbose", action="store_true", help="show the API server's output")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    print(f"Load benchmark: {args.requests} requests per endpoint, concurrency {args.concurrency}, "
+          f"{args.workers} worker(s), {args.pages}-page PDFs, "
+          f"LLM {args.llm_latency_ms:.0f}±{args.llm_jitter_ms:.0f} ms, boards {args.board_latency_ms:.0f} ms")
+    print(f"{'endpoint':<16} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'errors':>7}")
+    for endpoint, result in report["results"].items():
+        print(f"{endpoint:<16} {result['rps']:>8.2f} {result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} "
+              f"{result['p99_ms']:>9.1f} {result['max_ms']:>9.1f} {result['errors']:>7}")
+    print("job board requests: " + ", ".join(
+        f"{board} {counts['requests']} ({counts['rps']:.2f}/s)" for board, counts in report["board_requests"].items()
+    ))
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+    if args.baseline:
+        regressions = compare(report, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Run the API against the fake Gemini backend for load benchmarks
+
+Persistent stores default to off (or in-memory) so every run starts cold,
+and the scraper's per-board rate limits are lifted so the stub job boards
+are not throttled. Any of these can still be overridden in the
+environment.
+
+With --workers above 1 the API runs under gunicorn with the production
+settings (gunicorn.conf.py): the app and the fake backend are preloaded
+before forking, and the search cache and scraper rate limits are shared
+through SQLite files in a fresh temporary directory.
+
+Usage: python benchmarks/bench_server.py [--port 8090] [--llm-latency-ms 800] [--llm-jitter-ms 200]
+                                         [--llm-responses recorded.json] [--seed 42] [--workers 1]
+"""
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+BENCH_ENV = {
+    "GEMINI_API_KEY": "benchmark",
+    "SKILL_CACHE_DB": "",
+    "JOB_INDEX_DB": "",
+    "MATCH_JOBS_DB": "",
+    "SCRAPER_RATE": "10000",
+    "SCRAPER_BURST": "10000",
+    "SCRAPER_RATE_GLASSDOOR": "10000",
+    "SCRAPER_BURST_GLASSDOOR": "10000",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--llm-latency-ms", type=float, default=800)
+    parser.add_argument("--llm-jitter-ms", type=float, default=200)
+    parser.add_argument("--llm-responses", help="JSON file of recorded extractions to replay")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=1, help="server processes (gunicorn above 1)")
+    args = parser.parse_args()
+
+    for name, value in BENCH_ENV.items():
+        os.environ.setdefault(name, value)
+    root = Path(__file__).resolve().parent.parent
+    sys.path.insert(0, str(root))
+    # main.py serves frontend/ relative to the working directory
+    os.chdir(root)
+
+    if args.workers > 1:
+        state_dir = Path(tempfile.mkdtemp(prefix="skillmatch-bench-state-"))
+        os.environ.setdefault("SEARCH_CACHE_DB", str(state_dir / "search_cache.db"))
+        os.environ.setdefault("SCRAPER_RATE_DB", str(state_dir / "scraper_rate.db"))
+        os.environ["WORKERS"] = str(args.workers)
+        from server_config import apply_multiworker_defaults
+        apply_multiworker_defaults(args.workers)
+
+    import uvicorn
+    import main as api
+    from fake_gemini import FakeGemini
+
+    options = dict(latency=args.llm_latency_ms / 1000, jitter=args.llm_jitter_ms / 1000, seed=args.seed)
+    api.model = FakeGemini.from_file(args.llm_responses, **options) if args.llm_responses else FakeGemini(**options)
+    if args.workers <= 1:
+        uvicorn.run(api.app, host=args.host, port=args.port, log_level="warning")
+        return
+
+    from gunicorn.app.base import Application
+
+    class BenchApplication(Application):
+        def load_config(self):
+            self.load_config_from_file(str(root / "gunicorn.conf.py"))
+            self.cfg.set("bind", f"{args.host}:{args.port}")
+            self.cfg.set("accesslog", None)
+            self.cfg.set("loglevel", "warning")
+
+        def load(self):
+            return api.app
+
+    BenchApplication().run()
+
+
+if __name__ == "__main__":
+    main()
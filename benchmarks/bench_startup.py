@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark: import time of main.py and time until /health and /ready answer
+
+Each run uses a fresh interpreter, so nothing is served from an already
+warm module cache. The import phase reports the median time of
+``import main`` and the slowest modules it imports directly (from
+``python -X importtime``); the server phase starts ``uvicorn main:app``
+and polls /health (liveness) and /ready (warm-up finished) until each
+returns 200. No request reaches Gemini, so a placeholder key is enough.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--port 8091] [--top 10] [--json report.json]
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+STARTUP_ENV = {
+    "GEMINI_API_KEY": "benchmark",
+    "SKILL_CACHE_DB": "",
+    "JOB_INDEX_DB": "",
+    "MATCH_JOBS_DB": "",
+}
+
+IMPORTTIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+
+def bench_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    for name, value in STARTUP_ENV.items():
+        env.setdefault(name, value)
+    return env
+
+
+def import_seconds() -> float:
+    """Wall time of ``import main`` in a fresh interpreter"""
+    code = "import time; start = time.perf_counter(); import main; print(time.perf_counter() - start)"
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=bench_env(),
+                            capture_output=True, text=True, check=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def slowest_imports(top: int) -> List[Dict]:
+    """Modules imported directly by main.py, by cumulative import time"""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], cwd=ROOT, env=bench_env(),
+                            capture_output=True, text=True, check=True).stderr
+    entries = [(int(cumulative), len(indent), name)
+               for _, cumulative, indent, name in IMPORTTIME_RE.findall(stderr)]
+    # Children are printed before their parent, indented two spaces deeper
+    main_depth = next(depth for _, depth, name in entries if name == "main")
+    direct = [(cumulative, name) for cumulative, depth, name in entries if depth == main_depth + 2]
+    return [{"module": name, "ms": round(cumulative / 1000, 1)} for cumulative, name in sorted(direct, reverse=True)[:top]]
+
+
+def status(url: str) -> Optional[int]:
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return None
+
+
+def cold_start(port: int, timeout: float) -> Dict[str, float]:
+    """Seconds from launching uvicorn until /health, then /ready, first return 200"""
+    base_url = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=ROOT, env=bench_env(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    timings = {}
+    try:
+        for name in ("health", "ready"):
+            while status(f"{base_url}/{name}") != 200:
+                if server.poll() is not None:
+                    raise RuntimeError(f"Server exited with status {server.returncode}")
+                if time.perf_counter() - start > timeout:
+                    raise RuntimeError(f"/{name} did not return 200 within {timeout:.0f}s")
+                time.sleep(0.01)
+            timings[f"{name}_s"] = time.perf_counter() - start
+        with urllib.request.urlopen(f"{base_url}/ready", timeout=1) as response:
+            components = json.loads(response.read())["components"]
+        timings["components"] = {name: component["seconds"] for name, component in components.items()}
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8091)
+    parser.add_argument("--top", type=int, default=10, help="slowest direct imports to list")
+    parser.add_argument("--timeout", type=float, default=60, help="per-run limit for /ready in seconds")
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args()
+
+    imports = [import_seconds() for _ in range(args.runs)]
+    starts = [cold_start(args.port, args.timeout) for _ in range(args.runs)]
+    report = {
+        "config": {"runs": args.runs, "python": sys.version.split()[0]},
+        "import_main_ms": round(statistics.median(imports) * 1000, 1),
+        "slowest_imports": slowest_imports(args.top),
+        "health_ms": round(statistics.median(run["health_s"] for run in starts) * 1000, 1),
+        "ready_ms": round(statistics.median(run["ready_s"] for run in starts) * 1000, 1),
+        "warm_up_ms": {
+            name: round(statistics.median(run["components"][name] for run in starts) * 1000, 1)
+            for name in starts[0]["components"]
+        },
+    }
+
+    print(f"Cold start benchmark: median of {args.runs} runs")
+    print(f"{'import main':<24} {report['import_main_ms']:>9.1f} ms")
+    print(f"{'first 200 from /health':<24} {report['health_ms']:>9.1f} ms")
+    print(f"{'first 200 from /ready':<24} {report['ready_ms']:>9.1f} ms")
+    print("Warm-up steps:")
+    for name, ms in report["warm_up_ms"].items():
+        print(f"  {name:<22} {ms:>9.1f} ms")
+    print("Slowest imports in main.py:")
+    for entry in report["slowest_imports"]:
+        print(f"  {entry['module']:<22} {entry['ms']:>9.1f} ms")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Deterministic stand-in for the Gemini model used by load benchmarks
+
+``FakeGemini.generate_content`` has the same shape as the SDK call main.py
+makes: it blocks for a configurable latency (it runs on the LLM thread
+pool, like the real client) and returns an object exposing
+``candidates[0].content.parts[0].text`` and ``usage_metadata``. Answers
+are scripted from the document text (known skills found in it), or
+replayed from a recorded JSON file: either a list of extractions, picked
+by document hash, or an object keyed by the SHA-256 of the document text
+as sent to the model (after preprocessing). Latency jitter is derived
+from the prompt, so a given corpus sees the same latencies on every run.
+"""
+import hashlib
+import json
+import random
+import re
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Union
+
+from pdf_corpus import ROLES, SKILLS
+
+_BATCH_DOCUMENT_RE = re.compile(r'<document id="(d\d+)">\n(.*?)\n</document>', re.S)
+_SINGLE_DOCUMENT_RE = re.compile(r'---\n(.*?)\n\s*---', re.S)
+
+
+def document_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def scripted_extraction(text: str) -> Dict:
+    """Skills named in the text, the first role mentioned, and a one-line summary"""
+    lowered = text.lower()
+    skills = [skill for skill in SKILLS if re.search(r'(?<!\w)' + re.escape(skill.lower()) + r'(?!\w)', lowered)]
+    roles = [role for role in ROLES if role.lower() in lowered][:2] or ["Software Engineer"]
+    return {"skills": skills, "roles": roles, "summary": f"{roles[0]} experienced in {', '.join(skills[:3])}"}
+
+
+class FakeGemini:
+    """Scripted or replayed model answers with a configurable, reproducible latency"""
+
+    def __init__(self, latency: float = 0.8, jitter: float = 0.2, seed: int = 42,
+                 recorded: Optional[Union[Dict[str, Dict], List[Dict]]] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.seed = seed
+        self.recorded = recorded or {}
+        self.calls = 0
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "FakeGemini":
+        """Replay recorded extractions ({"skills", "roles", "summary"} objects, as a list or keyed by hash)"""
+        with open(path, encoding="utf-8") as handle:
+            return cls(recorded=json.load(handle), **kwargs)
+
+    def _extract(self, text: str) -> Dict:
+        key = document_key(text)
+        if isinstance(self.recorded, list):
+            return self.recorded[int(key, 16) % len(self.recorded)] if self.recorded else scripted_extraction(text)
+        return self.recorded.get(key) or scripted_extraction(text)
+
+    def _answer(self, prompt: str) -> str:
+        documents = _BATCH_DOCUMENT_RE.findall(prompt)
+        if documents:
+            return json.dumps({"documents": [{"id": doc_id, **self._extract(text)} for doc_id, text in documents]})
+        match = _SINGLE_DOCUMENT_RE.search(prompt)
+        return json.dumps(self._extract(match.group(1).strip() if match else prompt))
+
+    def generate_content(self, prompt: str):
+        self.calls += 1
+        rng = random.Random(f"{self.seed}:{document_key(prompt)}")
+        time.sleep(max(0.0, self.latency + rng.uniform(-self.jitter, self.jitter)))
+        text = self._answer(prompt)
+        part = SimpleNamespace(text=text)
+        return SimpleNamespace(
+            candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))],
+            usage_metadata=SimpleNamespace(prompt_token_count=len(prompt) // 4 + 1,
+                                           candidates_token_count=len(text) // 4 + 1)
+        )
+
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Deterministic resume and job description PDF corpora for load benchmarks
+
+Documents are assembled from fixed skill, role and filler pools with a
+seeded RNG, so the same arguments always produce the same files. Every
+document is distinct, so runs measure extraction rather than skill cache
+hits. ``pages`` controls the size: roughly that many pages of experience
+or responsibility bullets are added.
+
+Usage: python benchmarks/pdf_corpus.py OUTPUT_DIR [count] [pages] [seed]
+"""
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from create_dummy_pdfs import write_text_pdf  # noqa: E402
+
+SKILLS = [
+    "Python", "JavaScript", "TypeScript", "Java", "Go", "Rust", "SQL", "C++",
+    "FastAPI", "Django", "Flask", "React", "Node.js", "Vue.js", "Spring Boot",
+    "PostgreSQL", "MySQL", "MongoDB", "Redis", "Elasticsearch", "Kafka",
+    "AWS", "GCP", "Azure", "Docker", "Kubernetes", "Terraform", "CI/CD", "Git",
+    "TensorFlow", "PyTorch", "Scikit-learn", "Pandas", "NumPy", "Spark", "Airflow",
+]
+ROLES = [
+    "Backend Engineer", "Full Stack Developer", "Data Scientist", "Machine Learning Engineer",
+    "DevOps Engineer", "Data Engineer", "Senior Python Developer", "Platform Engineer",
+]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries", "Wayne Tech"]
+ACTIONS = [
+    "Built and maintained services using {0} and {1}",
+    "Migrated legacy workloads to {0}, cutting costs by {2}%",
+    "Designed data pipelines with {0} feeding {1} dashboards",
+    "Led a team of {3} engineers delivering {0} features",
+    "Improved {0} query latency by {2}% through indexing and caching",
+    "Automated deployments with {0} and {1}",
+]
+# Lines per page of bullets, roughly what write_text_pdf fits on a letter page
+LINES_PER_PAGE = 38
+
+
+def _bullets(rng: random.Random, skills: List[str], count: int) -> List[str]:
+    return [
+        "• " + rng.choice(ACTIONS).format(rng.choice(skills), rng.choice(skills), rng.randint(10, 60), rng.randint(2, 9))
+        for _ in range(count)
+    ]
+
+
+def resume_sections(rng: random.Random, pages: int):
+    skills = rng.sample(SKILLS, rng.randint(8, 14))
+    role = rng.choice(ROLES)
+    sections = [
+        ("Professional Summary", [f"{role} with {rng.randint(2, 15)}+ years of experience in {', '.join(skills[:3])}."]),
+        ("Technical Skills", [f"• {', '.join(skills[i:i + 5])}" for i in range(0, len(skills), 5)]),
+    ]
+    jobs = max(1, pages * 2)
+    per_job = max(4, pages * LINES_PER_PAGE // jobs - 2)
+    for job in range(jobs):
+        sections.append((f"{rng.choice(ROLES)} - {rng.choice(COMPANIES)} ({2023 - 2 * job - 2}-{2023 - 2 * job})",
+                         _bullets(rng, skills, per_job)))
+    sections.append(("Education", ["Bachelor of Science in Computer Science"]))
+    return f"{rng.choice(['Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan'])} {rng.choice(['Lee', 'Patel', 'Garcia', 'Kim'])} - {role}", sections
+
+
+def job_description_sections(rng: random.Random, pages: int):
+    skills = rng.sample(SKILLS, rng.randint(6, 12))
+    role = rng.choice(ROLES)
+    sections = [
+        ("Job Overview", [f"{rng.choice(COMPANIES)} is hiring a {role} to join its platform team."]),
+        ("Required Skills & Qualifications", [f"• {rng.randint(2, 8)}+ years of experience with {skill}" for skill in skills]),
+        ("Key Responsibilities", _bullets(rng, skills, max(5, pages * LINES_PER_PAGE - len(skills) - 12))),
+        ("Benefits", ["• Competitive salary and equity package", "• Comprehensive health insurance"]),
+    ]
+    return role, sections
+
+
+def create_corpus(output_dir: str, count: int = 10, pages: int = 1, seed: int = 42) -> Dict[str, List[str]]:
+    """Write ``count`` resumes and ``count`` job descriptions and return their paths by kind"""
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    corpus = {"resumes": [], "job_descriptions": []}
+    for index in range(count):
+        path = output / f"resume_{pages}p_{index:03d}.pdf"
+        write_text_pdf(str(path), *resume_sections(rng, pages))
+        corpus["resumes"].append(str(path))
+        path = output / f"job_{pages}p_{index:03d}.pdf"
+        write_text_pdf(str(path), *job_description_sections(rng, pages))
+        corpus["job_descriptions"].append(str(path))
+    return corpus
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    created = create_corpus(sys.argv[1], *(int(arg) for arg in sys.argv[2:5]))
+    print(f"Created {len(created['resumes'])} resumes and {len(created['job_descriptions'])} job descriptions in {sys.argv[1]}")
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Local HTTP stand-in for the Indeed and Glassdoor search pages
+
+Serves the recorded result pages in benchmarks/fixtures on the paths the
+scraper requests, after a configurable delay. Point the API at it with
+SCRAPER_INDEED_URL and SCRAPER_GLASSDOOR_URL.
+
+Usage: python benchmarks/stub_boards.py [port] [latency_ms]
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+from aiohttp import web
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+def create_app(latency: float = 0.2) -> web.Application:
+    pages = {
+        "indeed": (FIXTURES / "indeed_serp.html").read_text(),
+        "glassdoor": (FIXTURES / "glassdoor_serp.html").read_text(),
+    }
+    requests = {"indeed": 0, "glassdoor": 0}
+
+    def serve(board: str):
+        async def handler(request: web.Request) -> web.Response:
+            requests[board] += 1
+            await asyncio.sleep(latency)
+            return web.Response(text=pages[board], content_type="text/html")
+        return handler
+
+    async def stats(request: web.Request) -> web.Response:
+        return web.json_response(requests)
+
+    app = web.Application()
+    app.router.add_get("/jobs", serve("indeed"))
+    app.router.add_get("/Job/jobs.htm", serve("glassdoor"))
+    app.router.add_get("/stats", stats)
+    return app
+
+
+async def start_stub_boards(host: str = "127.0.0.1", port: int = 8765, latency: float = 0.2) -> web.AppRunner:
+    """Start the stub on the running event loop; call ``cleanup()`` on the result to stop it"""
+    runner = web.AppRunner(create_app(latency))
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 200
+    print(f"Stub job boards on http://127.0.0.1:{port} ({latency_ms:.0f} ms per page)")
+    web.run_app(create_app(latency_ms / 1000), host="127.0.0.1", port=port, print=None)
@@ -6,6 +6,34 @@ from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 import os
 
+def write_text_pdf(filename, title, sections):
+    """Write a titled document of (heading, lines) sections, starting new pages as needed"""
+    c = canvas.Canvas(filename, pagesize=letter)
+    width, height = letter
+    
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(50, height - 50, title)
+    y_pos = height - 90
+    for heading, lines in sections:
+        if y_pos < 100:
+            c.showPage()
+            y_pos = height - 50
+        c.setFont("Helvetica-Bold", 14)
+        c.drawString(50, y_pos, heading)
+        y_pos -= 22
+        c.setFont("Helvetica", 11)
+        for line in lines:
+            if y_pos < 50:
+                c.showPage()
+                c.setFont("Helvetica", 11)
+                y_pos = height - 50
+            c.drawString(50, y_pos, line)
+            y_pos -= 18
+        y_pos -= 12
+    
+    c.save()
+    return filename
+
 def create_dummy_resume():
     """Create a dummy resume PDF"""
     filename = "dummy_resume.pdf"
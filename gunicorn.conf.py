@@ -0,0 +1,59 @@
+"""
+Gunicorn settings for the multi-worker production server
+
+run.py starts gunicorn with this file when WORKERS resolves to more than one process;
+it can also be used directly: gunicorn main:app --config gunicorn.conf.py
+"""
+import gc
+import os
+import random
+import time
+
+from dotenv import load_dotenv
+
+from server_config import apply_multiworker_defaults, worker_count
+
+# .env values take precedence over the multi-worker defaults, as with run.py
+load_dotenv()
+
+workers = worker_count()
+# Components read their settings when main is imported, so the defaults go in first
+apply_multiworker_defaults(workers)
+
+worker_class = "uvicorn.workers.UvicornWorker"
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', os.getenv('WEBSITES_PORT', '8001'))}"
+
+# Import the app, its libraries and read-only data once in the master; workers share them copy-on-write
+preload_app = True
+
+# Recycle a worker after about WORKER_MAX_REQUESTS requests (0 disables), jittered so workers restart one
+# at a time. Done by worker_recycler rather than gunicorn's max_requests, which drops keep-alive requests.
+recycle_requests = int(os.getenv("WORKER_MAX_REQUESTS", "10000"))
+# Time a recycled or stopping worker gets to finish in-flight requests and queued /match/async jobs
+graceful_timeout = int(os.getenv("WORKER_GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("WORKER_TIMEOUT", "120"))
+keepalive = 5
+
+accesslog = "-"
+loglevel = "debug" if os.getenv("DEBUG", "False").lower() == "true" else "info"
+
+
+def when_ready(server):
+    """Runs in the master after the app was imported and before the first worker is forked"""
+    import main
+
+    start = time.perf_counter()
+    main.preload()
+    # Keep preloaded objects out of the collector so workers do not copy their pages when it runs
+    gc.freeze()
+    server.log.info("Preloaded shared libraries and data in %.2fs; starting %d workers",
+                    time.perf_counter() - start, workers)
+
+
+def post_fork(server, worker):
+    """Arm request-count recycling in each new worker"""
+    import main
+
+    if recycle_requests:
+        # Drain past the keep-alive timeout, so idle connections close on their own before the worker stops
+        main.worker_recycler.arm(recycle_requests + random.randint(0, recycle_requests // 10), keepalive + 1)
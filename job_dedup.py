@@ -0,0 +1,229 @@
+"""
+Near-duplicate job detection with MinHash signatures and LSH banding
+"""
+import os
+import re
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from skill_taxonomy import normalize_skill
+
+_COMPANY_SUFFIX_RE = re.compile(
+    r'\b(inc|incorporated|llc|ltd|limited|corp|corporation|co|company|plc|gmbh|lp|llp)\b'
+)
+_UNKNOWN_COMPANIES = {"", "unknown company"}
+# Tracking redirects and search pages rather than a link to the posting itself
+_INDIRECT_LINK_MARKERS = ("/clk", "/pagead/", "/jobs?", "/Job/jobs.htm")
+
+_COMPOUND_ROLE_RE = re.compile(r'\b(front|back|full)[\s-]+(end|stack)\b')
+_TITLE_TOKEN_ALIASES = {
+    "sr": "senior", "snr": "senior", "jr": "junior", "mid": "intermediate",
+    "1": "i", "2": "ii", "3": "iii", "4": "iv", "5": "v",
+}
+# Title words that make two postings different jobs even when the rest of the title matches
+_TITLE_BLOCKERS = {
+    # Seniority
+    "intern", "trainee", "graduate", "junior", "intermediate", "senior", "lead", "staff", "principal",
+    "distinguished", "head", "chief", "director", "vp", "manager", "associate", "entry",
+    # Level
+    "i", "ii", "iii", "iv", "v", "vi",
+    # Role and specialization
+    "engineer", "developer", "programmer", "scientist", "analyst", "architect", "administrator",
+    "designer", "consultant", "specialist", "tester", "researcher",
+    "frontend", "backend", "fullstack", "mobile", "ios", "android", "web", "data", "ml", "ai", "devops",
+    "sre", "qa", "test", "security", "cloud", "platform", "infrastructure", "embedded", "firmware",
+    "network", "database", "systems", "support", "sales", "product", "game",
+}
+
+
+def normalize_company(company: str) -> str:
+    """Normalize a company name and drop legal suffixes ("Acme, Inc." -> "acme")"""
+    name = normalize_skill(company or "")
+    if name in _UNKNOWN_COMPANIES:
+        return ""
+    return " ".join(_COMPANY_SUFFIX_RE.sub(' ', name).split())
+
+
+def title_blockers(title: str) -> frozenset:
+    """Seniority, level and role words of a job title ("Sr. Backend Engineer II" -> senior, backend, engineer, ii)"""
+    text = _COMPOUND_ROLE_RE.sub(r'\1\2', normalize_skill(title or ""))
+    tokens = (_TITLE_TOKEN_ALIASES.get(token, token) for token in text.split())
+    return frozenset(token for token in tokens if token in _TITLE_BLOCKERS)
+
+
+def direct_link(job: Dict) -> Optional[str]:
+    """The listing's link if it points at the posting itself, not a tracking redirect or search page"""
+    link = job.get('link') or "#"
+    if link == "#" or any(marker in link for marker in _INDIRECT_LINK_MARKERS):
+        return None
+    return link
+
+
+def char_shingles(text: str, size: int = 3) -> Set[str]:
+    """Character shingles of a normalized string, robust to small wording changes"""
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def richness(job: Dict) -> int:
+    """How much useful detail a listing carries; the richest copy of a duplicate cluster is kept"""
+    score = 0
+    if job.get('salary') and job.get('salary') != "Not specified":
+        score += 4
+    if (job.get('link') or "#") != "#":
+        score += 1
+        # Tracking redirects and search pages are worse than a direct posting link
+        if direct_link(job):
+            score += 2
+    if job.get('snippet'):
+        score += 1
+    if job.get('posted_date') and job.get('posted_date') != "Recently":
+        score += 1
+    return score
+
+
+class NearDuplicateDetector:
+    """Cluster listings of the same posting scraped from different boards.
+
+    Each listing is reduced to character shingles of its normalized title
+    and company (legal suffixes stripped), hashed into a MinHash signature.
+    Signatures are split into LSH bands, so only listings sharing a band
+    bucket are compared, which keeps the work near-linear in the number of
+    listings. A candidate pair is only merged if the exact Jaccard
+    similarity of the title shingles alone reaches ``threshold``, both
+    titles carry the same seniority, level and role words (Engineer II and
+    III, Backend and Frontend Engineer stay apart), the clusters do not
+    name different companies, a cluster without a known company does not
+    join one with other direct posting links, and, when both have a
+    snippet, enough snippet words are shared. Clusters are merged with
+    union-find and the richest listing of each cluster is kept.
+    """
+
+    _SEED = 0x5EED
+
+    def __init__(self, threshold: Optional[float] = None, snippet_threshold: float = 0.3,
+                 num_perm: int = 128, bands: int = 32, chunk_size: int = 16384, max_bucket_pairs: int = 32):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold if threshold is not None else float(os.getenv("JOB_DEDUP_THRESHOLD", "0.8"))
+        self.snippet_threshold = snippet_threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.chunk_size = chunk_size
+        self.max_bucket_pairs = max_bucket_pairs
+        # Multiply-shift hash family: h(x) = (a * x + b) mod 2^64 >> 32, with odd a
+        rng = np.random.default_rng(self._SEED)
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+    def signatures(self, shingle_sets: List[Set[str]]) -> np.ndarray:
+        """MinHash signature matrix, one row of ``num_perm`` uint32 values per shingle set"""
+        signatures = np.full((len(shingle_sets), self.num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+        start = 0
+        while start < len(shingle_sets):
+            # Hash a chunk of documents at once; reduceat takes the per-document minimum
+            end, total = start, 0
+            while end < len(shingle_sets) and (total == 0 or total + len(shingle_sets[end]) <= self.chunk_size):
+                total += len(shingle_sets[end])
+                end += 1
+            rows = [row for row in range(start, end) if shingle_sets[row]]
+            if rows:
+                values = np.fromiter(
+                    (hash(shingle) & 0xFFFFFFFFFFFFFFFF for row in rows for shingle in shingle_sets[row]),
+                    dtype=np.uint64, count=sum(len(shingle_sets[row]) for row in rows)
+                )
+                hashed = ((self._a[:, None] * values + self._b[:, None]) >> np.uint64(32)).astype(np.uint32)
+                offsets = np.cumsum([0] + [len(shingle_sets[row]) for row in rows[:-1]])
+                signatures[rows] = np.minimum.reduceat(hashed, offsets, axis=1).T
+            start = end
+        return signatures
+
+    def _candidate_pairs(self, signatures: np.ndarray) -> Set[tuple]:
+        pairs = set()
+        # Fold each band's rows into one 64-bit bucket key; collisions only add candidates,
+        # which are verified exactly afterwards
+        mixers = self._a[:self.rows]
+        for band in range(self.bands):
+            band_values = signatures[:, band * self.rows:(band + 1) * self.rows].astype(np.uint64)
+            keys = (band_values * mixers).sum(axis=1)
+            order = np.argsort(keys, kind='stable')
+            sorted_keys = keys[order]
+            bounds = np.concatenate(([0], np.flatnonzero(np.diff(sorted_keys)) + 1, [len(keys)]))
+            for start in np.flatnonzero(np.diff(bounds) > 1):
+                members = order[bounds[start]:bounds[start + 1]].tolist()
+                if len(members) > self.max_bucket_pairs:
+                    # Oversized buckets (very generic titles) are chained to their first member
+                    pairs.update((members[0], other) for other in members[1:])
+                else:
+                    pairs.update((left, right) for i, left in enumerate(members) for right in members[i + 1:])
+        return pairs
+
+    def clusters(self, jobs: List[Dict]) -> List[List[int]]:
+        """Group job indices into near-duplicate clusters, ordered by first appearance"""
+        companies = [normalize_company(job.get('company', '')) for job in jobs]
+        titles = [normalize_skill(job.get('title', '')) for job in jobs]
+        title_shingles = [char_shingles(title) for title in titles]
+        blockers = [title_blockers(title) for title in titles]
+        # Company shingles only steer the LSH buckets; titles are verified on their own
+        shingles = [char_shingles(f"{title} {company}".strip()) for title, company in zip(titles, companies)]
+        snippet_words = [set(normalize_skill(job.get('snippet', '')).split()) for job in jobs]
+
+        parent = list(range(len(jobs)))
+
+        def find(index: int) -> int:
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        # Per cluster root: its known company, direct links and snippet words (those of its first
+        # member that has one), so conflicting clusters are not joined through a listing lacking them
+        cluster_company = list(companies)
+        cluster_links = [{link} if link else set() for link in map(direct_link, jobs)]
+        cluster_words = list(snippet_words)
+
+        for left, right in sorted(self._candidate_pairs(self.signatures(shingles))):
+            if blockers[left] != blockers[right]:
+                continue
+            union = len(title_shingles[left] | title_shingles[right])
+            if not union or len(title_shingles[left] & title_shingles[right]) / union < self.threshold:
+                continue
+            root_left, root_right = find(left), find(right)
+            if root_left == root_right:
+                continue
+            company_left, company_right = cluster_company[root_left], cluster_company[root_right]
+            if company_left and company_right and company_left != company_right:
+                continue
+            links_left, links_right = cluster_links[root_left], cluster_links[root_right]
+            if not (company_left and company_right) and links_left and links_right and \
+                    not links_left & links_right:
+                continue
+            words_left, words_right = cluster_words[root_left], cluster_words[root_right]
+            if words_left and words_right and \
+                    len(words_left & words_right) / len(words_left | words_right) < self.snippet_threshold:
+                continue
+            root, child = min(root_left, root_right), max(root_left, root_right)
+            parent[child] = root
+            cluster_company[root] = cluster_company[root] or cluster_company[child]
+            cluster_links[root] |= cluster_links[child]
+            cluster_words[root] = cluster_words[root] or cluster_words[child]
+
+        groups: Dict[int, List[int]] = {}
+        for index in range(len(jobs)):
+            groups.setdefault(find(index), []).append(index)
+        return sorted(groups.values(), key=lambda members: members[0])
+
+    def deduplicate(self, jobs: List[Dict]) -> List[Dict]:
+        """Keep the richest listing of each near-duplicate cluster, in first-seen order"""
+        if len(jobs) < 2:
+            return list(jobs)
+        # max() keeps the earliest listing on ties
+        return [jobs[max(members, key=lambda index: richness(jobs[index]))]
+                for members in self.clusters(jobs)]
+
+
+# Global near-duplicate detector instance
+job_deduplicator = NearDuplicateDetector()
@@ -0,0 +1,270 @@
+"""
+Local persistent job index (SQLite FTS5) filled by live scrapes and the background crawler
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from search_cache import normalize_query
+from skill_taxonomy import normalize_skill
+
+# Per-result fields that are recomputed for every search and must not be stored
+_TRANSIENT_FIELDS = ("match_keywords", "relevance_score")
+
+
+def listing_key(job: Dict) -> str:
+    """Stable identity of a listing: its link, or title and company when there is none"""
+    link = job.get('link') or "#"
+    if link != "#":
+        return link
+    return f"{normalize_skill(job.get('title', ''))}|{normalize_skill(job.get('company', ''))}"
+
+
+def normalize_terms(terms: Iterable[str]) -> List[str]:
+    """Normalized search terms without repeats; single letters ("R", "C") match initials like "R&D" and are dropped"""
+    return list(dict.fromkeys(term for term in map(normalize_skill, terms) if len(term) > 1))
+
+
+def fts_query(terms: Iterable[str], required: Iterable[str] = ()) -> str:
+    """OR together quoted FTS5 phrases for each normalized search term.
+
+    With ``required`` phrases (the roles searched for), the title must also
+    contain one of them.
+    """
+    query = " OR ".join(f'"{term}"' for term in normalize_terms(terms))
+    required_query = " OR ".join(f'"{term}"' for term in normalize_terms(required))
+    if required_query and query:
+        return f"title : ({required_query}) AND ({query})"
+    return required_query or query
+
+
+def matched_terms(job: Dict, terms: List[str]) -> int:
+    """How many of the normalized ``terms`` occur as whole words in a listing's title and snippet"""
+    text = f" {normalize_skill(job.get('title', '') + ' ' + job.get('snippet', ''))} "
+    return sum(f" {term} " in text for term in terms)
+
+
+class JobIndex:
+    """Full-text index of recently scraped job listings.
+
+    Listings are stored once per (listing, search location) with the time
+    they were last seen; anything older than ``ttl`` is ignored by searches
+    and pruned. Searches use the FTS5 BM25 ranking with title matches
+    weighted highest, and return in a few milliseconds. The database runs in
+    WAL mode so several uvicorn workers can share it.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, ttl: Optional[float] = None):
+        self.db_path = db_path if db_path is not None else os.getenv("JOB_INDEX_DB", "job_index.db")
+        self.ttl = ttl or float(os.getenv("JOB_INDEX_TTL", "21600"))
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._available = bool(self.db_path)
+
+        # Metrics
+        self.searches = 0
+        self.search_seconds = 0.0
+        self.stored = 0
+        self.pruned = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._available
+
+    def _get_db(self) -> Optional[sqlite3.Connection]:
+        if not self._available:
+            return None
+        if self._db is None:
+            try:
+                db = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("PRAGMA synchronous=NORMAL")
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS jobs ("
+                    "id INTEGER PRIMARY KEY, key TEXT NOT NULL, location TEXT NOT NULL, "
+                    "data TEXT NOT NULL, indexed REAL NOT NULL, UNIQUE (key, location))"
+                )
+                db.execute("CREATE INDEX IF NOT EXISTS jobs_indexed ON jobs (indexed)")
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS leases (name TEXT PRIMARY KEY, owner INTEGER NOT NULL, expires REAL NOT NULL)"
+                )
+                db.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5("
+                    "title, company, snippet, tokenize = 'unicode61')"
+                )
+                db.commit()
+            except sqlite3.Error as e:
+                # Most often an SQLite build without FTS5; searches then always go live
+                print(f"Job index disabled: {e}")
+                self._available = False
+                return None
+            self._db = db
+        return self._db
+
+    def add(self, jobs: List[Dict], location: str) -> int:
+        """Insert or refresh listings found for a search ``location``; returns how many were stored"""
+        now = time.time()
+        location = normalize_query(location)
+        with self._lock:
+            db = self._get_db()
+            if db is None or not jobs:
+                return 0
+            stored = 0
+            try:
+                for job in jobs:
+                    if job.get('title') in (None, "", "Unknown Title"):
+                        continue
+                    data = {name: value for name, value in job.items() if name not in _TRANSIENT_FIELDS}
+                    key = listing_key(job)
+                    row = db.execute("SELECT id FROM jobs WHERE key = ? AND location = ?", (key, location)).fetchone()
+                    if row is not None:
+                        db.execute("UPDATE jobs SET data = ?, indexed = ? WHERE id = ?", (json.dumps(data), now, row[0]))
+                        db.execute("DELETE FROM jobs_fts WHERE rowid = ?", (row[0],))
+                        row_id = row[0]
+                    else:
+                        row_id = db.execute(
+                            "INSERT INTO jobs (key, location, data, indexed) VALUES (?, ?, ?, ?)",
+                            (key, location, json.dumps(data), now)
+                        ).lastrowid
+                    db.execute(
+                        "INSERT INTO jobs_fts (rowid, title, company, snippet) VALUES (?, ?, ?, ?)",
+                        (row_id, job.get('title', ''), job.get('company', ''), job.get('snippet', ''))
+                    )
+                    stored += 1
+                db.commit()
+            except sqlite3.Error as e:
+                db.rollback()
+                print(f"Job index write error: {e}")
+                return 0
+            self.stored += stored
+        return stored
+
+    def search(self, terms: Iterable[str], location: str, limit: int = 50, required: Iterable[str] = (),
+               min_terms: int = 1) -> List[Dict]:
+        """Return fresh listings for ``location`` relevant to ``terms``, best BM25 match first.
+
+        A listing must have one of the ``required`` phrases in its title (when
+        given) and contain at least ``min_terms`` of ``terms`` (capped at how
+        many there are), so a search sharing one common skill with a listing
+        does not count it as a hit.
+        """
+        terms, required = normalize_terms(terms), normalize_terms(required)
+        query = fts_query(terms, required)
+        if not query:
+            return []
+        min_terms = min(min_terms, len(set(terms) | set(required)))
+        start = time.perf_counter()
+        with self._lock:
+            db = self._get_db()
+            if db is None:
+                return []
+            try:
+                rows = db.execute(
+                    "SELECT jobs.data FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid "
+                    "WHERE jobs_fts MATCH ? AND jobs.location = ? AND jobs.indexed >= ? "
+                    "ORDER BY bm25(jobs_fts, 4.0, 1.0, 1.0) LIMIT ?",
+                    # Over-fetch, since the term filter below drops some candidates
+                    (query, normalize_query(location), time.time() - self.ttl, limit * 4)
+                ).fetchall()
+            except sqlite3.Error as e:
+                print(f"Job index search error: {e}")
+                return []
+            finally:
+                self.searches += 1
+                self.search_seconds += time.perf_counter() - start
+        jobs = (json.loads(row[0]) for row in rows)
+        all_terms = list(dict.fromkeys(required + terms))
+        return [job for job in jobs if matched_terms(job, all_terms) >= min_terms][:limit]
+
+    def prune(self) -> int:
+        """Delete listings older than the TTL"""
+        with self._lock:
+            db = self._get_db()
+            if db is None:
+                return 0
+            try:
+                cutoff = time.time() - self.ttl
+                db.execute("DELETE FROM jobs_fts WHERE rowid IN (SELECT id FROM jobs WHERE indexed < ?)", (cutoff,))
+                removed = db.execute("DELETE FROM jobs WHERE indexed < ?", (cutoff,)).rowcount
+                db.commit()
+            except sqlite3.Error as e:
+                print(f"Job index prune error: {e}")
+                return 0
+            self.pruned += removed
+            return removed
+
+    def claim(self, name: str, ttl: float) -> bool:
+        """Take or renew the lease ``name`` for this process for ``ttl`` seconds.
+
+        Returns False while another process holds it, so a background task
+        that should run once per server (not once per worker) can check it.
+        """
+        now = time.time()
+        with self._lock:
+            db = self._get_db()
+            if db is None:
+                return True
+            try:
+                db.execute("BEGIN IMMEDIATE")
+                row = db.execute("SELECT owner, expires FROM leases WHERE name = ?", (name,)).fetchone()
+                if row is not None and row[0] != os.getpid() and row[1] > now:
+                    db.rollback()
+                    return False
+                db.execute(
+                    "INSERT OR REPLACE INTO leases (name, owner, expires) VALUES (?, ?, ?)",
+                    (name, os.getpid(), now + ttl)
+                )
+                db.commit()
+                return True
+            except sqlite3.Error as e:
+                db.rollback()
+                print(f"Job index lease error: {e}")
+                return False
+
+    def release(self, name: str):
+        """Give up the lease ``name`` if this process holds it"""
+        with self._lock:
+            db = self._get_db()
+            if db is None:
+                return
+            try:
+                db.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, os.getpid()))
+                db.commit()
+            except sqlite3.Error as e:
+                print(f"Job index lease error: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of index counters"""
+        listings = 0
+        with self._lock:
+            db = self._get_db()
+            if db is not None:
+                try:
+                    listings = db.execute(
+                        "SELECT COUNT(*) FROM jobs WHERE indexed >= ?", (time.time() - self.ttl,)
+                    ).fetchone()[0]
+                except sqlite3.Error:
+                    pass
+        return {
+            "enabled": self.enabled,
+            "fresh_listings": listings,
+            "ttl_seconds": self.ttl,
+            "searches": self.searches,
+            "avg_search_ms": round(self.search_seconds / self.searches * 1000, 2) if self.searches else 0.0,
+            "stored": self.stored,
+            "pruned": self.pruned
+        }
+
+    def close(self):
+        """Close the SQLite connection if one was opened"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+# Global job index instance
+job_index = JobIndex()
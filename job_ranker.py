@@ -0,0 +1,136 @@
+"""
+Relevance ranking for scraped job listings
+"""
+import math
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from keyword_matcher import KeywordMatcher
+from skill_taxonomy import normalize_skill, skill_taxonomy
+
+_AGE_RE = re.compile(r'(\d+)\s*\+?\s*(h|hour|hours|d|day|days|w|week|weeks|mo|month|months)\b')
+_AGE_UNIT_DAYS = {
+    'h': 1 / 24, 'hour': 1 / 24, 'hours': 1 / 24,
+    'd': 1, 'day': 1, 'days': 1,
+    'w': 7, 'week': 7, 'weeks': 7,
+    'mo': 30, 'month': 30, 'months': 30,
+}
+
+
+def parse_posted_age(posted_date: str) -> Optional[float]:
+    """Turn board date strings ("Posted 3 days ago", "Just posted", "30+ days ago", "2d") into age in days"""
+    text = (posted_date or "").lower()
+    if "just posted" in text or "today" in text:
+        return 0.0
+    if "yesterday" in text:
+        return 1.0
+    match = _AGE_RE.search(text)
+    if match:
+        return int(match.group(1)) * _AGE_UNIT_DAYS[match.group(2)]
+    if "hour" in text or "minute" in text:
+        return 0.0
+    return None
+
+
+def skill_weights_from_text(skills: List[str], text: str) -> Dict[str, float]:
+    """Weight skills by how central they are to a job description.
+
+    A skill's weight grows with how often any of its aliases appears in the
+    text and decays slightly with its position in the extracted list, since
+    the LLM tends to list the key requirements first.
+    """
+    patterns = []
+    for index, skill in enumerate(skills):
+        skill_id = skill_taxonomy.resolve(skill)
+        terms = skill_taxonomy.text_aliases(skill_id) if skill_id is not None else [normalize_skill(skill)]
+        patterns.extend((term, index) for term in terms)
+    counts = KeywordMatcher(patterns).count(normalize_skill(text))
+
+    weights = {}
+    for index, skill in enumerate(skills):
+        mentions = len(counts.get(index, []))
+        weights[skill.lower()] = (1 + math.log1p(mentions)) / (1 + 0.05 * index)
+    return weights
+
+
+class JobRanker:
+    """Score listings with keyword-level BM25 plus a recency boost.
+
+    Query terms are the candidate's skills and roles, and term frequencies
+    come from the keyword hits found by ``JobScraper.add_match_keywords``,
+    so multi-word skills and aliases count as one term. Title hits count
+    ``title_boost`` times. Each term's BM25 contribution is multiplied by its
+    skill weight. All scoring after hit collection is done on NumPy arrays
+    across the whole candidate list.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, title_boost: float = 2.0,
+                 role_weight: float = 1.5, recency_weight: float = 0.2, recency_half_life: float = 14.0):
+        self.k1 = k1
+        self.b = b
+        self.title_boost = title_boost
+        self.role_weight = role_weight
+        self.recency_weight = recency_weight
+        self.recency_half_life = recency_half_life
+
+    def score(self, jobs: List[Dict], keyword_hits: List[Dict[str, List[int]]], roles: List[str],
+              skill_weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Return a relevance score in [0, 1] per job"""
+        if not jobs:
+            return np.zeros(0)
+        skill_weights = skill_weights or {}
+        role_keys = {role.lower() for role in roles}
+
+        terms: Dict[str, int] = {}
+        doc_lengths = np.zeros(len(jobs))
+        cells = []
+        for row, (job, hits) in enumerate(zip(jobs, keyword_hits)):
+            title_length = len(normalize_skill(job.get('title', '')))
+            doc_lengths[row] = len(job.get('title', '').split()) + len(job.get('snippet', '').split())
+            for keyword, starts in hits.items():
+                column = terms.setdefault(keyword, len(terms))
+                tf = sum(self.title_boost if start < title_length else 1.0 for start in starts)
+                cells.append((row, column, tf))
+
+        relevance = np.zeros(len(jobs))
+        if terms:
+            tf = np.zeros((len(jobs), len(terms)))
+            for row, column, value in cells:
+                tf[row, column] = value
+
+            weights = np.ones(len(terms))
+            for keyword, column in terms.items():
+                weights[column] = self.role_weight if keyword in role_keys else skill_weights.get(keyword, 1.0)
+
+            n = len(jobs)
+            df = np.count_nonzero(tf, axis=0)
+            idf = np.log(1 + (n - df + 0.5) / (df + 0.5))
+            avg_length = max(doc_lengths.mean(), 1.0)
+            norm = self.k1 * (1 - self.b + self.b * doc_lengths / avg_length)
+            bm25 = tf * (self.k1 + 1) / (tf + norm[:, None])
+            relevance = bm25 @ (idf * weights)
+            if relevance.max() > 0:
+                relevance = relevance / relevance.max()
+
+        ages = np.full(len(jobs), np.nan)
+        for row, job in enumerate(jobs):
+            age = parse_posted_age(job.get('posted_date', ''))
+            if age is not None:
+                ages[row] = age
+        recency = np.where(np.isnan(ages), 0.5, np.exp2(-np.nan_to_num(ages) / self.recency_half_life))
+        return (1 - self.recency_weight) * relevance + self.recency_weight * recency
+
+    def rank(self, jobs: List[Dict], keyword_hits: List[Dict[str, List[int]]], roles: List[str],
+             skill_weights: Optional[Dict[str, float]] = None) -> List[Dict]:
+        """Sort jobs by relevance (best first) and record each job's relevance_score"""
+        scores = self.score(jobs, keyword_hits, roles, skill_weights)
+        for job, value in zip(jobs, scores):
+            job['relevance_score'] = round(float(value), 4)
+        order = np.argsort(-scores, kind='stable')
+        return [jobs[index] for index in order]
+
+
+# Global job ranker instance
+job_ranker = JobRanker()
@@ -2,14 +2,49 @@
 Job scraper module for real-time job search across multiple platforms
 """
 import asyncio
-import aiohttp
+import importlib.util
+import os
 import re
-from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, AsyncIterator, List, Dict, Optional, Tuple
 from urllib.parse import quote_plus, urljoin
 import random
 import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
+from rate_limiter import RateLimiter
+from search_cache import SearchCache, normalize_query
+from skill_taxonomy import normalize_skill, skill_taxonomy
+from keyword_matcher import KeywordMatcher
+from job_ranker import job_ranker
+from job_dedup import job_deduplicator
+from job_index import job_index
+from metrics import scrape_results, scrape_seconds, stage
+from request_profiler import request_profiler
+
+if TYPE_CHECKING:
+    import aiohttp
+
+# Checked without importing lxml; aiohttp and BeautifulSoup are also imported on first use to keep startup fast
+DEFAULT_HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+# Class-name patterns for job cards and their fields, compiled once at import
+INDEED_CARD_RE = re.compile(r'job_seen_beacon|result|jobsearch-SerpJobCard')
+GLASSDOOR_CARD_RE = re.compile(r'job.*result|JobSearchCard')
+VIEWJOB_HREF_RE = re.compile(r'/viewjob')
+JOB_TITLE_CLASS_RE = re.compile(r'jobTitle')
+COMPANY_NAME_CLASS_RE = re.compile(r'companyName')
+COMPANY_LOCATION_CLASS_RE = re.compile(r'companyLocation')
+EMPLOYER_CLASS_RE = re.compile(r'employer')
+LOCATION_CLASS_RE = re.compile(r'location')
+SALARY_CLASS_RE = re.compile(r'salary')
+DATE_CLASS_RE = re.compile(r'date')
+SUMMARY_CLASS_RE = re.compile(r'summary')
+
+
+class BoardError(Exception):
+    """Raised when a job board search fails (unexpected HTTP status or an unparseable page)"""
+
 
 class JobScraper:
     def __init__(self):
@@ -20,8 +55,183 @@ class JobScraper:
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0',
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:89.0) Gecko/20100101 Firefox/89.0'
         ]
-        self.session_cache = {}
-        self.rate_limit_delay = 1  # seconds between requests
+        self.session: Optional["aiohttp.ClientSession"] = None
+        # Shared per-host request budget; callers only wait once the burst is spent
+        self.rate_limiter = RateLimiter(
+            rate=float(os.getenv("SCRAPER_RATE", "1")),
+            burst=int(os.getenv("SCRAPER_BURST", "3")),
+            max_backoff=float(os.getenv("SCRAPER_MAX_BACKOFF", "60"))
+        )
+        # Glassdoor is stricter, so it gets half the default budget
+        self.rate_limiter.configure(
+            "www.glassdoor.com",
+            rate=float(os.getenv("SCRAPER_RATE_GLASSDOOR", str(self.rate_limiter.rate / 2))),
+            burst=int(os.getenv("SCRAPER_BURST_GLASSDOOR", "2"))
+        )
+        
+        # Connection pool settings for the shared HTTP session
+        self.pool_size = int(os.getenv("SCRAPER_POOL_SIZE", "100"))
+        self.per_host_limit = int(os.getenv("SCRAPER_PER_HOST_LIMIT", "10"))
+        self.dns_cache_ttl = int(os.getenv("SCRAPER_DNS_TTL", "300"))
+        self.keepalive_timeout = float(os.getenv("SCRAPER_KEEPALIVE", "30"))
+        self.connect_timeout = float(os.getenv("SCRAPER_CONNECT_TIMEOUT", "5"))
+        self.read_timeout = float(os.getenv("SCRAPER_READ_TIMEOUT", "10"))
+        
+        # Job boards queried concurrently by search_jobs_comprehensive
+        self.boards = {
+            "indeed": self.scrape_indeed_jobs,
+            "glassdoor": self.scrape_glassdoor_jobs,
+        }
+        self.enabled_boards = [
+            name.strip().lower() for name in os.getenv("SCRAPER_BOARDS", "indeed,glassdoor").split(",")
+            if name.strip().lower() in self.boards
+        ]
+        self.search_deadline = float(os.getenv("SCRAPER_DEADLINE", "10"))
+        # Search page origins; overridden to point the scraper at a local stub in benchmarks
+        self.indeed_url = os.getenv("SCRAPER_INDEED_URL", "https://www.indeed.com").rstrip("/")
+        self.glassdoor_url = os.getenv("SCRAPER_GLASSDOOR_URL", "https://www.glassdoor.com").rstrip("/")
+        self.source_stats = {name: {"ok": 0, "empty": 0, "timeout": 0, "error": 0} for name in self.boards}
+        self.search_cache = SearchCache()
+        
+        # BeautifulSoup tree builder; lxml (C) by default, html.parser if lxml is unavailable
+        self.html_parser = os.getenv("HTML_PARSER", DEFAULT_HTML_PARSER)
+        
+        # Page parsing runs off the event loop; pending pages are capped to bound memory
+        self.parse_executor_kind = os.getenv("SCRAPER_PARSE_EXECUTOR", "process").lower()
+        self.parse_workers = int(os.getenv("SCRAPER_PARSE_WORKERS", "2"))
+        self.parse_max_pending = int(os.getenv("SCRAPER_PARSE_MAX_PENDING", "16"))
+        self._parse_executor: Optional[Executor] = None
+        self._parse_slots = asyncio.Semaphore(self.parse_max_pending)
+        self.parse_stats = {"pending": 0, "parsed": 0, "failed": 0, "seconds": 0.0, "pool_restarts": 0}
+        
+        # Local index of scraped listings, searched before any live scrape
+        self.job_index = job_index
+        self.index_min_hits = int(os.getenv("JOB_INDEX_MIN_HITS", "5"))
+        self.index_min_terms = int(os.getenv("JOB_INDEX_MIN_TERMS", "2"))
+        # Background crawler keeping the index fresh for common searches
+        self.crawl_queries = [q.strip() for q in os.getenv("JOB_INDEX_QUERIES", "").split(";") if q.strip()]
+        self.crawl_locations = [
+            loc.strip() for loc in os.getenv("JOB_INDEX_LOCATIONS", "United States").split(";") if loc.strip()
+        ]
+        self.crawl_interval = float(os.getenv("JOB_INDEX_CRAWL_INTERVAL", "3600"))
+        self.crawl_max_results = int(os.getenv("JOB_INDEX_CRAWL_RESULTS", "25"))
+        self._crawl_task: Optional[asyncio.Task] = None
+        self.crawl_stats = {"runs": 0, "queries_run": 0, "failed": 0, "last_run": None, "last_seconds": 0.0}
+        self.index_stats = {"hits": 0, "misses": 0}
+        
+    async def start(self):
+        """Create the shared HTTP session and start the index crawler (called at application startup)"""
+        await self.get_session()
+        if self.crawl_queries and self.job_index.enabled and self._crawl_task is None:
+            self._crawl_task = asyncio.create_task(self._crawl_forever())
+    
+    async def close(self):
+        """Stop the crawler and close the shared HTTP session and its pooled connections"""
+        if self._crawl_task is not None:
+            self._crawl_task.cancel()
+            try:
+                await self._crawl_task
+            except asyncio.CancelledError:
+                pass
+            self._crawl_task = None
+            await asyncio.to_thread(self.job_index.release, "crawler")
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        if self._parse_executor is not None:
+            self._parse_executor.shutdown(wait=False, cancel_futures=True)
+            self._parse_executor = None
+        self.rate_limiter.close()
+        self.search_cache.close()
+    
+    def _get_parse_executor(self) -> Executor:
+        if self._parse_executor is None:
+            if self.parse_executor_kind == "thread":
+                self._parse_executor = ThreadPoolExecutor(max_workers=self.parse_workers, thread_name_prefix="html-parse")
+            else:
+                self._parse_executor = ProcessPoolExecutor(max_workers=self.parse_workers)
+        return self._parse_executor
+    
+    def _drop_parse_executor(self, executor: Executor):
+        """Discard a broken parse pool, unless a concurrent caller already replaced it"""
+        if self._parse_executor is executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._parse_executor = None
+            self.parse_stats["pool_restarts"] += 1
+    
+    async def _parse_in_pool(self, board: str, html: str, max_results: int) -> List[Dict]:
+        """Parse a page in the process pool, replacing the pool if a worker died
+        
+        A crashed or OOM-killed worker breaks the pool for good; without
+        replacing it every later search would silently come back empty. The
+        page itself is dropped rather than retried, since it would likely
+        crash the fresh pool as well.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_parse_executor()
+        try:
+            return await loop.run_in_executor(
+                executor, _parse_page_in_worker, board, html, max_results, self.html_parser
+            )
+        except BrokenProcessPool:
+            self._drop_parse_executor(executor)
+            raise BoardError(f"{board} result page crashed the parser")
+    
+    async def warm_up(self):
+        """Start the parse workers and load BeautifulSoup and the tree builder in each of them"""
+        loop = asyncio.get_running_loop()
+        executor = self._get_parse_executor()
+        await asyncio.gather(*(
+            loop.run_in_executor(executor, _warm_parser, self.html_parser) for _ in range(self.parse_workers)
+        ))
+    
+    async def fetch_and_parse(self, response: "aiohttp.ClientResponse", board: str, max_results: int) -> List[Dict]:
+        """Read a result page and parse it in the worker pool
+        
+        A slot is taken before the body is read, so at most
+        ``parse_max_pending`` pages are held in memory awaiting parsing.
+        """
+        self.parse_stats["pending"] += 1
+        try:
+            async with self._parse_slots:
+                html = await response.text()
+                loop = asyncio.get_running_loop()
+                start = time.perf_counter()
+                try:
+                    if self.parse_executor_kind == "thread":
+                        parser = getattr(self, f"parse_{board}_page")
+                        jobs = await loop.run_in_executor(
+                            self._get_parse_executor(), request_profiler.wrap(lambda: parser(html, max_results))
+                        )
+                    else:
+                        jobs = await self._parse_in_pool(board, html, max_results)
+                        request_profiler.record_offloaded(f"job_scraper.parse_{board}_page", time.perf_counter() - start)
+                except Exception:
+                    self.parse_stats["failed"] += 1
+                    raise
+                self.parse_stats["parsed"] += 1
+                self.parse_stats["seconds"] += time.perf_counter() - start
+                return jobs
+        finally:
+            self.parse_stats["pending"] -= 1
+    
+    async def get_session(self) -> "aiohttp.ClientSession":
+        """Return the long-lived pooled session, creating it on first use"""
+        if self.session is None or self.session.closed:
+            import aiohttp
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.per_host_limit,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            timeout = aiohttp.ClientTimeout(
+                total=None,
+                connect=self.connect_timeout,
+                sock_read=self.read_timeout
+            )
+            self.session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self.session
         
     def get_random_headers(self) -> Dict[str, str]:
         """Get random headers to avoid detection"""
@@ -36,45 +246,82 @@ class JobScraper:
         }
 
     async def scrape_indeed_jobs(self, query: str, location: str = "United States", max_results: int = 10) -> List[Dict]:
-        """Scrape job listings from Indeed"""
-        jobs = []
-        try:
-            encoded_query = quote_plus(query)
-            encoded_location = quote_plus(location)
-            url = f"https://www.indeed.com/jobs?q={encoded_query}&l={encoded_location}&sort=date"
+        """Scrape job listings from Indeed
+        
+        Connection errors and non-200 answers are raised (``BoardError``
+        for the latter), so the fan-out records the board as failed rather
+        than empty.
+        """
+        encoded_query = quote_plus(query)
+        encoded_location = quote_plus(location)
+        url = f"{self.indeed_url}/jobs?q={encoded_query}&l={encoded_location}&sort=date"
+        
+        session = await self.get_session()
+        await self.rate_limiter.acquire("www.indeed.com")
+        async with session.get(url, headers=self.get_random_headers()) as response:
+            await self.rate_limiter.record_response("www.indeed.com", response.status, response.headers.get("Retry-After"))
+            if response.status != 200:
+                raise BoardError(f"Indeed answered HTTP {response.status}")
             
-            async with aiohttp.ClientSession(headers=self.get_random_headers()) as session:
-                await asyncio.sleep(self.rate_limit_delay)
-                async with session.get(url) as response:
-                    if response.status != 200:
-                        return jobs
-                    
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # Find job cards using Indeed's current structure
-                    job_cards = soup.find_all(['div'], class_=re.compile(r'job_seen_beacon|result|jobsearch-SerpJobCard'))
-                    
-                    for card in job_cards[:max_results]:
-                        try:
-                            job_data = self.extract_indeed_job_data(card)
-                            if job_data:
-                                jobs.append(job_data)
-                        except Exception as e:
-                            continue  # Skip problematic cards
-                            
-        except Exception as e:
-            print(f"Indeed scraping error: {e}")
+            return await self.fetch_and_parse(response, "indeed", max_results)
+    
+    def parse_indeed_page(self, html: str, max_results: int = 10) -> List[Dict]:
+        """Parse an Indeed results page into job dicts"""
+        from bs4 import BeautifulSoup  # imported on first parse, usually in a worker
+
+        jobs = []
+        soup = BeautifulSoup(html, self.html_parser)
+        
+        # Find job cards using Indeed's current structure
+        job_cards = soup.find_all(['div'], class_=INDEED_CARD_RE)
+        
+        for card in job_cards[:max_results]:
+            try:
+                job_data = self.extract_indeed_job_data(card)
+                if job_data:
+                    jobs.append(job_data)
+            except Exception as e:
+                continue  # Skip problematic cards
         
         return jobs
     
     def extract_indeed_job_data(self, card) -> Optional[Dict]:
-        """Extract job data from Indeed job card"""
+        """Extract job data from Indeed job card in a single walk over its descendants"""
         try:
+            jk_elem = viewjob_elem = title_class_elem = None
+            company_elem = testid_location_elem = class_location_elem = None
+            salary_elem = date_elem = snippet_elem = None
+            
+            for elem in card.find_all(True):
+                name = elem.name
+                attrs = elem.attrs
+                classes = attrs.get('class')
+                class_str = " ".join(classes) if classes else ""
+                
+                if jk_elem is None and name in ('h2', 'a') and 'data-jk' in attrs:
+                    jk_elem = elem
+                if viewjob_elem is None and name == 'a' and VIEWJOB_HREF_RE.search(attrs.get('href', '')):
+                    viewjob_elem = elem
+                if testid_location_elem is None and name in ('div', 'span') and attrs.get('data-testid') == 'job-location':
+                    testid_location_elem = elem
+                if not class_str:
+                    continue
+                
+                if title_class_elem is None and name in ('span', 'a') and JOB_TITLE_CLASS_RE.search(class_str):
+                    title_class_elem = elem
+                if company_elem is None and name in ('span', 'div', 'a') and COMPANY_NAME_CLASS_RE.search(class_str):
+                    company_elem = elem
+                if class_location_elem is None and COMPANY_LOCATION_CLASS_RE.search(class_str):
+                    class_location_elem = elem
+                if salary_elem is None and name in ('span', 'div') and SALARY_CLASS_RE.search(class_str):
+                    salary_elem = elem
+                if date_elem is None and name == 'span' and DATE_CLASS_RE.search(class_str):
+                    date_elem = elem
+                if snippet_elem is None and name in ('div', 'span') and SUMMARY_CLASS_RE.search(class_str):
+                    snippet_elem = elem
+            
             # Job title and link
-            title_elem = card.find(['h2', 'a'], attrs={'data-jk': True}) or card.find('a', href=re.compile(r'/viewjob'))
-            if not title_elem:
-                title_elem = card.find(['span', 'a'], class_=re.compile(r'jobTitle'))
+            title_elem = jk_elem or viewjob_elem or title_class_elem
             
             title = "Unknown Title"
             link = "#"
@@ -99,25 +346,13 @@ class JobScraper:
                     else:
                         title = title_elem.get_text(strip=True)
             
-            # Company name
-            company_elem = card.find(['span', 'div', 'a'], class_=re.compile(r'companyName'))
             company = company_elem.get_text(strip=True) if company_elem else "Unknown Company"
             
-            # Location
-            location_elem = card.find(['div', 'span'], attrs={'data-testid': 'job-location'}) or \
-                           card.find(class_=re.compile(r'companyLocation'))
+            location_elem = testid_location_elem or class_location_elem
             location = location_elem.get_text(strip=True) if location_elem else "Remote/Unknown"
             
-            # Salary (if available)
-            salary_elem = card.find(['span', 'div'], class_=re.compile(r'salary'))
             salary = salary_elem.get_text(strip=True) if salary_elem else "Not specified"
-            
-            # Posted date
-            date_elem = card.find(['span'], class_=re.compile(r'date'))
             posted_date = date_elem.get_text(strip=True) if date_elem else "Recently"
-            
-            # Job snippet/description
-            snippet_elem = card.find(['div', 'span'], class_=re.compile(r'summary'))
             snippet = snippet_elem.get_text(strip=True)[:200] + "..." if snippet_elem else ""
             
             return {
@@ -136,56 +371,74 @@ class JobScraper:
             return None
 
     async def scrape_glassdoor_jobs(self, query: str, location: str = "United States", max_results: int = 5) -> List[Dict]:
-        """Scrape job listings from Glassdoor"""
-        jobs = []
-        try:
-            encoded_query = quote_plus(query)
-            encoded_location = quote_plus(location)
-            url = f"https://www.glassdoor.com/Job/jobs.htm?sc.keyword={encoded_query}&locT=C&locId=1&jobType=all&fromAge=-1&minSalary=0&includeNoSalaryJobs=true&radius=100&cityId=-1&minRating=0.0&industryId=-1&sgocId=-1&seniorityType=all&companyId=-1&employerSizes=0&applicationType=0&remoteWorkType=0"
+        """Scrape job listings from Glassdoor
+        
+        Connection errors and non-200 answers are raised (``BoardError``
+        for the latter), so the fan-out records the board as failed rather
+        than empty.
+        """
+        encoded_query = quote_plus(query)
+        encoded_location = quote_plus(location)
+        url = f"{self.glassdoor_url}/Job/jobs.htm?sc.keyword={encoded_query}&locT=C&locId=1&jobType=all&fromAge=-1&minSalary=0&includeNoSalaryJobs=true&radius=100&cityId=-1&minRating=0.0&industryId=-1&sgocId=-1&seniorityType=all&companyId=-1&employerSizes=0&applicationType=0&remoteWorkType=0"
+        
+        session = await self.get_session()
+        await self.rate_limiter.acquire("www.glassdoor.com")
+        async with session.get(url, headers=self.get_random_headers()) as response:
+            await self.rate_limiter.record_response("www.glassdoor.com", response.status, response.headers.get("Retry-After"))
+            if response.status != 200:
+                raise BoardError(f"Glassdoor answered HTTP {response.status}")
             
-            async with aiohttp.ClientSession(headers=self.get_random_headers()) as session:
-                await asyncio.sleep(self.rate_limit_delay + 1)  # Longer delay for Glassdoor
-                async with session.get(url) as response:
-                    if response.status != 200:
-                        return jobs
-                    
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # Glassdoor job cards
-                    job_cards = soup.find_all(['li', 'div'], class_=re.compile(r'job.*result|JobSearchCard'))
-                    
-                    for card in job_cards[:max_results]:
-                        try:
-                            job_data = self.extract_glassdoor_job_data(card)
-                            if job_data:
-                                jobs.append(job_data)
-                        except Exception:
-                            continue
-                            
-        except Exception as e:
-            print(f"Glassdoor scraping error: {e}")
+            return await self.fetch_and_parse(response, "glassdoor", max_results)
+    
+    def parse_glassdoor_page(self, html: str, max_results: int = 5) -> List[Dict]:
+        """Parse a Glassdoor results page into job dicts"""
+        from bs4 import BeautifulSoup  # imported on first parse, usually in a worker
+
+        jobs = []
+        soup = BeautifulSoup(html, self.html_parser)
+        
+        # Glassdoor job cards
+        job_cards = soup.find_all(['li', 'div'], class_=GLASSDOOR_CARD_RE)
+        
+        for card in job_cards[:max_results]:
+            try:
+                job_data = self.extract_glassdoor_job_data(card)
+                if job_data:
+                    jobs.append(job_data)
+            except Exception:
+                continue
         
         return jobs
     
     def extract_glassdoor_job_data(self, card) -> Optional[Dict]:
-        """Extract job data from Glassdoor job card"""
+        """Extract job data from Glassdoor job card in a single walk over its descendants"""
         try:
+            title_elem = company_elem = location_elem = salary_elem = None
+            
+            for elem in card.find_all(True):
+                classes = elem.attrs.get('class')
+                if not classes:
+                    continue
+                name = elem.name
+                class_str = " ".join(classes)
+                
+                if title_elem is None and name == 'a' and JOB_TITLE_CLASS_RE.search(class_str):
+                    title_elem = elem
+                if name not in ('span', 'div'):
+                    continue
+                if company_elem is None and EMPLOYER_CLASS_RE.search(class_str):
+                    company_elem = elem
+                if location_elem is None and LOCATION_CLASS_RE.search(class_str):
+                    location_elem = elem
+                if salary_elem is None and SALARY_CLASS_RE.search(class_str):
+                    salary_elem = elem
+            
             # Job title and link
-            title_elem = card.find('a', class_=re.compile(r'jobTitle'))
             title = title_elem.get_text(strip=True) if title_elem else "Unknown Title"
             link = urljoin("https://www.glassdoor.com", title_elem.get('href', '#')) if title_elem else "#"
             
-            # Company
-            company_elem = card.find(['span', 'div'], class_=re.compile(r'employer'))
             company = company_elem.get_text(strip=True) if company_elem else "Unknown Company"
-            
-            # Location
-            location_elem = card.find(['span', 'div'], class_=re.compile(r'location'))
             location = location_elem.get_text(strip=True) if location_elem else "Unknown Location"
-            
-            # Salary
-            salary_elem = card.find(['span', 'div'], class_=re.compile(r'salary'))
             salary = salary_elem.get_text(strip=True) if salary_elem else "Not specified"
             
             return {
@@ -203,33 +456,206 @@ class JobScraper:
         except Exception:
             return None
 
-    async def search_jobs_comprehensive(self, skills: List[str], roles: List[str], location: str = "United States", max_results: int = 15) -> List[Dict]:
-        """Search for jobs across multiple platforms with robust fallback"""
-        all_jobs = []
+    async def scrape_all_boards(self, query: str, location: str = "United States", max_results: int = 10,
+                                deadline: Optional[float] = None) -> Tuple[List[Dict], Dict[str, str]]:
+        """Query every enabled board concurrently under one overall deadline
+        
+        Returns the jobs from boards that answered in time together with a
+        per-source status ("ok", "empty", "timeout" or "error"). Results are
+        cached per (query, location, boards), and identical concurrent
+        searches share one upstream scrape.
+        """
+        jobs, source_status = await self.search_cache.get_or_fetch(
+            self._search_key(query, location, max_results),
+            lambda: self._fan_out_boards(query, location, max_results, deadline),
+            should_cache=lambda result: bool(result[0])
+        )
+        # Callers annotate jobs in place, so hand out copies of the cached dicts
+        return [dict(job) for job in jobs], dict(source_status)
+
+    async def stream_all_boards(self, query: str, location: str = "United States", max_results: int = 10,
+                                deadline: Optional[float] = None) -> AsyncIterator[Tuple[str, str, List[Dict]]]:
+        """Like ``scrape_all_boards``, but yield (board, status, jobs) as each board answers
+        
+        Goes through the same search cache: a cached result is yielded as
+        one ("cache", "ok", jobs) event, and a live fan-out is registered as
+        the in-flight fetch, so identical searches arriving meanwhile share
+        it. A fan-out joined from another caller (or worker) is also yielded
+        as one "cache" event once it finishes. Jobs are copies.
+        """
+        key = self._search_key(query, location, max_results)
+        events: asyncio.Queue = asyncio.Queue()
+        fetch = lambda: self._fan_out_boards(query, location, max_results, deadline, events)
+        should_cache = lambda result: bool(result[0])
+        
+        found, result = await self.search_cache.lookup(key, fetch, should_cache)
+        if found:
+            yield "cache", "ok", [dict(job) for job in result[0]]
+            return
+        
+        task = self.search_cache.start_fetch(key, fetch, should_cache)
+        streamed = False
+        while True:
+            # Board events of our own fan-out, until the (shared) fetch task finishes
+            getter = asyncio.ensure_future(events.get())
+            done, _ = await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+            if getter not in done:
+                getter.cancel()
+                break
+            name, status, jobs = getter.result()
+            streamed = True
+            yield name, status, [dict(job) for job in jobs]
+        while not events.empty():
+            name, status, jobs = events.get_nowait()
+            streamed = True
+            yield name, status, [dict(job) for job in jobs]
+        if not streamed:
+            jobs, _ = await task
+            yield "cache", "ok", [dict(job) for job in jobs]
+
+    def _search_key(self, query: str, location: str, max_results: int) -> tuple:
+        return normalize_query(query), normalize_query(location), tuple(self.enabled_boards), max_results
+
+    async def _fan_out_boards(self, query: str, location: str, max_results: int,
+                              deadline: Optional[float] = None, events: Optional[asyncio.Queue] = None
+                              ) -> Tuple[List[Dict], Dict[str, str]]:
+        """Scrape all enabled boards live; boards still running at the deadline are cancelled
+        
+        Each (board, status, jobs) outcome is also put on ``events`` when given.
+        """
+        jobs_by_board = {}
+        source_status = {}
+        with stage("scrape"):
+            async for name, status, jobs in self.iter_boards(query, location, max_results, deadline):
+                jobs_by_board[name] = jobs
+                source_status[name] = status
+                if events is not None:
+                    events.put_nowait((name, status, jobs))
+        # Keep the configured board order regardless of which board answered first
+        all_jobs = [job for name in self.enabled_boards for job in jobs_by_board.get(name, [])]
+        if all_jobs and self.job_index.enabled:
+            await asyncio.to_thread(self.job_index.add, all_jobs, location)
+        return all_jobs, source_status
+
+    async def iter_boards(self, query: str, location: str, max_results: int,
+                          deadline: Optional[float] = None) -> AsyncIterator[Tuple[str, str, List[Dict]]]:
+        """Yield (board, status, jobs) for each enabled board as soon as it finishes
+        
+        Boards still running at the deadline are cancelled and reported as
+        "timeout"; they are also cancelled if the consumer stops iterating.
+        """
+        deadline = deadline or self.search_deadline
+        tasks = {
+            asyncio.create_task(self.boards[name](query, location, max_results)): name
+            for name in self.enabled_boards
+        }
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        end = started + deadline
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(end - loop.time(), 0), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                for task in done:
+                    name = tasks[task]
+                    jobs = []
+                    if task.exception() is not None:
+                        print(f"{name} scraping failed: {task.exception()}")
+                        status = "error"
+                    else:
+                        jobs = task.result()
+                        status = "ok" if jobs else "empty"
+                    self.source_stats[name][status] += 1
+                    scrape_seconds.observe(loop.time() - started, board=name, status=status)
+                    scrape_results.observe(len(jobs), board=name)
+                    yield name, status, jobs
+            
+            if pending:
+                print(f"Scraping deadline hit, partial results without: {', '.join(tasks[t] for t in pending)}")
+            for task in pending:
+                task.cancel()
+                self.source_stats[tasks[task]]["timeout"] += 1
+                scrape_seconds.observe(loop.time() - started, board=tasks[task], status="timeout")
+                yield tasks[task], "timeout", []
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def search_index(self, terms: List[str], location: str = "United States", limit: int = 50,
+                           roles: Optional[List[str]] = None) -> List[Dict]:
+        """Search the local job index; empty unless it has at least ``index_min_hits`` fresh matches.
+
+        Only listings with one of ``roles`` in their title (when given) and at
+        least ``index_min_terms`` of the roles and ``terms`` count as matches.
+        """
+        if not self.job_index.enabled:
+            return []
+        roles = roles or []
+        with stage("index_search"):
+            jobs = await asyncio.to_thread(
+                self.job_index.search, roles + terms, location, limit, roles, self.index_min_terms
+            )
+        if len(jobs) < self.index_min_hits:
+            self.index_stats["misses"] += 1
+            return []
+        self.index_stats["hits"] += 1
+        return jobs
+
+    async def crawl_once(self):
+        """Scrape every configured crawl query once; results land in the index via the live scrape path"""
+        start = time.perf_counter()
+        for location in self.crawl_locations:
+            for query in self.crawl_queries:
+                try:
+                    await self.scrape_all_boards(query, location, self.crawl_max_results)
+                    self.crawl_stats["queries_run"] += 1
+                except Exception as e:
+                    self.crawl_stats["failed"] += 1
+                    print(f"Index crawl error for '{query}': {e}")
+        await asyncio.to_thread(self.job_index.prune)
+        self.crawl_stats["runs"] += 1
+        self.crawl_stats["last_run"] = datetime.now().isoformat()
+        self.crawl_stats["last_seconds"] = round(time.perf_counter() - start, 2)
+
+    async def _crawl_forever(self):
+        while True:
+            # Workers of a multi-worker server share the index, so only the lease holder crawls
+            if await asyncio.to_thread(self.job_index.claim, "crawler", self.crawl_interval * 2):
+                await self.crawl_once()
+            await asyncio.sleep(self.crawl_interval)
+
+    async def search_jobs_comprehensive(self, skills: List[str], roles: List[str], location: str = "United States",
+                                        max_results: int = 15, source_status: Optional[Dict[str, str]] = None,
+                                        skill_weights: Optional[Dict[str, float]] = None) -> List[Dict]:
+        """Search for jobs across multiple platforms with robust fallback
         
+        The local job index is searched first; boards are only scraped live
+        when it has too few fresh matches. If ``source_status`` is given it
+        is filled with the per-board outcome ("index" when the index answered).
+        Results are ranked by ``job_ranker``; ``skill_weights`` (lowercased
+        skill -> weight) lets more important skills count for more.
+        """
         try:
             # Create search queries
             primary_query = f"{roles[0]} {' '.join(skills[:3])}" if roles else ' '.join(skills[:5])
             
-            # Try to scrape real jobs with timeout
-            try:
-                # Quick Indeed search with shorter timeout
-                indeed_jobs = await asyncio.wait_for(
-                    self.scrape_indeed_jobs(primary_query, location, max_results // 2),
-                    timeout=10.0
-                )
-                all_jobs.extend(indeed_jobs)
-            except asyncio.TimeoutError:
-                print("Indeed scraping timeout - using fallback")
-            except Exception as e:
-                print(f"Indeed scraping failed: {e}")
+            # Answer from the local index when it has enough fresh hits
+            all_jobs = await self.search_index(skills, location, roles=roles)
+            if all_jobs:
+                statuses = {"index": "ok"}
+            else:
+                # Fan out to all boards; whatever arrives before the deadline is used
+                all_jobs, statuses = await self.scrape_all_boards(primary_query, location, max_results)
+            if source_status is not None:
+                source_status.update(statuses)
             
             # If we have some real jobs, return them
             if all_jobs:
-                unique_jobs = self.deduplicate_jobs(all_jobs)
-                self.add_match_keywords(unique_jobs, skills, roles)
-                unique_jobs.sort(key=lambda x: len(x.get('match_keywords', [])), reverse=True)
-                return unique_jobs[:max_results]
+                return self._rank_jobs(all_jobs, skills, roles, skill_weights)[:max_results]
         
         except Exception as e:
             print(f"Comprehensive search error: {e}")
@@ -237,33 +663,130 @@ class JobScraper:
         # Always provide fallback if scraping fails or returns no results
         return await self.get_fallback_jobs(skills, roles)
     
-    def deduplicate_jobs(self, jobs: List[Dict]) -> List[Dict]:
-        """Remove duplicate job listings"""
-        seen = set()
-        unique_jobs = []
+    async def stream_jobs_comprehensive(self, skills: List[str], roles: List[str], location: str = "United States",
+                                        max_results: int = 15,
+                                        skill_weights: Optional[Dict[str, float]] = None
+                                        ) -> AsyncIterator[Tuple[str, str, List[Dict]]]:
+        """Like ``search_jobs_comprehensive``, but yield as each source answers
         
-        for job in jobs:
-            # Create a unique identifier for the job
-            identifier = f"{job.get('title', '').lower()}_{job.get('company', '').lower()}"
-            if identifier not in seen and job.get('title') != "Unknown Title":
-                seen.add(identifier)
-                unique_jobs.append(job)
+        Yields (source, status, jobs) where ``jobs`` is the ranked top
+        ``max_results`` of everything found so far, so the last value is the
+        final result. Source is "index" when the local index answered,
+        "cache" for a cached or shared board search and "fallback" when
+        nothing was found.
+        """
+        found_any = False
+        try:
+            all_jobs = await self.search_index(skills, location, roles=roles)
+            if all_jobs:
+                found_any = True
+                yield "index", "ok", self._rank_jobs(all_jobs, skills, roles, skill_weights)[:max_results]
+            else:
+                primary_query = f"{roles[0]} {' '.join(skills[:3])}" if roles else ' '.join(skills[:5])
+                all_jobs = []
+                async for name, status, jobs in self.stream_all_boards(primary_query, location, max_results):
+                    all_jobs.extend(jobs)
+                    found_any = found_any or bool(all_jobs)
+                    ranked = self._rank_jobs(list(all_jobs), skills, roles, skill_weights) if all_jobs else []
+                    yield name, status, ranked[:max_results]
+        except Exception as e:
+            print(f"Streaming search error: {e}")
+        
+        if not found_any:
+            yield "fallback", "ok", await self.get_fallback_jobs(skills, roles)
+    
+    def _rank_jobs(self, jobs: List[Dict], skills: List[str], roles: List[str],
+                   skill_weights: Optional[Dict[str, float]] = None) -> List[Dict]:
+        """Deduplicate, tag and rank a candidate list"""
+        with stage("ranking"):
+            unique_jobs = self.deduplicate_jobs(jobs)
+            keyword_hits = self.add_match_keywords(unique_jobs, skills, roles)
+            return job_ranker.rank(unique_jobs, keyword_hits, roles, skill_weights)
+    
+    def stats(self) -> Dict:
+        """Per-board scrape outcome counters"""
+        return {
+            "enabled_boards": self.enabled_boards,
+            "deadline_seconds": self.search_deadline,
+            "sources": self.source_stats,
+            "rate_limits": self.rate_limiter.stats(),
+            "search_cache": self.search_cache.stats(),
+            "index": {
+                "min_hits": self.index_min_hits,
+                "min_terms": self.index_min_terms,
+                "hits": self.index_stats["hits"],
+                "misses": self.index_stats["misses"],
+                "crawler": {
+                    "running": self._crawl_task is not None and not self._crawl_task.done(),
+                    "queries": self.crawl_queries,
+                    "locations": self.crawl_locations,
+                    "interval_seconds": self.crawl_interval,
+                    **self.crawl_stats
+                }
+            },
+            "parsing": {
+                "executor": self.parse_executor_kind,
+                "workers": self.parse_workers,
+                "max_pending": self.parse_max_pending,
+                "pending": self.parse_stats["pending"],
+                "parsed": self.parse_stats["parsed"],
+                "failed": self.parse_stats["failed"],
+                "pool_restarts": self.parse_stats["pool_restarts"],
+                "avg_ms": round(self.parse_stats["seconds"] / self.parse_stats["parsed"] * 1000, 2)
+                if self.parse_stats["parsed"] else 0.0
+            }
+        }
+    
+    def deduplicate_jobs(self, jobs: List[Dict]) -> List[Dict]:
+        """Remove duplicate job listings
         
-        return unique_jobs
+        Near-duplicates (the same posting on several boards with slightly
+        different titles or company suffixes) collapse to their richest copy.
+        """
+        return job_deduplicator.deduplicate([job for job in jobs if job.get('title') != "Unknown Title"])
     
-    def add_match_keywords(self, jobs: List[Dict], skills: List[str], roles: List[str]):
-        """Add matching keywords to job listings"""
-        all_keywords = [skill.lower() for skill in skills] + [role.lower() for role in roles]
+    def add_match_keywords(self, jobs: List[Dict], skills: List[str], roles: List[str]) -> List[Dict[str, List[int]]]:
+        """Add matching keywords to job listings
+        
+        Skills are resolved to canonical taxonomy IDs first, so aliases of
+        one skill ("JS", "JavaScript") count once and any alias found in the
+        listing tags the skill. All keywords are found with one automaton
+        scan per listing, on whole words only. Returns, per job, the start
+        offsets (in the normalized title + snippet) of each matched keyword.
+        """
+        keywords = []
+        patterns = []
+        seen_ids = set()
+        for skill in skills:
+            skill_id = skill_taxonomy.resolve(skill)
+            if skill_id is None:
+                terms = [normalize_skill(skill)]
+            elif skill_id not in seen_ids:
+                seen_ids.add(skill_id)
+                terms = skill_taxonomy.text_aliases(skill_id)
+            else:
+                continue
+            patterns.extend((term, len(keywords)) for term in terms)
+            keywords.append(skill.lower())
+        for role in roles:
+            patterns.append((normalize_skill(role), len(keywords)))
+            keywords.append(role.lower())
         
+        matcher = KeywordMatcher(patterns)
+        all_hits = []
         for job in jobs:
-            job_text = f"{job.get('title', '')} {job.get('snippet', '')}".lower()
-            matched_keywords = []
+            job_text = normalize_skill(f"{job.get('title', '')} {job.get('snippet', '')}")
+            positions = matcher.count(job_text)
             
-            for keyword in all_keywords:
-                if keyword.lower() in job_text and keyword not in matched_keywords:
-                    matched_keywords.append(keyword)
-            
-            job['match_keywords'] = matched_keywords
+            # Keep keyword order stable (skills first, then roles) and drop repeats
+            matched = sorted(positions)
+            job['match_keywords'] = list(dict.fromkeys(keywords[index] for index in matched))
+            hits = {}
+            for index in matched:
+                hits.setdefault(keywords[index], set()).update(positions[index])
+            all_hits.append({keyword: sorted(starts) for keyword, starts in hits.items()})
+        
+        return all_hits
 
     async def get_fallback_jobs(self, skills: List[str], roles: List[str]) -> List[Dict]:
         """Provide enhanced fallback job search links and curated opportunities"""
@@ -343,8 +866,11 @@ class JobScraper:
             }
         ]
         
-        # Add skill-specific job boards
-        if any(skill.lower() in ['python', 'javascript', 'react', 'node', 'django', 'fastapi'] for skill in skills):
+        # Add skill-specific job boards, chosen by taxonomy category
+        web_skills = [skill for skill in skills if skill_taxonomy.in_category(skill, "web_development")]
+        ml_skills = [skill for skill in skills if skill_taxonomy.in_category(skill, "machine_learning")]
+        
+        if web_skills:
             enhanced_jobs.append({
                 "title": f"Python/Web Developer Positions",
                 "company": "Stack Overflow Jobs + Dev Community",
@@ -354,10 +880,10 @@ class JobScraper:
                 "source": "Stack Overflow",
                 "posted_date": "Developer Community",
                 "snippet": "Jobs from the world's largest developer community. Technical challenges and growth opportunities.",
-                "match_keywords": [skill for skill in skills if skill.lower() in ['python', 'javascript', 'react', 'node', 'django', 'fastapi']]
+                "match_keywords": web_skills
             })
         
-        if any(skill.lower() in ['ai', 'ml', 'machine learning', 'tensorflow', 'pytorch', 'data science'] for skill in skills):
+        if ml_skills:
             enhanced_jobs.append({
                 "title": f"AI/ML Engineer Opportunities",
                 "company": "AI-First Companies",
@@ -367,10 +893,21 @@ class JobScraper:
                 "source": "AI Companies",
                 "posted_date": "AI Focus",
                 "snippet": "Cutting-edge AI/ML positions at companies pushing the boundaries of artificial intelligence.",
-                "match_keywords": [skill for skill in skills if 'ai' in skill.lower() or 'ml' in skill.lower() or 'learning' in skill.lower()]
+                "match_keywords": ml_skills
             })
         
         return enhanced_jobs[:6]  # Return top 6 curated opportunities
 
+def _warm_parser(html_parser: str):
+    """Parse-pool warm-up task: import BeautifulSoup and build a tiny tree with ``html_parser``"""
+    from bs4 import BeautifulSoup
+    BeautifulSoup("<p></p>", html_parser)
+
+
+def _parse_page_in_worker(board: str, html: str, max_results: int, html_parser: str) -> List[Dict]:
+    """Process-pool entry point: parse a result page with the worker's scraper instance"""
+    job_scraper.html_parser = html_parser
+    return getattr(job_scraper, f"parse_{board}_page")(html, max_results)
+
 # Global job scraper instance
 job_scraper = JobScraper()
@@ -0,0 +1,78 @@
+"""
+Aho-Corasick multi-keyword matcher with word-boundary checks
+"""
+from collections import deque
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+
+class KeywordMatcher:
+    """Find many keywords in a text with one left-to-right scan.
+
+    Patterns map to a key (e.g. a canonical skill ID); several patterns may
+    share a key. Texts are expected to be normalized the same way as the
+    patterns (see ``skill_taxonomy.normalize_skill``), so a word boundary is a
+    space or either end of the text and "go" never matches inside "google".
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, Hashable]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Output per node: (pattern length, key) for every pattern ending here
+        self._out: List[List[Tuple[int, Hashable]]] = [[]]
+
+        for pattern, key in patterns:
+            if not pattern:
+                continue
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = next_node
+            self._out[node].append((len(pattern), key))
+
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find_all(self, text: str) -> List[Tuple[int, int, Hashable]]:
+        """Return (start, end, key) for every whole-word pattern occurrence in ``text``"""
+        hits = []
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        length = len(text)
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if not out[node]:
+                continue
+            end = index + 1
+            if end < length and text[end] != ' ':
+                continue
+            for pattern_length, key in out[node]:
+                start = end - pattern_length
+                if start == 0 or text[start - 1] == ' ':
+                    hits.append((start, end, key))
+        return hits
+
+    def count(self, text: str) -> Dict[Hashable, List[int]]:
+        """Map each matched key to the start offsets of its occurrences"""
+        positions: Dict[Hashable, List[int]] = {}
+        for start, _, key in self.find_all(text):
+            positions.setdefault(key, []).append(start)
+        return positions
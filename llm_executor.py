@@ -0,0 +1,116 @@
+"""
+Bounded async execution layer for blocking Gemini calls
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from request_profiler import request_profiler
+
+
+class LLMExecutor:
+    """Run synchronous LLM client calls on a dedicated, bounded thread pool.
+
+    The Gemini SDK call is blocking, so it is handed to a private thread pool
+    instead of running on the event loop. A semaphore caps how many calls are
+    in flight per process; callers beyond the cap wait in an asyncio queue and
+    are counted in ``queued`` so the backlog can be observed.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, timeout: Optional[float] = None):
+        self.max_concurrency = max_concurrency or int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+        self.timeout = timeout or float(os.getenv("LLM_TIMEOUT", "30"))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # Metrics
+        self.queued = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.total_latency = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix="llm"
+            )
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Run ``func(*args, **kwargs)`` in the pool and await its result.
+
+        Raises ``asyncio.TimeoutError`` if the call does not finish within the
+        timeout. The worker thread cannot be interrupted, so its slot stays
+        taken (and counted in ``in_flight``) until it returns; the timeout
+        only starts once a thread is free to run the call.
+        """
+        loop = asyncio.get_running_loop()
+        timeout = timeout or self.timeout
+
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            job = self._get_executor().submit(request_profiler.wrap(lambda: func(*args, **kwargs)))
+        except BaseException:
+            self._release()
+            raise
+        # Release from the pool thread's completion, not from the caller, which may give up first
+        job.add_done_callback(lambda _: self._release_threadsafe(loop))
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(job), timeout=timeout)
+            self.completed += 1
+            return result
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.total_latency += time.perf_counter() - start
+
+    def _release(self):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def _release_threadsafe(self, loop: asyncio.AbstractEventLoop):
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            # Event loop already closed (shutdown)
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of executor counters"""
+        finished = self.completed + self.failed + self.timeouts
+        return {
+            "max_concurrency": self.max_concurrency,
+            "timeout_seconds": self.timeout,
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "avg_latency_ms": round(self.total_latency / finished * 1000, 2) if finished else 0.0
+        }
+
+    def shutdown(self):
+        """Release pool threads; pending calls are not waited for"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global LLM executor instance
+llm_executor = LLMExecutor()
@@ -1,26 +1,85 @@
 import os
-import fitz  # PyMuPDF
-import aiohttp
-import google.generativeai as genai
-from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.responses import JSONResponse, FileResponse
+import threading
+from fastapi import FastAPI, File, Form, Header, UploadFile, HTTPException
+from fastapi.responses import JSONResponse, FileResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List
+from typing import List, Optional
 from dotenv import load_dotenv
 import json
 import asyncio
+import time
 from datetime import datetime
 from job_scraper import job_scraper
+from llm_executor import llm_executor
+from skill_cache import skill_cache
+from pdf_extractor import pdf_extractor, PDFParseError, PDFTooLargeError
+from skill_matcher import skill_matcher
+from skill_taxonomy import skill_taxonomy
+from job_ranker import skill_weights_from_text
+from job_index import job_index
+from skill_batcher import SkillBatcher, estimate_tokens, parse_json_response
+from text_preprocessor import text_preprocessor
+from match_queue import QueueFullError, WebhookURLError, match_queue
+from metrics import (
+    TimingMiddleware, llm_prompt_tokens, llm_response_tokens, llm_seconds, metrics, record_stage, stage
+)
+from request_profiler import ProfilingMiddleware, request_profiler
+from warmup import warm_up
+from worker_recycler import RecyclingMiddleware, worker_recycler
 
 load_dotenv()
 
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-if not GEMINI_API_KEY:
-    raise EnvironmentError('GEMINI_API_KEY not set')
 
-genai.configure(api_key=GEMINI_API_KEY)
-model = genai.GenerativeModel('gemini-1.5-flash')
+GEMINI_MODEL = 'gemini-1.5-flash'
+# Bump when the extraction prompt changes so cached results are invalidated
+PROMPT_VERSION = 'skills-v2'
+# Upper bound on documents per side of a /match/batch request
+MATCH_BATCH_MAX = int(os.getenv("MATCH_BATCH_MAX", "200"))
+# Add a Server-Timing header with the per-stage breakdown to every response
+SERVER_TIMING = os.getenv("SERVER_TIMING", "0").lower() in ("1", "true", "yes")
+
+# Created on first use (or by the startup warm-up) so importing the app stays fast
+model = None
+_model_lock = threading.Lock()
+
+class GeminiUnavailableError(EnvironmentError):
+    """Raised when skill extraction is requested without a configured Gemini API key"""
+
+def get_model():
+    """Return the Gemini model, importing and configuring the SDK on the first call"""
+    global model
+    if model is None:
+        with _model_lock:
+            if model is None:
+                if not GEMINI_API_KEY:
+                    raise GeminiUnavailableError('GEMINI_API_KEY not set')
+                import google.generativeai as genai  # slow to import, loaded on first use
+                genai.configure(api_key=GEMINI_API_KEY)
+                model = genai.GenerativeModel(GEMINI_MODEL)
+    return model
+
+def require_gemini():
+    """Reject a request needing skill extraction up front when no Gemini key is configured"""
+    if not GEMINI_API_KEY:
+        raise HTTPException(status_code=503, detail="Skill extraction is unavailable: GEMINI_API_KEY is not set")
+
+def preload():
+    """Load what the app otherwise loads lazily, before a multi-worker server forks its workers.
+
+    Called in the gunicorn master (see gunicorn.conf.py) after main was
+    imported, which already built the skill taxonomy and keyword matchers.
+    Workers then share these modules and data copy-on-write instead of each
+    loading them. Only imports and in-memory data: threads, sockets and
+    SQLite connections must not cross the fork.
+    """
+    import aiohttp  # noqa: F401
+    import bs4  # noqa: F401
+    import fitz  # noqa: F401  (PyMuPDF, inherited by the PDF pool processes the workers fork)
+    import google.generativeai  # noqa: F401
+    if job_scraper.html_parser == 'lxml':
+        import lxml.etree  # noqa: F401
 
 app = FastAPI(
     title="SkillMatchAPI",
@@ -35,8 +94,44 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# Opt-in sampling profiler for a fraction of requests, or those sent with an X-Profile header
+if request_profiler.enabled:
+    app.add_middleware(ProfilingMiddleware, profiler=request_profiler)
+
+# Request-count recycling of gunicorn workers; inert unless gunicorn.conf.py arms it
+app.add_middleware(RecyclingMiddleware, recycler=worker_recycler)
+
+# Request latency histograms and the optional Server-Timing header (outermost, so it times everything)
+app.add_middleware(TimingMiddleware, server_timing=SERVER_TIMING)
+
+@app.on_event("startup")
+async def startup_event():
+    """Start the match workers and warm up the heavy clients and pools in the background"""
+    request_profiler.start()
+    await match_queue.start(run_queued_match)
+    # Not awaited: the server accepts requests (and answers /health) while these load.
+    # Worker processes are forked before the Gemini SDK is imported on a thread, so no
+    # child inherits an import lock held mid-import and deadlocks on its own imports.
+    warm_up.start([
+        {"pdf_pool": pdf_extractor.warm_up, "html_parsers": job_scraper.warm_up},
+        {"gemini": lambda: asyncio.to_thread(get_model), "job_scraper": job_scraper.start}
+    ])
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release background worker pools"""
+    await warm_up.cancel()
+    await match_queue.close()
+    await job_scraper.close()
+    llm_executor.shutdown()
+    pdf_extractor.shutdown()
+    skill_cache.close()
+    job_index.close()
+    request_profiler.stop()
+
 # Mount static files for frontend
 app.mount("/frontend", StaticFiles(directory="frontend", html=True), name="frontend")
 
@@ -61,15 +156,40 @@ async def get_dummy_job_description():
     """Serve the dummy job description PDF for testing"""
     return FileResponse("dummy_job_description.pdf", media_type="application/pdf")
 
-def extract_text_from_pdf(file: UploadFile) -> str:
+async def extract_text_from_pdf(file: UploadFile) -> str:
     """Extract text content from uploaded PDF file"""
-    doc = fitz.open(stream=file.file.read(), filetype='pdf')
-    text = "\n".join(page.get_text() for page in doc)
-    doc.close()
+    try:
+        return await pdf_extractor.extract(file)
+    except PDFTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except PDFParseError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+async def generate_text(prompt: str) -> str:
+    """Send one prompt to Gemini and return the response text"""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        # Run the blocking SDK call on the bounded LLM pool so the event loop stays free
+        response = await llm_executor.run(lambda: get_model().generate_content(prompt))
+        text = response.candidates[0].content.parts[0].text
+        outcome = "ok"
+    except asyncio.TimeoutError:
+        outcome = "timeout"
+        raise
+    finally:
+        end = time.perf_counter()
+        llm_seconds.observe(end - start, outcome=outcome)
+        record_stage("llm", start, end)
+    
+    # Token counts from the API when it reports them, estimated otherwise
+    usage = getattr(response, "usage_metadata", None)
+    llm_prompt_tokens.observe(getattr(usage, "prompt_token_count", 0) or estimate_tokens(prompt))
+    llm_response_tokens.observe(getattr(usage, "candidates_token_count", 0) or estimate_tokens(text))
     return text
 
-async def extract_skills(text: str) -> dict:
-    """Use Gemini API to extract skills, roles, and summary from text"""
+async def request_skills(text: str) -> dict:
+    """Extract skills, roles, and summary from a single document with its own Gemini call"""
     prompt = f"""
     Given the following resume or job description:
     ---
@@ -83,20 +203,42 @@ async def extract_skills(text: str) -> dict:
     Return ONLY a valid JSON object with fields: skills, roles, summary.
     Do not include any markdown formatting or additional text.
     """
+    return parse_json_response(await generate_text(prompt))
+
+# Concurrent extractions are packed into multi-document prompts
+skill_batcher = SkillBatcher(generate=generate_text, extract_one=request_skills)
+
+async def extract_skills(text: str, text_stats: Optional[dict] = None) -> dict:
+    """Use Gemini API to extract skills, roles, and summary from text
+    
+    The text is cleaned and cut to the token budget first; if ``text_stats``
+    is given it is filled with the before/after sizes.
+    """
+    with stage("preprocess"):
+        text, report = text_preprocessor.prepare(text)
+    if text_stats is not None:
+        text_stats.update(report)
+    with stage("skill_cache"):
+        cache_key = skill_cache.make_key(text, f"{PROMPT_VERSION}:{GEMINI_MODEL}")
+        cached = await skill_cache.get(cache_key)
+    if cached is not None:
+        return cached
     
     try:
-        response = model.generate_content(prompt)
-        response_text = response.candidates[0].content.parts[0].text
-        
-        # Clean up the response to ensure it's valid JSON
-        response_text = response_text.strip()
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
-        
-        return json.loads(response_text)
+        skills_data = await skill_batcher.extract(text)
+        # Only successful extractions are cached; fallbacks are retried next time
+        await skill_cache.set(cache_key, skills_data)
+        return skills_data
+    except GeminiUnavailableError:
+        # A configuration problem, not a bad document: fail the request instead of returning placeholders
+        require_gemini()
+        raise
+    except asyncio.TimeoutError:
+        return {
+            "skills": ["Unable to parse skills"],
+            "roles": ["Unable to parse roles"],
+            "summary": f"Error parsing content: Gemini call timed out after {llm_executor.timeout}s"
+        }
     except (json.JSONDecodeError, Exception) as e:
         # Fallback in case Gemini doesn't return valid JSON
         return {
@@ -105,44 +247,248 @@ async def extract_skills(text: str) -> dict:
             "summary": f"Error parsing content: {str(e)}"
         }
 
-async def search_jobs(query: str, skills: List[str] = None, roles: List[str] = None, location: str = "United States") -> List[dict]:
-    """Search for real job openings using web scraping"""
-    try:
-        # Use comprehensive job search
-        if skills and roles:
-            jobs = await job_scraper.search_jobs_comprehensive(skills, roles, location, max_results=15)
-        else:
-            # Fallback to basic search
-            jobs = await job_scraper.scrape_indeed_jobs(query, location, max_results=10)
+def score_skills(resume_data: dict, job_data: dict) -> dict:
+    """Match extracted resume skills against extracted job skills and build the job search query"""
+    with stage("scoring"):
+        # Calculate matching skills (fuzzy, so "js" ~ "javascript" and "postgres" ~ "postgresql")
+        # Aliases of one canonical skill ("JS", "JavaScript") count once. Original casing
+        # is kept for the matcher, which splits camel case ("JavaScript" -> "js")
+        resume_skill_names = skill_taxonomy.dedupe(resume_data.get('skills', []))
+        job_skill_names = skill_taxonomy.dedupe(job_data.get('skills', []))
+        job_skills = [skill.lower() for skill in job_skill_names]
+    
+        skill_matches = skill_matcher.match(resume_skill_names, job_skill_names)
+        matched_skills = [pair["job_skill"].lower() for pair in skill_matches]
+        total_job_skills = len(job_skills)
+        score = (len(matched_skills) / total_job_skills * 100) if total_job_skills > 0 else 0
+    
+        # Generate job search query
+        suggested_role = job_data.get('roles', [''])[0] if job_data.get('roles') else ''
+        top_skills = job_skills[:5]  # Use top 5 skills for search
+        job_query = f"{suggested_role} {' '.join(top_skills)}" if suggested_role else ' '.join(top_skills)
+    
+        return {
+            "job_skills": job_skills,
+            "matched_skills": matched_skills,
+            "skill_matches": skill_matches,
+            "match_score": round(score, 2),
+            "suggested_role": suggested_role,
+            "job_search_query": job_query
+        }
+
+async def search_jobs(query: str, skills: List[str] = None, roles: List[str] = None, location: str = "United States",
+                      source_status: Optional[dict] = None, skill_weights: Optional[dict] = None) -> List[dict]:
+    """Search for real job openings in the local job index, scraping live when it has too few
+    
+    If ``source_status`` is given it is filled with the per-board outcome.
+    ``skill_weights`` is passed to the ranker for skill+role searches.
+    """
+    with stage("job_search"):
+        try:
+            # Use comprehensive job search
+            if skills and roles:
+                jobs = await job_scraper.search_jobs_comprehensive(
+                    skills, roles, location, max_results=15, source_status=source_status,
+                    skill_weights=skill_weights
+                )
+            else:
+                # Fallback to basic search: local index first, then all boards live
+                jobs = await job_scraper.search_index(skills or [query], location, limit=10)
+                statuses = {"index": "ok"} if jobs else {}
+                if not jobs:
+                    jobs, statuses = await job_scraper.scrape_all_boards(query, location, max_results=10)
+                jobs = job_scraper.deduplicate_jobs(jobs)
+                if source_status is not None:
+                    source_status.update(statuses)
         
-        # If no jobs found, provide fallback search URLs
-        if not jobs and skills and roles:
-            jobs = await job_scraper.get_fallback_jobs(skills, roles)
+            # If no jobs found, provide fallback search URLs
+            if not jobs and skills and roles:
+                jobs = await job_scraper.get_fallback_jobs(skills, roles)
         
-        return jobs
-    except Exception as e:
-        print(f"Job search error: {e}")
-        # Return fallback URLs if scraping fails
-        if skills and roles:
-            return await job_scraper.get_fallback_jobs(skills, roles)
-        else:
-            return [{
-                "title": "Job Search Results",
-                "company": "Multiple Companies",
-                "location": "Various",
-                "salary": "Competitive",
-                "link": f"https://www.indeed.com/jobs?q={query.replace(' ', '+')}",
-                "source": "Indeed",
-                "posted_date": "Live Results",
-                "snippet": "Click to view current job openings",
-                "match_keywords": []
-            }]
+            return jobs
+        except Exception as e:
+            print(f"Job search error: {e}")
+            # Return fallback URLs if scraping fails
+            if skills and roles:
+                return await job_scraper.get_fallback_jobs(skills, roles)
+            else:
+                return [{
+                    "title": "Job Search Results",
+                    "company": "Multiple Companies",
+                    "location": "Various",
+                    "salary": "Competitive",
+                    "link": f"https://www.indeed.com/jobs?q={query.replace(' ', '+')}",
+                    "source": "Indeed",
+                    "posted_date": "Live Results",
+                    "snippet": "Click to view current job openings",
+                    "match_keywords": []
+                }]
 
 @app.get("/")
 async def root():
     """Health check endpoint"""
     return {"message": "SkillMatchAPI is running", "status": "healthy"}
 
+@app.get("/health")
+async def health():
+    """Liveness probe: answers as soon as the server accepts connections, without touching heavy clients"""
+    return {"status": "ok"}
+
+@app.get("/ready")
+async def ready():
+    """Readiness probe: 503 until the background warm-up finished, with the state of each component"""
+    state = warm_up.stats()
+    return JSONResponse(state, status_code=200 if warm_up.finished else 503)
+
+def component_metrics() -> list:
+    """Cache, queue and pool counters kept by the components, as Prometheus metric families"""
+    skill_cache_stats = skill_cache.stats()
+    search_cache_stats = job_scraper.search_cache.stats()
+    executor_stats = llm_executor.stats()
+    queue_stats = match_queue.stats()
+    lookups = [
+        ({"cache": "skill", "result": "memory_hit"}, skill_cache_stats["memory_hits"]),
+        ({"cache": "skill", "result": "disk_hit"}, skill_cache_stats["disk_hits"]),
+        ({"cache": "skill", "result": "miss"}, skill_cache_stats["misses"]),
+        ({"cache": "search", "result": "hit"}, search_cache_stats["hits"]),
+        ({"cache": "search", "result": "stale_hit"}, search_cache_stats["stale_hits"]),
+        ({"cache": "search", "result": "miss"}, search_cache_stats["misses"]),
+        ({"cache": "job_index", "result": "hit"}, job_scraper.index_stats["hits"]),
+        ({"cache": "job_index", "result": "miss"}, job_scraper.index_stats["misses"])
+    ]
+    return [
+        ("skillmatch_cache_lookups_total", "counter", "Cache and job index lookups by result", lookups),
+        ("skillmatch_cache_hit_ratio", "gauge", "Share of lookups answered without upstream work", [
+            ({"cache": "skill"}, skill_cache_stats["hit_rate"]),
+            ({"cache": "search"}, search_cache_stats["hit_rate"])
+        ]),
+        ("skillmatch_llm_in_flight", "gauge", "Gemini calls running", [({}, executor_stats["in_flight"])]),
+        ("skillmatch_llm_queued", "gauge", "Gemini calls waiting for a pool slot", [({}, executor_stats["queued"])]),
+        ("skillmatch_llm_batches_total", "counter", "Multi-document extraction prompts sent",
+         [({}, skill_batcher.batches)]),
+        ("skillmatch_pdf_in_flight", "gauge", "PDFs being parsed", [({}, pdf_extractor.in_flight)]),
+        ("skillmatch_match_queue_depth", "gauge", "Queued /match/async jobs", [({}, queue_stats["queued"])]),
+        ("skillmatch_match_jobs_total", "counter", "Finished /match/async jobs by outcome", [
+            ({"outcome": "done"}, queue_stats["completed"]),
+            ({"outcome": "failed"}, queue_stats["failed"]),
+            ({"outcome": "rejected"}, queue_stats["rejected"])
+        ])
+    ]
+
+metrics.register_collector(component_metrics)
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus metrics: latency histograms per route, stage, Gemini call and job board, plus cache hit rates"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/admin/profile")
+async def admin_profile(
+    minutes: float = 5,
+    endpoint: Optional[str] = None,
+    format: str = "folded",
+    x_admin_token: Optional[str] = Header(None)
+):
+    """
+    Aggregated samples of the requests profiled in the last ``minutes``, optionally for one
+    endpoint ("POST /match"): collapsed stacks for flamegraph tools, or a JSON summary of hot frames
+    """
+    if not request_profiler.enabled:
+        raise HTTPException(status_code=404, detail="Profiling is disabled (set PROFILING=1)")
+    if not request_profiler.token:
+        raise HTTPException(status_code=403, detail="Profile dump is disabled (set ADMIN_TOKEN)")
+    if not request_profiler.authorized(x_admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    if format == "json":
+        return request_profiler.summary(minutes, endpoint)
+    if format != "folded":
+        raise HTTPException(status_code=400, detail="format must be folded or json")
+    return PlainTextResponse(request_profiler.folded(minutes, endpoint))
+
+@app.get("/stats")
+async def stats():
+    """Runtime counters for background execution layers"""
+    return {
+        "llm_executor": llm_executor.stats(),
+        "llm_batching": skill_batcher.stats(),
+        "text_preprocessing": text_preprocessor.stats(),
+        "pdf_extractor": pdf_extractor.stats(),
+        "job_scraper": job_scraper.stats(),
+        "skill_taxonomy": {"version": skill_taxonomy.version, "skills": len(skill_taxonomy)},
+        "skill_cache": skill_cache.stats(),
+        "job_index": job_index.stats(),
+        "match_queue": match_queue.stats(),
+        "profiler": request_profiler.stats(),
+        "warm_up": warm_up.stats(),
+        "worker": worker_recycler.stats()
+    }
+
+async def read_match_documents(resume: UploadFile, job_desc: UploadFile):
+    """Validate and parse the resume and job description PDFs of a match request"""
+    # Validate file types
+    if not resume.filename.endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Resume must be a PDF file")
+    if not job_desc.filename.endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Job description must be a PDF file")
+    
+    # Extract text from PDFs (parsed in parallel in the PDF process pool)
+    resume_text, job_text = await asyncio.gather(
+        extract_text_from_pdf(resume),
+        extract_text_from_pdf(job_desc)
+    )
+    
+    if not resume_text.strip():
+        raise HTTPException(status_code=400, detail="Resume PDF appears to be empty or unreadable")
+    if not job_text.strip():
+        raise HTTPException(status_code=400, detail="Job description PDF appears to be empty or unreadable")
+    return resume_text, job_text
+
+def match_response(resume_data: dict, job_data: dict, result: dict, job_openings: List[dict],
+                   source_status: dict, text_stats: dict) -> dict:
+    """Assemble the /match response body"""
+    return {
+        "resume_summary": resume_data.get('summary', ''),
+        "job_summary": job_data.get('summary', ''),
+        "resume_skills": resume_data.get('skills', []),
+        "job_skills": job_data.get('skills', []),
+        "matched_skills": result["matched_skills"],
+        "skill_matches": result["skill_matches"],
+        "match_score": result["match_score"],
+        "suggested_role": result["suggested_role"],
+        "job_search_query": result["job_search_query"],
+        "job_openings": job_openings,  # Real job listings with clickable links
+        "total_jobs_found": len(job_openings),
+        "job_sources": source_status,
+        "text_stats": text_stats,
+        "resume_roles": resume_data.get('roles', []),
+        "job_roles": job_data.get('roles', [])
+    }
+
+async def run_match(resume_text: str, job_text: str) -> dict:
+    """Run skill extraction, scoring and job search for a parsed resume / job description pair"""
+    # Extract skills and roles using Gemini API
+    text_stats = {"resume": {}, "job_description": {}}
+    resume_data, job_data = await asyncio.gather(
+        extract_skills(resume_text, text_stats["resume"]),
+        extract_skills(job_text, text_stats["job_description"])
+    )
+    
+    result = score_skills(resume_data, job_data)
+    job_skills = result["job_skills"]
+    
+    # Get real job openings with scraping
+    source_status = {}
+    job_openings = await search_jobs(
+        result["job_search_query"], 
+        skills=job_skills, 
+        roles=job_data.get('roles', []), 
+        location="United States",
+        source_status=source_status,
+        skill_weights=skill_weights_from_text(job_skills, job_text)
+    )
+    
+    return match_response(resume_data, job_data, result, job_openings, source_status, text_stats)
+
 @app.post("/match")
 async def match(resume: UploadFile = File(...), job_desc: UploadFile = File(...)):
     """
@@ -150,62 +496,240 @@ async def match(resume: UploadFile = File(...), job_desc: UploadFile = File(...)
     and return job search links
     """
     try:
-        # Validate file types
-        if not resume.filename.endswith('.pdf'):
-            raise HTTPException(status_code=400, detail="Resume must be a PDF file")
-        if not job_desc.filename.endswith('.pdf'):
-            raise HTTPException(status_code=400, detail="Job description must be a PDF file")
+        resume_text, job_text = await read_match_documents(resume, job_desc)
+        response_body = await run_match(resume_text, job_text)
+        with stage("serialize"):
+            return JSONResponse(response_body)
         
-        # Extract text from PDFs
-        resume_text = extract_text_from_pdf(resume)
-        job_text = extract_text_from_pdf(job_desc)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@app.post("/match/stream")
+async def match_stream(resume: UploadFile = File(...), job_desc: UploadFile = File(...)):
+    """
+    Streaming variant of /match. Returns newline-delimited JSON events as each
+    stage finishes: resume_skills, job_skills, match, one job_openings event per
+    job source, and finally done with the complete /match response.
+    """
+    # Bad uploads and a missing Gemini key are still rejected with a normal HTTP error before streaming starts
+    require_gemini()
+    resume_text, job_text = await read_match_documents(resume, job_desc)
+    
+    def event(name: str, **data) -> str:
+        return json.dumps({"event": name, **data}) + "\n"
+    
+    async def events():
+        text_stats = {"resume": {}, "job_description": {}}
+        tasks = {
+            asyncio.ensure_future(extract_skills(resume_text, text_stats["resume"])): "resume_skills",
+            asyncio.ensure_future(extract_skills(job_text, text_stats["job_description"])): "job_skills"
+        }
+        try:
+            extracted = {}
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    extracted[tasks[task]] = data = task.result()
+                    yield event(tasks[task], skills=data.get('skills', []), roles=data.get('roles', []),
+                                summary=data.get('summary', ''))
+            
+            resume_data, job_data = extracted["resume_skills"], extracted["job_skills"]
+            result = score_skills(resume_data, job_data)
+            yield event("match", **{key: value for key, value in result.items() if key != "job_skills"})
+            
+            job_skills = result["job_skills"]
+            roles = job_data.get('roles', [])
+            source_status = {}
+            job_openings = []
+            if job_skills and roles:
+                async for source, status, jobs in job_scraper.stream_jobs_comprehensive(
+                    job_skills, roles, "United States", max_results=15,
+                    skill_weights=skill_weights_from_text(job_skills, job_text)
+                ):
+                    source_status[source] = status
+                    job_openings = jobs
+                    yield event("job_openings", source=source, status=status, job_openings=jobs)
+            else:
+                job_openings = await search_jobs(result["job_search_query"], skills=job_skills, roles=roles,
+                                                 source_status=source_status)
+                yield event("job_openings", source="search", status="ok", job_openings=job_openings)
+            
+            yield event("done", result=match_response(resume_data, job_data, result, job_openings,
+                                                      source_status, text_stats))
+        except Exception as e:
+            yield event("error", detail=f"Internal server error: {str(e)}")
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(
+        events(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def run_queued_match(payload: dict) -> dict:
+    """Worker side of /match/async: run the match on the already extracted texts"""
+    return await run_match(payload["resume"], payload["job_desc"])
+
+@app.post("/match/async", status_code=202)
+async def match_async(
+    resume: UploadFile = File(...),
+    job_desc: UploadFile = File(...),
+    webhook_url: Optional[str] = Form(None)
+):
+    """
+    Queue a match and return its job ID immediately. Poll GET /match/{id} for the
+    result, or pass webhook_url to have the finished job POSTed there.
+    """
+    if not resume.filename.endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Resume must be a PDF file")
+    if not job_desc.filename.endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Job description must be a PDF file")
+    require_gemini()
+    if webhook_url:
+        try:
+            await match_queue.check_webhook_url(webhook_url)
+        except WebhookURLError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        # Check for room before parsing, then queue the extracted text rather than the raw PDFs
+        match_queue.check_capacity()
+        resume_text, job_text = await read_match_documents(resume, job_desc)
+        job_id = await match_queue.submit({"resume": resume_text, "job_desc": job_text}, webhook_url)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    
+    return JSONResponse(
+        {"id": job_id, "status": "queued", "status_url": f"/match/{job_id}"},
+        status_code=202
+    )
+
+@app.get("/match/{job_id}")
+async def match_status(job_id: str):
+    """
+    Status of a queued match: queued, running, done (with result) or failed (with error)
+    """
+    record = await match_queue.get(job_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired match job")
+    return record
+
+@app.post("/match/batch")
+async def match_batch(
+    resumes: List[UploadFile] = File(...),
+    job_descs: List[UploadFile] = File(...),
+    include_jobs: bool = False,
+    location: str = "United States"
+):
+    """
+    Score one resume against many job descriptions, or many resumes against one
+    job description, and return a table ranked by match score
+    """
+    if len(resumes) != 1 and len(job_descs) != 1:
+        raise HTTPException(status_code=400, detail="Send one resume with many job descriptions, or many resumes with one job description")
+    if max(len(resumes), len(job_descs)) > MATCH_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"At most {MATCH_BATCH_MAX} documents per batch")
+    for upload in resumes + job_descs:
+        if not upload.filename.endswith('.pdf'):
+            raise HTTPException(status_code=400, detail=f"{upload.filename} must be a PDF file")
+    require_gemini()
+    
+    start = time.perf_counter()
+    errors = []
+    
+    async def parse(upload: UploadFile) -> Optional[str]:
+        try:
+            text = await extract_text_from_pdf(upload)
+        except HTTPException as e:
+            errors.append({"filename": upload.filename, "error": e.detail})
+            return None
+        except Exception as e:
+            errors.append({"filename": upload.filename, "error": f"Error reading PDF: {str(e)}"})
+            return None
+        if not text.strip():
+            errors.append({"filename": upload.filename, "error": "PDF appears to be empty or unreadable"})
+            return None
+        return text
+    
+    try:
+        # Parse every PDF once, all in parallel on the PDF process pool
+        texts = await asyncio.gather(*(parse(upload) for upload in resumes + job_descs))
         
-        if not resume_text.strip():
-            raise HTTPException(status_code=400, detail="Resume PDF appears to be empty or unreadable")
-        if not job_text.strip():
-            raise HTTPException(status_code=400, detail="Job description PDF appears to be empty or unreadable")
+        # Identical documents share one extraction; the rest run concurrently on the
+        # bounded LLM pool, and previously seen documents come from the skill cache
+        extractions = {}
+        document_stats = {}
+        for text in texts:
+            if text is not None and text not in extractions:
+                document_stats[text] = {}
+                extractions[text] = asyncio.ensure_future(extract_skills(text, document_stats[text]))
+        await asyncio.gather(*extractions.values())
         
-        # Extract skills and roles using Gemini API
-        resume_data, job_data = await asyncio.gather(
-            extract_skills(resume_text),
-            extract_skills(job_text)
-        )
+        def extracted(text: Optional[str]) -> Optional[dict]:
+            return extractions[text].result() if text is not None else None
         
-        # Calculate matching skills
-        resume_skills = set([skill.lower().strip() for skill in resume_data.get('skills', [])])
-        job_skills = set([skill.lower().strip() for skill in job_data.get('skills', [])])
+        resume_docs = [(upload.filename, text, extracted(text)) for upload, text in zip(resumes, texts[:len(resumes)])]
+        job_docs = [(upload.filename, text, extracted(text)) for upload, text in zip(job_descs, texts[len(resumes):])]
         
-        matched_skills = list(resume_skills & job_skills)
-        total_job_skills = len(job_skills)
-        score = (len(matched_skills) / total_job_skills * 100) if total_job_skills > 0 else 0
+        results = []
+        for resume_name, _, resume_data in resume_docs:
+            for job_number, (job_name, job_text, job_data) in enumerate(job_docs):
+                if resume_data is None or job_data is None:
+                    continue
+                result = score_skills(resume_data, job_data)
+                results.append({
+                    "resume": resume_name,
+                    "job_description": job_name,
+                    "match_score": result["match_score"],
+                    "matched_skills": result["matched_skills"],
+                    "missing_skills": [skill for skill in result["job_skills"] if skill not in result["matched_skills"]],
+                    "suggested_role": result["suggested_role"],
+                    "job_search_query": result["job_search_query"],
+                    "_job": (job_number, job_text, job_data, result["job_skills"])
+                })
+        results.sort(key=lambda row: row["match_score"], reverse=True)
         
-        # Generate job search query
-        suggested_role = job_data.get('roles', [''])[0] if job_data.get('roles') else ''
-        top_skills = list(job_skills)[:5]  # Use top 5 skills for search
-        job_query = f"{suggested_role} {' '.join(top_skills)}" if suggested_role else ' '.join(top_skills)
+        # Optional job search, once per distinct job description
+        openings = {}
+        if include_jobs:
+            searches = {}
+            for row in results:
+                job_number, job_text, job_data, job_skills = row["_job"]
+                if job_number not in searches:
+                    searches[job_number] = search_jobs(
+                        row["job_search_query"],
+                        skills=job_skills,
+                        roles=job_data.get('roles', []),
+                        location=location,
+                        skill_weights=skill_weights_from_text(job_skills, job_text)
+                    )
+            found = await asyncio.gather(*searches.values())
+            openings = dict(zip(searches.keys(), found))
         
-        # Get real job openings with scraping
-        job_openings = await search_jobs(
-            job_query, 
-            skills=list(job_skills), 
-            roles=job_data.get('roles', []), 
-            location="United States"
-        )
+        for rank, row in enumerate(results, start=1):
+            job_number = row.pop("_job")[0]
+            row["rank"] = rank
+            if include_jobs:
+                row["job_openings"] = openings.get(job_number, [])
         
-        return JSONResponse({
-            "resume_summary": resume_data.get('summary', ''),
-            "job_summary": job_data.get('summary', ''),
-            "resume_skills": resume_data.get('skills', []),
-            "job_skills": job_data.get('skills', []),
-            "matched_skills": matched_skills,
-            "match_score": round(score, 2),
-            "suggested_role": suggested_role,
-            "job_search_query": job_query,
-            "job_openings": job_openings,  # Real job listings with clickable links
-            "total_jobs_found": len(job_openings),
-            "resume_roles": resume_data.get('roles', []),
-            "job_roles": job_data.get('roles', [])
-        })
+        with stage("serialize"):
+            return JSONResponse({
+                "mode": "resume_vs_jobs" if len(resumes) == 1 else "resumes_vs_job",
+                "documents": len(resumes) + len(job_descs),
+                "extractions": len(extractions),
+                "results": results,
+                "errors": errors,
+                "text_stats": [
+                    {"filename": upload.filename, **document_stats[text]}
+                    for upload, text in zip(resumes + job_descs, texts) if text is not None
+                ],
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)
+            })
         
     except HTTPException:
         raise
@@ -221,17 +745,20 @@ async def extract_skills_endpoint(file: UploadFile = File(...)):
         if not file.filename.endswith('.pdf'):
             raise HTTPException(status_code=400, detail="File must be a PDF")
         
-        text = extract_text_from_pdf(file)
+        text = await extract_text_from_pdf(file)
         if not text.strip():
             raise HTTPException(status_code=400, detail="PDF appears to be empty or unreadable")
         
-        skills_data = await extract_skills(text)
+        text_stats = {}
+        skills_data = await extract_skills(text, text_stats)
         
-        return JSONResponse({
-            "filename": file.filename,
-            "extracted_data": skills_data,
-            "text_length": len(text)
-        })
+        with stage("serialize"):
+            return JSONResponse({
+                "filename": file.filename,
+                "extracted_data": skills_data,
+                "text_length": len(text),
+                "text_stats": text_stats
+            })
         
     except HTTPException:
         raise
@@ -253,11 +780,13 @@ async def search_jobs_endpoint(
             raise HTTPException(status_code=400, detail="At least one skill is required")
         
         # Search for jobs
+        source_status = {}
         job_openings = await search_jobs(
             query=" ".join(skills[:3]),
             skills=skills,
             roles=roles or [],
-            location=location
+            location=location,
+            source_status=source_status
         )
         
         return JSONResponse({
@@ -269,6 +798,7 @@ async def search_jobs_endpoint(
             },
             "total_jobs_found": len(job_openings),
             "job_openings": job_openings[:max_results],
+            "job_sources": source_status,
             "search_timestamp": datetime.now().isoformat()
         })
         
@@ -0,0 +1,343 @@
+"""
+Asynchronous /match job queue with a SQLite result store and webhook delivery
+"""
+import asyncio
+import ipaddress
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Match queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class WebhookURLError(ValueError):
+    """Raised for a webhook URL that is malformed or points at a non-public address"""
+
+
+def _process_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MatchJobStore:
+    """Job status and results in SQLite (WAL), shared by all workers of a host.
+
+    Results are kept for ``ttl`` seconds after the job finishes, then pruned.
+    Each job records the PID of the process that queued it, so a restarted
+    worker only fails the jobs that died with its predecessor.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, ttl: Optional[float] = None):
+        self.db_path = db_path if db_path is not None else os.getenv("MATCH_JOBS_DB", "match_jobs.db")
+        self.ttl = ttl or float(os.getenv("MATCH_RESULT_TTL", "3600"))
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _get_db(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.db_path or ":memory:", timeout=5, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS match_jobs ("
+                "id TEXT PRIMARY KEY, status TEXT NOT NULL, created REAL NOT NULL, updated REAL NOT NULL, "
+                "result TEXT, error TEXT, webhook_url TEXT, webhook_status TEXT, owner INTEGER)"
+            )
+            self._db.commit()
+        return self._db
+
+    def create(self, job_id: str, webhook_url: Optional[str]):
+        now = time.time()
+        with self._lock:
+            db = self._get_db()
+            db.execute(
+                "INSERT INTO match_jobs (id, status, created, updated, webhook_url, owner) "
+                "VALUES (?, 'queued', ?, ?, ?, ?)",
+                (job_id, now, now, webhook_url, os.getpid())
+            )
+            db.commit()
+
+    def update(self, job_id: str, status: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        with self._lock:
+            db = self._get_db()
+            db.execute(
+                "UPDATE match_jobs SET status = ?, updated = ?, result = ?, error = ? WHERE id = ?",
+                (status, time.time(), json.dumps(result) if result is not None else None, error, job_id)
+            )
+            db.commit()
+
+    def set_webhook_status(self, job_id: str, webhook_status: str):
+        with self._lock:
+            db = self._get_db()
+            db.execute("UPDATE match_jobs SET webhook_status = ? WHERE id = ?", (webhook_status, job_id))
+            db.commit()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the job record, or None if it is unknown or expired"""
+        with self._lock:
+            row = self._get_db().execute(
+                "SELECT id, status, created, updated, result, error, webhook_status FROM match_jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None or (row[1] in ("done", "failed") and time.time() - row[3] > self.ttl):
+            return None
+        record = {"id": row[0], "status": row[1], "created": row[2], "updated": row[3]}
+        if row[4] is not None:
+            record["result"] = json.loads(row[4])
+        if row[5] is not None:
+            record["error"] = row[5]
+        if row[6] is not None:
+            record["webhook_status"] = row[6]
+        return record
+
+    def prune(self) -> int:
+        """Delete finished jobs older than the TTL"""
+        with self._lock:
+            db = self._get_db()
+            removed = db.execute(
+                "DELETE FROM match_jobs WHERE status IN ('done', 'failed') AND updated < ?", (time.time() - self.ttl,)
+            ).rowcount
+            db.commit()
+            return removed
+
+    def fail_unfinished(self, error: str) -> int:
+        """Mark jobs left queued or running by a process that no longer exists as failed"""
+        with self._lock:
+            db = self._get_db()
+            owners = [row[0] for row in db.execute(
+                "SELECT DISTINCT owner FROM match_jobs WHERE status IN ('queued', 'running')"
+            )]
+            changed = 0
+            for owner in owners:
+                if owner != os.getpid() and _process_alive(owner):
+                    continue
+                changed += db.execute(
+                    "UPDATE match_jobs SET status = 'failed', error = ?, updated = ? "
+                    "WHERE status IN ('queued', 'running') AND owner IS ?",
+                    (error, time.time(), owner)
+                ).rowcount
+            db.commit()
+            return changed
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class MatchJobQueue:
+    """Bounded in-process queue of /match jobs processed by a fixed worker pool.
+
+    ``submit`` returns a job ID immediately, or raises ``QueueFullError``
+    with a Retry-After estimate once ``max_queue`` jobs are waiting. Workers
+    run ``handler(payload)`` and store its result (or error) in the store;
+    if the job has a webhook URL the final record is POSTed to it, with a
+    few retries.
+    """
+
+    def __init__(self, store: Optional[MatchJobStore] = None, max_queue: Optional[int] = None,
+                 workers: Optional[int] = None, webhook_retries: int = 3, webhook_timeout: float = 10):
+        self.store = store or MatchJobStore()
+        self.max_queue = max_queue or int(os.getenv("MATCH_QUEUE_SIZE", "100"))
+        self.workers = workers or int(os.getenv("MATCH_WORKERS", "4"))
+        # Seconds a shutting-down (e.g. recycled) server process keeps working through queued jobs
+        self.drain_timeout = float(os.getenv("MATCH_DRAIN_TIMEOUT", "20"))
+        self.webhook_retries = webhook_retries
+        self.webhook_timeout = webhook_timeout
+        # Hosts webhooks may target even when they resolve to private addresses (e.g. an internal service)
+        self.webhook_allowed_hosts = {
+            host.strip().lower() for host in os.getenv("MATCH_WEBHOOK_ALLOWED_HOSTS", "").split(",") if host.strip()
+        }
+        self.handler: Optional[Callable[[Dict], Awaitable[Dict]]] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+        # Metrics
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self.running = 0
+        self.total_seconds = 0.0
+        self.webhooks_sent = 0
+        self.webhooks_failed = 0
+
+    async def start(self, handler: Callable[[Dict], Awaitable[Dict]]):
+        """Start the worker tasks (called at application startup)"""
+        self.handler = handler
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            interrupted = await asyncio.to_thread(self.store.fail_unfinished, "Interrupted by a server restart")
+            if interrupted:
+                print(f"Marked {interrupted} unfinished match jobs as failed")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._prune_forever()))
+
+    async def close(self):
+        """Let the workers finish queued jobs for up to ``drain_timeout`` seconds, then stop them.
+
+        Jobs still unfinished are lost and marked failed on the next start.
+        """
+        if self._queue is not None and self._tasks and self.drain_timeout > 0:
+            try:
+                await asyncio.wait_for(self._queue.join(), self.drain_timeout)
+            except asyncio.TimeoutError:
+                print(f"Match queue: {self._queue.qsize() + self.running} jobs unfinished at shutdown")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.store.close()
+
+    def retry_after(self) -> int:
+        """Seconds until a queue slot is likely to free up"""
+        average = self.total_seconds / (self.completed + self.failed) if self.completed + self.failed else 10.0
+        depth = self._queue.qsize() if self._queue is not None else 0
+        return max(1, int(average * max(depth, 1) / self.workers))
+
+    async def check_webhook_url(self, url: str):
+        """Raise ``WebhookURLError`` unless ``url`` is http(s) and its host only resolves to public addresses.
+
+        Loopback, link-local (cloud metadata endpoints), private and other
+        reserved ranges are refused, so results cannot be POSTed into the
+        server's own network; hosts in ``MATCH_WEBHOOK_ALLOWED_HOSTS`` skip
+        the address check. Checked at submission and again before delivery.
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise WebhookURLError("webhook_url must be an http(s) URL")
+        host = parts.hostname.lower()
+        if host in self.webhook_allowed_hosts:
+            return
+        try:
+            port = parts.port or (443 if parts.scheme == "https" else 80)
+            addresses = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except (OSError, ValueError) as e:
+            raise WebhookURLError(f"webhook_url host cannot be resolved: {e}")
+        for *_, sockaddr in addresses:
+            address = ipaddress.ip_address(sockaddr[0].split('%')[0])
+            if not address.is_global:
+                raise WebhookURLError("webhook_url must not point at a private, loopback or link-local address")
+
+    def check_capacity(self):
+        """Raise ``QueueFullError`` if a submission would be rejected, before the caller does costly work"""
+        if self._queue is None:
+            raise RuntimeError("Match queue is not running")
+        if self._queue.full():
+            self.rejected += 1
+            raise QueueFullError(self.retry_after())
+
+    async def submit(self, payload: Dict, webhook_url: Optional[str] = None) -> str:
+        """Enqueue a job and return its ID"""
+        self.check_capacity()
+        job_id = uuid.uuid4().hex
+        await asyncio.to_thread(self.store.create, job_id, webhook_url)
+        self._queue.put_nowait((job_id, payload, webhook_url))
+        self.submitted += 1
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def _worker(self):
+        while True:
+            job_id, payload, webhook_url = await self._queue.get()
+            self.running += 1
+            start = time.perf_counter()
+            try:
+                await asyncio.to_thread(self.store.update, job_id, "running")
+                try:
+                    result = await self.handler(payload)
+                except Exception as e:
+                    self.failed += 1
+                    # HTTPException carries its message in .detail
+                    await asyncio.to_thread(self.store.update, job_id, "failed", None, str(getattr(e, "detail", e)))
+                else:
+                    self.completed += 1
+                    await asyncio.to_thread(self.store.update, job_id, "done", result)
+                if webhook_url:
+                    await self._deliver(job_id, webhook_url)
+            except Exception as e:
+                print(f"Match worker error for job {job_id}: {e}")
+            finally:
+                self.total_seconds += time.perf_counter() - start
+                self.running -= 1
+                self._queue.task_done()
+
+    async def _deliver(self, job_id: str, webhook_url: str):
+        import aiohttp  # only needed once a webhook is delivered
+
+        record = await self.get(job_id)
+        status = "no delivery attempts"
+        timeout = aiohttp.ClientTimeout(total=self.webhook_timeout)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            for attempt in range(self.webhook_retries):
+                if attempt:
+                    await asyncio.sleep(2 ** (attempt - 1))
+                try:
+                    # The host may resolve differently by now
+                    await self.check_webhook_url(webhook_url)
+                    async with session.post(webhook_url, json=record, allow_redirects=False) as response:
+                        if response.status < 300:
+                            self.webhooks_sent += 1
+                            await asyncio.to_thread(self.store.set_webhook_status, job_id, f"delivered ({response.status})")
+                            return
+                        status = f"HTTP {response.status}"
+                except WebhookURLError as e:
+                    status = str(e)
+                    break
+                except Exception as e:
+                    status = str(e) or type(e).__name__
+        self.webhooks_failed += 1
+        print(f"Webhook delivery failed for match job {job_id}: {status}")
+        await asyncio.to_thread(self.store.set_webhook_status, job_id, f"failed: {status}")
+
+    async def _prune_forever(self):
+        while True:
+            await asyncio.sleep(min(self.store.ttl, 300))
+            try:
+                await asyncio.to_thread(self.store.prune)
+            except sqlite3.Error as e:
+                print(f"Match job prune error: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of queue counters"""
+        finished = self.completed + self.failed
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": self.running,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_seconds": round(self.total_seconds / finished, 2) if finished else 0.0,
+            "result_ttl_seconds": self.store.ttl,
+            "webhooks_sent": self.webhooks_sent,
+            "webhooks_failed": self.webhooks_failed
+        }
+
+
+# Global match job queue instance
+match_queue = MatchJobQueue()
@@ -0,0 +1,214 @@
+"""
+Latency histograms in the Prometheus text format, per-request stage timings and Server-Timing
+"""
+import bisect
+import contextvars
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Seconds, from a cache hit to a slow Gemini call
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+COUNT_BUCKETS = (0, 1, 5, 10, 25, 50, 100)
+RATE_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# A (labels, value) sample of a collected metric
+Sample = Tuple[Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Histogram:
+    """Cumulative-bucket histogram with fixed label names, safe to observe from any thread"""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # label values -> [bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._series.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = [(key, list(counts), total[0]) for key, (counts, total) in sorted(self._series.items())]
+        for key, counts, total in series:
+            labels = dict(zip(self.labels, key))
+            cumulative = 0
+            for bound, count in zip(list(self.buckets) + [math.inf], counts):
+                cumulative += count
+                bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Histograms observed in-process plus collectors that read existing component counters.
+
+    Collectors are called at scrape time and return
+    ``(name, type, help, samples)`` tuples, so counters already kept by the
+    caches, executors and queues are exported without being tracked twice.
+    """
+
+    def __init__(self):
+        self._histograms: Dict[str, Histogram] = {}
+        self._collectors: List[Callable[[], List[Tuple[str, str, str, List[Sample]]]]] = []
+
+    def histogram(self, name: str, documentation: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        if name not in self._histograms:
+            self._histograms[name] = Histogram(name, documentation, labels, buckets)
+        return self._histograms[name]
+
+    def register_collector(self, collector: Callable[[], List[Tuple[str, str, str, List[Sample]]]]):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for histogram in self._histograms.values():
+            lines.extend(histogram.render())
+        for collector in self._collectors:
+            try:
+                families = collector()
+            except Exception as e:
+                print(f"Metrics collector error: {e}")
+                continue
+            for name, kind, documentation, samples in families:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+
+# Global metrics registry instance
+metrics = MetricsRegistry()
+
+request_seconds = metrics.histogram(
+    "skillmatch_request_seconds", "HTTP request latency by route and status", ("method", "route", "status")
+)
+stage_seconds = metrics.histogram(
+    "skillmatch_stage_seconds", "Time spent in each processing stage of a request", ("stage",)
+)
+pdf_pages_per_second = metrics.histogram(
+    "skillmatch_pdf_pages_per_second", "PDF parse throughput per document", buckets=RATE_BUCKETS
+)
+llm_seconds = metrics.histogram(
+    "skillmatch_llm_seconds", "Gemini call latency by outcome", ("outcome",)
+)
+llm_prompt_tokens = metrics.histogram(
+    "skillmatch_llm_prompt_tokens", "Prompt tokens per Gemini call", buckets=TOKEN_BUCKETS
+)
+llm_response_tokens = metrics.histogram(
+    "skillmatch_llm_response_tokens", "Response tokens per Gemini call", buckets=TOKEN_BUCKETS
+)
+scrape_seconds = metrics.histogram(
+    "skillmatch_scrape_seconds", "Job board scrape latency by board and outcome", ("board", "status")
+)
+scrape_results = metrics.histogram(
+    "skillmatch_scrape_results", "Listings returned per job board scrape", ("board",), buckets=COUNT_BUCKETS
+)
+
+# Stage spans of the current request: stage -> [first start, last end]
+_request_spans: contextvars.ContextVar[Optional[Dict[str, List[float]]]] = contextvars.ContextVar(
+    "request_spans", default=None
+)
+
+
+def record_stage(name: str, start: float, end: float):
+    """Record a finished stage in the stage histogram and in the current request's spans"""
+    stage_seconds.observe(end - start, stage=name)
+    spans = _request_spans.get()
+    if spans is not None:
+        # Concurrent runs of a stage (two Gemini calls) are reported as one wall-clock span
+        span = spans.setdefault(name, [start, end])
+        span[0], span[1] = min(span[0], start), max(span[1], end)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block as one stage; usable in sync and async code alike"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, start, time.perf_counter())
+
+
+def server_timing_header(spans: Dict[str, List[float]], total: float) -> str:
+    """Server-Timing value listing each stage and the total, in milliseconds"""
+    entries = [f"{name};dur={(end - start) * 1000:.1f}" for name, (start, end) in spans.items()]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+class TimingMiddleware:
+    """ASGI middleware recording request latency and, optionally, a Server-Timing header.
+
+    The header is written when the response starts, so a streaming
+    response only lists the stages finished before its first byte.
+    """
+
+    def __init__(self, app, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        spans: Dict[str, List[float]] = {}
+        token = _request_spans.set(spans)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    header = server_timing_header(spans, time.perf_counter() - start)
+                    message = {**message, "headers": list(message.get("headers", [])) + [
+                        (b"server-timing", header.encode("latin-1"))
+                    ]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_spans.reset(token)
+            # Route templates keep the label set bounded ("/match/{job_id}", not every ID)
+            route = getattr(scope.get("route"), "path", None) or "other"
+            request_seconds.observe(time.perf_counter() - start, method=scope["method"], route=route,
+                                    status=str(status))
@@ -0,0 +1,188 @@
+"""
+Non-blocking PDF text extraction backed by a process pool
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from metrics import pdf_pages_per_second, stage
+from request_profiler import request_profiler
+
+CHUNK_SIZE = 64 * 1024
+
+
+class PDFTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured byte cap"""
+
+
+class PDFParseError(ValueError):
+    """Raised when a document cannot be opened or kills its parser worker"""
+
+
+def _parse_pdf(data: bytes, max_pages: int, probe_pages: int) -> Tuple[str, int, float]:
+    """Parse PDF bytes in a worker process.
+
+    Returns (text, pages_parsed, elapsed_seconds). If none of the first
+    ``probe_pages`` pages yield any text the document is treated as
+    empty/unreadable and parsing stops early with an empty string.
+    """
+    import fitz  # PyMuPDF, imported in the worker process
+
+    start = time.perf_counter()
+    parts = []
+    has_text = False
+    pages = 0
+    try:
+        doc = fitz.open(stream=data, filetype='pdf')
+    except Exception as e:
+        raise PDFParseError(f"PDF could not be opened: {e}")
+    try:
+        for page in doc:
+            if pages >= max_pages:
+                break
+            page_text = page.get_text()
+            pages += 1
+            parts.append(page_text)
+            if page_text.strip():
+                has_text = True
+            elif not has_text and pages >= probe_pages:
+                return "", pages, time.perf_counter() - start
+    finally:
+        doc.close()
+    # Pages are separated by form feeds so later stages can tell page boundaries apart
+    return "\f".join(parts), pages, time.perf_counter() - start
+
+
+def _warm_worker():
+    """Pool warm-up task: load PyMuPDF so the first real document does not pay for the import"""
+    import fitz  # noqa: F401
+
+
+class PDFExtractor:
+    """Stream uploads into memory under a byte cap and parse them off the event loop.
+
+    Parsing is CPU-bound, so documents are sent to a process pool; two
+    uploads in the same request are parsed in parallel.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_bytes: Optional[int] = None,
+                 max_pages: Optional[int] = None, probe_pages: Optional[int] = None):
+        self.max_workers = max_workers or int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+        self.max_bytes = max_bytes or int(os.getenv("PDF_MAX_BYTES", str(10 * 1024 * 1024)))
+        self.max_pages = max_pages or int(os.getenv("PDF_MAX_PAGES", "50"))
+        self.probe_pages = probe_pages or int(os.getenv("PDF_PROBE_PAGES", "3"))
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        # Metrics
+        self.in_flight = 0
+        self.documents = 0
+        self.pages = 0
+        self.parse_seconds = 0.0
+        self.aborted_empty = 0
+        self.rejected_too_large = 0
+        self.pool_restarts = 0
+        self.crashed = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _drop_executor(self, executor: ProcessPoolExecutor):
+        """Discard a broken pool, unless a concurrent caller already replaced it"""
+        if self._executor is executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self.pool_restarts += 1
+
+    async def _run_in_pool(self, func: Callable[..., Any], *args) -> Any:
+        """Run ``func(*args)`` in the pool, replacing the pool if a worker died.
+
+        A worker killed by a crash (e.g. MuPDF on a hostile PDF) or the OOM
+        killer breaks the whole pool for good, so it is dropped and the next
+        call starts a fresh one. The document is not retried: resending it
+        would likely crash the new pool too.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            return await loop.run_in_executor(executor, func, *args)
+        except BrokenProcessPool:
+            self._drop_executor(executor)
+            self.crashed += 1
+            raise PDFParseError("PDF could not be parsed (the parser crashed on it)")
+
+    async def warm_up(self):
+        """Start the worker processes and import PyMuPDF in each of them"""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(*(loop.run_in_executor(executor, _warm_worker) for _ in range(self.max_workers)))
+
+    async def read_upload(self, file) -> bytes:
+        """Read an UploadFile in chunks, aborting once the byte cap is exceeded"""
+        chunks = []
+        size = 0
+        with stage("upload_read"):
+            while True:
+                chunk = await file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > self.max_bytes:
+                    self.rejected_too_large += 1
+                    raise PDFTooLargeError(f"PDF exceeds the {self.max_bytes} byte upload limit")
+                chunks.append(chunk)
+        return b"".join(chunks)
+
+    async def extract_bytes(self, data: bytes) -> str:
+        """Parse PDF bytes in the process pool and return the extracted text"""
+        self.in_flight += 1
+        try:
+            with stage("pdf_parse"):
+                text, pages, elapsed = await self._run_in_pool(_parse_pdf, data, self.max_pages, self.probe_pages)
+        finally:
+            self.in_flight -= 1
+
+        self.documents += 1
+        self.pages += pages
+        self.parse_seconds += elapsed
+        if elapsed > 0:
+            pdf_pages_per_second.observe(pages / elapsed)
+        request_profiler.record_offloaded("pdf_extractor._parse_pdf", elapsed)
+        if not text:
+            self.aborted_empty += 1
+        return text
+
+    async def extract(self, file) -> str:
+        """Read and parse an uploaded PDF"""
+        return await self.extract_bytes(await self.read_upload(file))
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of extraction counters"""
+        return {
+            "workers": self.max_workers,
+            "max_bytes": self.max_bytes,
+            "max_pages": self.max_pages,
+            "in_flight": self.in_flight,
+            "documents": self.documents,
+            "pages": self.pages,
+            "aborted_empty": self.aborted_empty,
+            "rejected_too_large": self.rejected_too_large,
+            "pool_restarts": self.pool_restarts,
+            "crashed": self.crashed,
+            "avg_ms_per_page": round(self.parse_seconds / self.pages * 1000, 3) if self.pages else 0.0,
+            "pages_per_second": round(self.pages / self.parse_seconds, 1) if self.parse_seconds else 0.0
+        }
+
+    def shutdown(self):
+        """Stop worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global PDF extractor instance
+pdf_extractor = PDFExtractor()
@@ -0,0 +1,270 @@
+"""
+Per-host token-bucket rate limiting with Retry-After backoff
+"""
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def check_rate(rate: float, burst: int):
+    """Reject budgets a bucket cannot work with (a zero rate never refills)"""
+    if not rate > 0:
+        raise ValueError(f"Rate limit must be positive, got {rate}")
+    if burst < 1:
+        raise ValueError(f"Rate limit burst must be at least 1, got {burst}")
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens per second, at most ``burst`` stored.
+
+    Callers only wait when the bucket is empty or the host has asked us to
+    back off. Waiters are serialized by a lock so a burst of concurrent
+    requests is spread out at ``rate`` instead of hitting the host at once.
+    """
+
+    clock = staticmethod(time.monotonic)
+
+    def __init__(self, rate: float, burst: int):
+        check_rate(rate, burst)
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = self.clock()
+        self.blocked_until = 0.0
+        self.backoff = 0.0
+        self._lock = asyncio.Lock()
+
+        # Metrics
+        self.acquired = 0
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self.throttled = 0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _take(self, now: float) -> float:
+        """Take a token if one is available; otherwise return how long to wait for one"""
+        self._refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    async def _try_acquire(self) -> float:
+        return self._take(self.clock())
+
+    async def acquire(self):
+        """Take one token, sleeping only as long as needed to get it"""
+        async with self._lock:
+            start = time.monotonic()
+            while True:
+                delay = await self._try_acquire()
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+
+            waited = time.monotonic() - start
+            self.acquired += 1
+            if waited > 0.001:
+                self.waited += 1
+                self.wait_seconds += waited
+
+    def _penalize(self, now: float, retry_after: Optional[float], max_backoff: float):
+        self.throttled += 1
+        if retry_after is None:
+            self.backoff = min(max_backoff, self.backoff * 2 if self.backoff else 1.0 / self.rate)
+            retry_after = self.backoff
+        # A host asking for hours (or a bogus date) must not stall every search that long
+        retry_after = min(max_backoff, retry_after)
+        self.blocked_until = max(self.blocked_until, now + retry_after)
+        self.tokens = 0.0
+
+    def _reset_backoff(self, now: float):
+        self.backoff = 0.0
+
+    async def penalize(self, retry_after: Optional[float], max_backoff: float):
+        """Block the bucket after a 429/503, honouring Retry-After (up to ``max_backoff``) when given"""
+        self._penalize(self.clock(), retry_after, max_backoff)
+
+    async def reset_backoff(self):
+        self._reset_backoff(self.clock())
+
+
+class SharedTokenBucket(TokenBucket):
+    """Token bucket whose state is a row in a SQLite table shared by every worker process.
+
+    Each take is one ``BEGIN IMMEDIATE`` transaction, so all processes draw
+    from a single budget per host and a 429 seen by one worker blocks the
+    others too. Local waiters are still serialized by the asyncio lock, so a
+    process holds at most one pending database round trip per host.
+    """
+
+    # Shared buckets compare timestamps written by other processes, so they use wall-clock time
+    clock = staticmethod(time.time)
+
+    def __init__(self, rate: float, burst: int, host: str, limiter: "RateLimiter"):
+        super().__init__(rate, burst)
+        self.host = host
+        self.limiter = limiter
+
+    def _load(self, db: sqlite3.Connection):
+        row = db.execute(
+            "SELECT tokens, updated, blocked_until, backoff FROM rate_buckets WHERE host = ?", (self.host,)
+        ).fetchone()
+        if row is not None:
+            self.tokens, self.updated, self.blocked_until, self.backoff = row
+
+    def _save(self, db: sqlite3.Connection):
+        db.execute(
+            "INSERT OR REPLACE INTO rate_buckets (host, tokens, updated, blocked_until, backoff) VALUES (?, ?, ?, ?, ?)",
+            (self.host, self.tokens, self.updated, self.blocked_until, self.backoff)
+        )
+
+    def _update(self, change) -> float:
+        """Apply ``change(now)`` to the shared row in one transaction and return its result"""
+        with self.limiter.transaction() as db:
+            self._load(db)
+            result = change(self.clock())
+            self._save(db)
+        return result
+
+    async def _try_acquire(self) -> float:
+        try:
+            return await asyncio.to_thread(self._update, self._take)
+        except sqlite3.Error as e:
+            # Fall back to this process' copy of the bucket rather than failing the scrape
+            print(f"Shared rate limiter error: {e}")
+            return self._take(self.clock())
+
+    async def penalize(self, retry_after: Optional[float], max_backoff: float):
+        # The transaction may wait on other workers' locks, so it runs off the event loop
+        try:
+            await asyncio.to_thread(self._update, lambda now: self._penalize(now, retry_after, max_backoff))
+        except sqlite3.Error as e:
+            print(f"Shared rate limiter error: {e}")
+
+    async def reset_backoff(self):
+        # Only write when this process saw a backoff, so successful requests cost no extra transaction
+        if self.backoff:
+            try:
+                await asyncio.to_thread(self._update, self._reset_backoff)
+            except sqlite3.Error as e:
+                print(f"Shared rate limiter error: {e}")
+
+
+class RateLimiter:
+    """Registry of token buckets keyed by host.
+
+    With ``db_path`` (``SCRAPER_RATE_DB``) the buckets live in a SQLite file
+    in WAL mode, so every worker process of a multi-worker server shares one
+    budget per host; otherwise each process keeps its own buckets.
+    """
+
+    def __init__(self, rate: float = 1.0, burst: int = 3, max_backoff: float = 60.0, db_path: Optional[str] = None):
+        check_rate(rate, burst)
+        self.rate = rate
+        self.burst = burst
+        self.max_backoff = max_backoff
+        self.db_path = db_path if db_path is not None else os.getenv("SCRAPER_RATE_DB", "")
+        self._overrides: Dict[str, Tuple[float, int]] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _get_db(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS rate_buckets ("
+                "host TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, "
+                "blocked_until REAL NOT NULL, backoff REAL NOT NULL)"
+            )
+        return self._db
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Exclusive write transaction on the shared bucket table"""
+        with self._lock:
+            db = self._get_db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+
+    def configure(self, host: str, rate: float, burst: int):
+        """Set a host-specific rate and burst"""
+        check_rate(rate, burst)
+        self._overrides[host] = (rate, burst)
+        self._buckets.pop(host, None)
+
+    def bucket(self, host: str) -> TokenBucket:
+        if host not in self._buckets:
+            rate, burst = self._overrides.get(host, (self.rate, self.burst))
+            if self.db_path:
+                self._buckets[host] = SharedTokenBucket(rate, burst, host, self)
+            else:
+                self._buckets[host] = TokenBucket(rate, burst)
+        return self._buckets[host]
+
+    async def acquire(self, host: str):
+        """Wait until a request to ``host`` fits the budget"""
+        await self.bucket(host).acquire()
+
+    async def record_response(self, host: str, status: int, retry_after: Optional[str] = None):
+        """Feed a response status back so 429/503 trigger backoff"""
+        bucket = self.bucket(host)
+        if status in (429, 503):
+            await bucket.penalize(parse_retry_after(retry_after), self.max_backoff)
+        elif status < 400:
+            await bucket.reset_backoff()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-host limiter counters"""
+        return {
+            host: {
+                "rate": bucket.rate,
+                "burst": bucket.burst,
+                "tokens": round(bucket.tokens, 2),
+                "acquired": bucket.acquired,
+                "waited": bucket.waited,
+                "wait_seconds": round(bucket.wait_seconds, 3),
+                "throttled": bucket.throttled,
+                "blocked_for": round(max(0.0, bucket.blocked_until - bucket.clock()), 2),
+                "shared": isinstance(bucket, SharedTokenBucket)
+            }
+            for host, bucket in self._buckets.items()
+        }
+
+    def close(self):
+        """Close the SQLite connection if one was opened"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
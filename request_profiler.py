@@ -0,0 +1,350 @@
+"""
+Opt-in sampling profiler for individual requests, with per-endpoint folded-stack output
+"""
+import asyncio
+import contextvars
+import functools
+import inspect
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+import weakref
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+# Profile of the request being handled; copied into the tasks it spawns
+_current_profile: contextvars.ContextVar[Optional["RequestProfile"]] = contextvars.ContextVar(
+    "current_profile", default=None
+)
+
+_COROUTINE_FLAGS = inspect.CO_COROUTINE | inspect.CO_ITERABLE_COROUTINE | inspect.CO_ASYNC_GENERATOR
+
+
+def _frame_label(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_qualname}".replace(";", ":")
+
+
+def _task_stack(frame) -> List[str]:
+    """Frame labels of the running task, outermost coroutine first.
+
+    Sync frames called from the task are kept; the first non-coroutine frame
+    above its outermost coroutine is the event loop, where the stack is cut.
+    """
+    labels, in_coroutine = [], False
+    while frame is not None:
+        is_coroutine = bool(frame.f_code.co_flags & _COROUTINE_FLAGS)
+        if in_coroutine and not is_coroutine:
+            break
+        in_coroutine = in_coroutine or is_coroutine
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def _thread_stack(frame) -> List[str]:
+    """Frame labels of work submitted through ``RequestProfiler.wrap``, without the pool machinery"""
+    labels = []
+    while frame is not None and frame.f_code is not _run_profiled.__code__:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append("[thread]")
+    labels.reverse()
+    return labels
+
+
+def _run_profiled(thread_profiles: Dict[int, "RequestProfile"], profile: "RequestProfile", func: Callable[[], Any]):
+    ident = threading.get_ident()
+    thread_profiles[ident] = profile
+    try:
+        return func()
+    finally:
+        thread_profiles.pop(ident, None)
+
+
+def endpoint_slug(endpoint: str) -> str:
+    """File-name-safe form of "POST /match/{job_id}" -> "POST_match_job_id" """
+    return re.sub(r'[^A-Za-z0-9]+', '_', endpoint).strip('_') or "root"
+
+
+class RequestProfile:
+    """Samples collected for one request, keyed by folded stack"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.samples: Counter = Counter()
+        self.started = time.time()
+
+
+class RequestProfiler:
+    """Statistical profiler sampling only the requests chosen for profiling.
+
+    A background thread wakes every ``interval`` seconds while a profiled
+    request is in flight and records the Python stack of (a) the event loop
+    thread, when the task currently running belongs to a profiled request
+    (tasks spawned by the request inherit its profile through a task
+    factory), and (b) pool threads running work submitted with ``wrap()``.
+    Work done in process pools (PDF parsing, HTML parsing) cannot be
+    sampled from here; callers report its duration with
+    ``record_offloaded`` and it appears as a single synthetic frame.
+
+    Finished profiles are merged per endpoint into one-minute buckets kept
+    for ``retention`` seconds, and, if ``output_dir`` is set, appended to a
+    ``<endpoint>.folded`` file per endpoint (the collapsed-stack format
+    read by flamegraph.pl, speedscope and inferno).
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, sample_rate: Optional[float] = None,
+                 interval: Optional[float] = None, retention: Optional[float] = None,
+                 output_dir: Optional[str] = None, header: str = "x-profile", token: Optional[str] = None):
+        self.enabled = enabled if enabled is not None else os.getenv("PROFILING", "0").lower() in ("1", "true", "yes")
+        self.sample_rate = sample_rate if sample_rate is not None else float(os.getenv("PROFILE_SAMPLE_RATE", "0.01"))
+        self.interval = interval or float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000
+        self.retention = retention or float(os.getenv("PROFILE_RETENTION_MINUTES", "60")) * 60
+        self.output_dir = output_dir if output_dir is not None else os.getenv("PROFILE_DIR", "")
+        self.header = header.lower()
+        # The profiling header and the admin dump are only honoured with this token; both are off without one
+        self.token = token if token is not None else os.getenv("ADMIN_TOKEN", "")
+
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._task_profiles: "weakref.WeakKeyDictionary[asyncio.Task, RequestProfile]" = weakref.WeakKeyDictionary()
+        self._thread_profiles: Dict[int, RequestProfile] = {}
+        self._active = 0
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        # minute -> endpoint -> (requests, Counter of stacks)
+        self._buckets: Dict[int, Dict[str, List[Any]]] = {}
+
+        # Metrics
+        self.profiled_requests = 0
+        self.samples = 0
+        self.sample_seconds = 0.0
+
+    def start(self):
+        """Hook into the running event loop and start the sampler thread (called at application startup)"""
+        if not self.enabled or self._sampler is not None:
+            return
+        if not self.token:
+            print("⚠️  WARNING: PROFILING is on but ADMIN_TOKEN is not set: only random sampling runs; "
+                  f"the {self.header} header is ignored and /admin/profile is disabled")
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        previous_factory = self._loop.get_task_factory()
+
+        def task_factory(loop, coro, **kwargs):
+            task = previous_factory(loop, coro, **kwargs) if previous_factory else asyncio.Task(coro, loop=loop, **kwargs)
+            profile = _current_profile.get()
+            if profile is not None:
+                self._task_profiles[task] = profile
+            return task
+
+        self._loop.set_task_factory(task_factory)
+        self._stopped.clear()
+        self._sampler = threading.Thread(target=self._sample_forever, name="request-profiler", daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        """Stop the sampler thread"""
+        if self._sampler is None:
+            return
+        self._stopped.set()
+        self._wake.set()
+        self._sampler.join(timeout=1)
+        self._sampler = None
+
+    def authorized(self, token: Optional[str]) -> bool:
+        """Whether ``token`` matches the configured admin token (never true when none is configured)"""
+        return bool(self.token) and token is not None and hmac.compare_digest(token, self.token)
+
+    def should_profile(self, headers: Dict[str, str]) -> bool:
+        """Profile requests carrying the profiling header with the admin token, plus a random ``sample_rate`` share"""
+        if self.authorized(headers.get(self.header)):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def begin(self, path: str) -> contextvars.Token:
+        """Start profiling the current task; returns the token to pass to ``finish``"""
+        profile = RequestProfile(path)
+        task = asyncio.current_task()
+        if task is not None:
+            self._task_profiles[task] = profile
+        with self._lock:
+            self._active += 1
+            self._wake.set()
+        return _current_profile.set(profile)
+
+    def finish(self, token: contextvars.Token, endpoint: str) -> Optional[RequestProfile]:
+        """Stop profiling the current request and merge its samples under ``endpoint``"""
+        profile = _current_profile.get()
+        _current_profile.reset(token)
+        if profile is None:
+            return None
+        task = asyncio.current_task()
+        if task is not None:
+            self._task_profiles.pop(task, None)
+        minute = int(time.time() // 60)
+        with self._lock:
+            self._active -= 1
+            if not self._active:
+                self._wake.clear()
+            entry = self._buckets.setdefault(minute, {}).setdefault(endpoint, [0, Counter()])
+            entry[0] += 1
+            entry[1].update(profile.samples)
+            cutoff = minute - int(self.retention // 60)
+            for old in [bucket for bucket in self._buckets if bucket < cutoff]:
+                del self._buckets[old]
+            self.profiled_requests += 1
+        return profile
+
+    def write_folded(self, endpoint: str, profile: RequestProfile):
+        """Append a finished profile to ``<output_dir>/<endpoint>.folded``"""
+        if not self.output_dir or not profile.samples:
+            return
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = os.path.join(self.output_dir, f"{endpoint_slug(endpoint)}.folded")
+            with open(path, "a", encoding="utf-8") as handle:
+                handle.writelines(f"{stack} {count}\n" for stack, count in profile.samples.items())
+        except OSError as e:
+            print(f"Profile write error: {e}")
+
+    def wrap(self, func: Callable[[], Any]) -> Callable[[], Any]:
+        """Attribute samples of ``func``'s worker thread to the current request, if it is profiled"""
+        profile = _current_profile.get()
+        if profile is None:
+            return func
+        return functools.partial(_run_profiled, self._thread_profiles, profile, func)
+
+    def record_offloaded(self, label: str, seconds: float):
+        """Account work done in another process as samples of one synthetic frame"""
+        profile = _current_profile.get()
+        count = int(seconds / self.interval)
+        if profile is None or count <= 0:
+            return
+        with self._lock:
+            profile.samples[f"[process pool];{label}"] += count
+
+    def _sample_forever(self):
+        while not self._stopped.is_set():
+            if not self._wake.wait(timeout=1):
+                continue
+            start = time.perf_counter()
+            try:
+                self._sample_once()
+            except Exception as e:
+                print(f"Profiler sampling error: {e}")
+            self.sample_seconds += time.perf_counter() - start
+            time.sleep(self.interval)
+
+    def _sample_once(self):
+        frames = sys._current_frames()
+        taken = []
+        task = asyncio.tasks._current_tasks.get(self._loop)
+        profile = self._task_profiles.get(task) if task is not None else None
+        if profile is not None and self._loop_thread in frames:
+            taken.append((profile, _task_stack(frames[self._loop_thread])))
+        for ident, profile in list(self._thread_profiles.items()):
+            if ident in frames:
+                taken.append((profile, _thread_stack(frames[ident])))
+        if not taken:
+            return
+        with self._lock:
+            for profile, stack in taken:
+                if stack:
+                    profile.samples[";".join(stack)] += 1
+                    self.samples += 1
+
+    def aggregate(self, minutes: float, endpoint: Optional[str] = None) -> Dict[str, List[Any]]:
+        """Requests and merged stacks per endpoint over the last ``minutes``"""
+        since = int(time.time() // 60) - max(int(minutes), 1) + 1
+        merged: Dict[str, List[Any]] = {}
+        with self._lock:
+            for minute, endpoints in self._buckets.items():
+                if minute < since:
+                    continue
+                for name, (requests, stacks) in endpoints.items():
+                    if endpoint is not None and name != endpoint:
+                        continue
+                    entry = merged.setdefault(name, [0, Counter()])
+                    entry[0] += requests
+                    entry[1].update(stacks)
+        return merged
+
+    def folded(self, minutes: float, endpoint: Optional[str] = None) -> str:
+        """Collapsed stacks of the last ``minutes``, each rooted at its endpoint, hottest first"""
+        lines = []
+        for name, (_, stacks) in sorted(self.aggregate(minutes, endpoint).items()):
+            lines.extend((f"{name};{stack}", count) for stack, count in stacks.items())
+        lines.sort(key=lambda line: line[1], reverse=True)
+        return "".join(f"{stack} {count}\n" for stack, count in lines)
+
+    def summary(self, minutes: float, endpoint: Optional[str] = None, top: int = 20) -> Dict[str, Any]:
+        """Per endpoint: profiled requests, samples, and the frames with the most self and total samples"""
+        endpoints = {}
+        for name, (requests, stacks) in sorted(self.aggregate(minutes, endpoint).items()):
+            own, total = Counter(), Counter()
+            for stack, count in stacks.items():
+                frames = stack.split(";")
+                own[frames[-1]] += count
+                for frame in set(frames):
+                    total[frame] += count
+            samples = sum(stacks.values())
+            endpoints[name] = {
+                "requests": requests,
+                "samples": samples,
+                "approx_seconds": round(samples * self.interval, 3),
+                "top_self": [{"frame": frame, "samples": count} for frame, count in own.most_common(top)],
+                "top_total": [{"frame": frame, "samples": count} for frame, count in total.most_common(top)]
+            }
+        return {"window_minutes": minutes, "interval_ms": self.interval * 1000, "endpoints": endpoints}
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of profiler counters"""
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "interval_ms": round(self.interval * 1000, 2),
+            "active": self._active,
+            "profiled_requests": self.profiled_requests,
+            "samples": self.samples,
+            "sampler_overhead_ms": round(self.sample_seconds * 1000, 1),
+            "output_dir": self.output_dir or None
+        }
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling the requests chosen by ``RequestProfiler.should_profile``"""
+
+    def __init__(self, app, profiler: RequestProfiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.profiler.enabled:
+            await self.app(scope, receive, send)
+            return
+        headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]}
+        if not self.profiler.should_profile(headers):
+            await self.app(scope, receive, send)
+            return
+
+        token = self.profiler.begin(scope["path"])
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route = getattr(scope.get("route"), "path", None) or "other"
+            endpoint = f"{scope['method']} {route}"
+            profile = self.profiler.finish(token, endpoint)
+            if profile is not None and self.profiler.output_dir:
+                await asyncio.to_thread(self.profiler.write_folded, endpoint, profile)
+
+
+# Global request profiler instance
+request_profiler = RequestProfiler()
@@ -2,28 +2,31 @@
 """
 Main entry point for running the SkillMatchAPI server
 """
+import importlib.util
 import os
 import sys
+from pathlib import Path
 import uvicorn
 from dotenv import load_dotenv
+from server_config import apply_multiworker_defaults, worker_count
 
 # Load environment variables
 load_dotenv()
 
 def main():
-    """Run the FastAPI server with uvicorn"""
+    """Run the FastAPI server with uvicorn, or under gunicorn with several uvicorn workers"""
     
     # Get configuration from environment variables with defaults
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", os.getenv("WEBSITES_PORT", "8001")))  # Azure compatibility
     debug = os.getenv("DEBUG", "False").lower() == "true"
-    workers = int(os.getenv("WORKERS", "1"))
+    # WORKERS=auto starts one worker per available core; debug mode always runs one (for reload)
+    workers = 1 if debug else worker_count()
     
-    # Verify required environment variables
+    # Skill extraction needs the Gemini key; the server still starts (and answers /health) without it
     if not os.getenv("GEMINI_API_KEY"):
-        print("❌ Error: GEMINI_API_KEY environment variable is required!")
+        print("⚠️  Warning: GEMINI_API_KEY is not set, skill extraction requests will fail")
         print("Please set your Gemini API key in the .env file or environment")
-        sys.exit(1)
     
     print(f"🚀 Starting SkillMatchAPI server...")
     print(f"📍 Host: {host}")
@@ -31,9 +34,21 @@ def main():
     print(f"🐛 Debug mode: {debug}")
     print(f"👥 Workers: {workers}")
     print(f"🌐 Access URL: http://{host}:{port}")
+    print(f"❤️  Health: http://{host}:{port}/health (readiness: /ready)")
     print(f"📚 API Documentation: http://{host}:{port}/docs")
     print(f"🧪 Test Interface: http://{host}:{port}/test")
     
+    if workers > 1:
+        # Shared caches and scrape budget, smaller per-worker parsing pools
+        for name, value in apply_multiworker_defaults(workers).items():
+            print(f"⚙️  {name}={value}")
+        if importlib.util.find_spec("gunicorn"):
+            # gunicorn preloads the app before forking and recycles workers (see gunicorn.conf.py);
+            # exec so it receives the container's stop signal directly
+            config_file = str(Path(__file__).resolve().parent / "gunicorn.conf.py")
+            os.execvp(sys.executable, [sys.executable, "-m", "gunicorn", "main:app", "--config", config_file])
+        print("⚠️  gunicorn is not installed, starting uvicorn workers without preloading or recycling")
+    
     # Configuration for uvicorn
     config = {
         "app": "main:app",
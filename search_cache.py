@@ -0,0 +1,262 @@
+"""
+Job search result cache with stale-while-revalidate and single-flight fetches
+"""
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace so equivalent queries share a key"""
+    return _WHITESPACE_RE.sub(' ', query).strip().lower()
+
+
+class SearchCache:
+    """Short-lived cache for upstream scrape results.
+
+    Fresh entries (younger than ``ttl``) are served directly. Entries within
+    the following ``stale_ttl`` seconds are still served, but trigger one
+    background refresh. Concurrent misses for the same key share a single
+    upstream fetch instead of each scraping the boards.
+
+    With ``db_path`` (``SEARCH_CACHE_DB``) results are also kept in a SQLite
+    file in WAL mode shared by the worker processes of a multi-worker
+    server. A miss first looks there, and the process that fetches takes a
+    short lease on the key, so the same search arriving at other workers
+    waits for its result instead of scraping the boards again.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, stale_ttl: Optional[float] = None,
+                 max_entries: Optional[int] = None, db_path: Optional[str] = None):
+        self.ttl = ttl or float(os.getenv("SEARCH_CACHE_TTL", "300"))
+        self.stale_ttl = stale_ttl if stale_ttl is not None else float(os.getenv("SEARCH_CACHE_STALE", "900"))
+        self.max_entries = max_entries or int(os.getenv("SEARCH_CACHE_SIZE", "512"))
+        self.db_path = db_path if db_path is not None else os.getenv("SEARCH_CACHE_DB", "")
+        # How long other workers wait on a fetch before scraping themselves
+        self.lease_seconds = float(os.getenv("SEARCH_CACHE_LEASE", "15"))
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._writes_since_prune = 0
+
+        # Metrics
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.shared_hits = 0
+        self.shared_waits = 0
+
+    def _get_db(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS search_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS search_leases (key TEXT PRIMARY KEY, owner INTEGER NOT NULL, expires REAL NOT NULL)"
+            )
+        return self._db
+
+    def _peek_shared(self, name: str) -> Tuple[Optional[tuple], Optional[float]]:
+        """Shared (created, value) entry for ``name`` and the expiry of another process' lease on it"""
+        with self._lock:
+            db = self._get_db()
+            row = db.execute("SELECT created, value FROM search_cache WHERE key = ?", (name,)).fetchone()
+            lease = db.execute(
+                "SELECT expires FROM search_leases WHERE key = ? AND owner != ? AND expires > ?",
+                (name, os.getpid(), time.time())
+            ).fetchone()
+        entry = (row[0], json.loads(row[1])) if row is not None else None
+        return entry, lease[0] if lease is not None else None
+
+    def _claim_shared(self, name: str) -> Optional[float]:
+        """Take the fetch lease for ``name``; returns the holder's expiry if another process has it"""
+        now = time.time()
+        with self._lock:
+            db = self._get_db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute("SELECT owner, expires FROM search_leases WHERE key = ?", (name,)).fetchone()
+                if row is not None and row[0] != os.getpid() and row[1] > now:
+                    return row[1]
+                db.execute(
+                    "INSERT OR REPLACE INTO search_leases (key, owner, expires) VALUES (?, ?, ?)",
+                    (name, os.getpid(), now + self.lease_seconds)
+                )
+                return None
+            finally:
+                db.execute("COMMIT")
+
+    def _finish_shared(self, name: str, created: float, value: Any, cache: bool):
+        """Publish a fetched value (if cacheable) and release the lease"""
+        with self._lock:
+            db = self._get_db()
+            if cache:
+                db.execute(
+                    "INSERT OR REPLACE INTO search_cache (key, value, created) VALUES (?, ?, ?)",
+                    (name, json.dumps(value), created)
+                )
+                self._writes_since_prune += 1
+                if self._writes_since_prune >= 100:
+                    db.execute("DELETE FROM search_cache WHERE created < ?", (created - self.ttl - self.stale_ttl,))
+                    db.execute("DELETE FROM search_leases WHERE expires < ?", (created,))
+                    self._writes_since_prune = 0
+            db.execute("DELETE FROM search_leases WHERE key = ? AND owner = ?", (name, os.getpid()))
+
+    def _store(self, key: Hashable, value: Any, created: Optional[float] = None):
+        self._entries[key] = (created or time.time(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _fetch_shared(self, key: Hashable, fetch: Callable[[], Awaitable[Any]],
+                            should_cache: Callable[[Any], bool]) -> Any:
+        """Fetch under the shared lease, or wait for the process already fetching ``key``"""
+        name = json.dumps(key)
+        try:
+            while (expires := await asyncio.to_thread(self._claim_shared, name)) is not None:
+                self.shared_waits += 1
+                while time.time() < expires:
+                    await asyncio.sleep(0.1)
+                    entry, expires = await asyncio.to_thread(self._peek_shared, name)
+                    if entry is not None and time.time() - entry[0] < self.ttl:
+                        self._store(key, entry[1], entry[0])
+                        return entry[1]
+                    if expires is None:
+                        break
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"Shared search cache error: {e}")
+            return await fetch()
+
+        value, cache = None, False
+        try:
+            value = await fetch()
+            cache = should_cache(value)
+            return value
+        finally:
+            # Also releases the lease when the fetch fails, so waiting workers retry right away
+            try:
+                await asyncio.to_thread(self._finish_shared, name, time.time(), value, cache)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                print(f"Shared search cache error: {e}")
+
+    async def _run(self, key: Hashable, fetch: Callable[[], Awaitable[Any]],
+                   should_cache: Callable[[Any], bool]) -> Any:
+        try:
+            if self.db_path:
+                value = await self._fetch_shared(key, fetch, should_cache)
+            else:
+                value = await fetch()
+            if should_cache(value):
+                self._store(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def _start(self, key: Hashable, fetch: Callable[[], Awaitable[Any]],
+               should_cache: Callable[[Any], bool]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run(key, fetch, should_cache))
+            # Background refreshes may never be awaited; retrieve errors so they are not reported as lost
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        else:
+            self.coalesced += 1
+        return task
+
+    async def lookup(self, key: Hashable, fetch: Callable[[], Awaitable[Any]],
+                     should_cache: Callable[[Any], bool] = lambda value: True) -> Tuple[bool, Any]:
+        """Return (True, value) for a fresh or stale entry, or (False, None) on a miss.
+
+        A stale hit starts one background refresh with ``fetch``.
+        """
+        entry = self._entries.get(key)
+        if entry is None and self.db_path:
+            entry = await self._load_shared(key)
+        if entry is not None:
+            created, value = entry
+            age = time.time() - created
+            if age < self.ttl:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return True, value
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                if key not in self._inflight:
+                    self.refreshes += 1
+                    self._start(key, fetch, should_cache)
+                return True, value
+            del self._entries[key]
+        return False, None
+
+    def start_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]],
+                    should_cache: Callable[[Any], bool] = lambda value: True) -> asyncio.Task:
+        """Count a miss and return the fetch task for ``key``, joining one already in flight.
+
+        For callers that consume the fetch's progress themselves; await the
+        task through ``asyncio.shield`` so giving up does not cancel it.
+        """
+        self.misses += 1
+        return self._start(key, fetch, should_cache)
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]],
+                           should_cache: Callable[[Any], bool] = lambda value: True) -> Any:
+        """Return the cached value for ``key`` or run ``fetch`` once for all waiters"""
+        found, value = await self.lookup(key, fetch, should_cache)
+        if found:
+            return value
+        # Shield so a caller hitting its own deadline does not cancel the shared fetch
+        return await asyncio.shield(self.start_fetch(key, fetch, should_cache))
+
+    async def _load_shared(self, key: Hashable) -> Optional[tuple]:
+        """Copy a result another worker stored for ``key`` into this process' cache"""
+        try:
+            entry, _ = await asyncio.to_thread(self._peek_shared, json.dumps(key))
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"Shared search cache error: {e}")
+            return None
+        if entry is None or time.time() - entry[0] >= self.ttl + self.stale_ttl:
+            return None
+        self.shared_hits += 1
+        self._store(key, entry[1], entry[0])
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of cache counters"""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "ttl_seconds": self.ttl,
+            "stale_seconds": self.stale_ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+            "in_flight": len(self._inflight),
+            "shared": bool(self.db_path),
+            "shared_hits": self.shared_hits,
+            "shared_waits": self.shared_waits,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0
+        }
+
+    def close(self):
+        """Close the SQLite connection if one was opened"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,64 @@
+"""
+Process-count policy and shared-state defaults for the multi-worker server
+"""
+import math
+import os
+from typing import Dict, Optional
+
+# SQLite files (WAL mode) through which worker processes share caches and the scrape budget
+SHARED_STATE_DEFAULTS = {
+    "SKILL_CACHE_DB": "skill_cache.db",
+    "SEARCH_CACHE_DB": "search_cache.db",
+    "SCRAPER_RATE_DB": "scraper_rate.db",
+}
+
+
+def available_cores() -> int:
+    """CPU cores this process may use, honouring the affinity mask and a cgroup v2 (container) CPU quota"""
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cores = min(cores, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(1, cores)
+
+
+def worker_count(setting: Optional[str] = None) -> int:
+    """Number of server processes from ``WORKERS``: a number, or "auto" for one per available core.
+
+    Each worker is an event loop that mostly waits on Gemini and the job
+    boards, and hands PDF and HTML parsing to its own process pools, so one
+    worker per core keeps every core busy; more only adds memory and
+    context switches. "auto" is capped by ``WORKERS_MAX``.
+    """
+    setting = (setting or os.getenv("WORKERS", "1")).strip().lower()
+    if setting == "auto":
+        return min(available_cores(), int(os.getenv("WORKERS_MAX", "8")))
+    return max(1, int(setting))
+
+
+def apply_multiworker_defaults(workers: int) -> Dict[str, str]:
+    """Set environment defaults for a server running ``workers`` processes and return the ones applied.
+
+    Must run before the app is imported, since components read their
+    settings when they are created. Variables already set are kept. Caches
+    and rate-limiter state move to shared SQLite files, and the per-worker
+    PDF and HTML parsing pools are sized so all workers together use about
+    one parsing process per core.
+    """
+    if workers <= 1:
+        return {}
+    defaults = dict(SHARED_STATE_DEFAULTS)
+    defaults["PDF_WORKERS"] = str(max(1, available_cores() // workers))
+    defaults["SCRAPER_PARSE_WORKERS"] = "1"
+    applied = {}
+    for name, value in defaults.items():
+        if name not in os.environ:
+            os.environ[name] = applied[name] = value
+    return applied
@@ -0,0 +1,197 @@
+"""
+Micro-batching of skill extraction requests into multi-document Gemini prompts
+"""
+import asyncio
+import json
+import os
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+_CODE_FENCE_RE = re.compile(r'^```(?:json)?\s*|\s*```$')
+
+BATCH_PROMPT_HEADER = """
+Below are {count} documents, each a resume or a job description, wrapped in
+<document id="..."> tags. For EACH document extract:
+- Key skills (as a list of strings)
+- Suggested job roles (as a list of strings)
+- Summary of capabilities (as a string)
+
+Return ONLY a valid JSON object of the form
+{{"documents": [{{"id": "<document id>", "skills": [...], "roles": [...], "summary": "..."}}]}}
+with exactly one entry per document id.
+Do not include any markdown formatting or additional text.
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (about four characters per token for English text)"""
+    return len(text) // 4 + 1
+
+
+def parse_json_response(response_text: str) -> Any:
+    """Parse a model response as JSON, tolerating a surrounding markdown code fence"""
+    return json.loads(_CODE_FENCE_RE.sub('', response_text.strip()))
+
+
+def build_batch_prompt(documents: List[str]) -> str:
+    """One prompt carrying several documents, each tagged with its ID (d0, d1, ...)"""
+    parts = [BATCH_PROMPT_HEADER.format(count=len(documents))]
+    for index, text in enumerate(documents):
+        parts.append(f'<document id="d{index}">\n{text}\n</document>')
+    return "\n".join(parts)
+
+
+def split_batch_response(response_text: str, count: int) -> Dict[int, Dict]:
+    """Map document index to its extraction; malformed or unknown entries are dropped"""
+    try:
+        payload = parse_json_response(response_text)
+    except (json.JSONDecodeError, ValueError):
+        return {}
+    entries = payload.get("documents", []) if isinstance(payload, dict) else payload
+    results = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict) or not isinstance(entry.get("skills"), list):
+            continue
+        doc_id = str(entry.get("id", ""))
+        if doc_id.startswith("d") and doc_id[1:].isdigit() and int(doc_id[1:]) < count:
+            results[int(doc_id[1:])] = {
+                "skills": entry["skills"],
+                "roles": entry.get("roles", []),
+                "summary": entry.get("summary", "")
+            }
+    return results
+
+
+class SkillBatcher:
+    """Gather concurrent extraction requests and send them as one prompt.
+
+    Requests arriving within ``window`` seconds of each other are packed
+    into a single multi-document prompt, up to ``max_docs`` documents and
+    ``token_budget`` estimated tokens; a full batch is sent immediately.
+    The JSON answer is split back to each waiting caller by document ID.
+    Documents missing from the answer, or from a batch that failed
+    altogether, are retried one by one with ``extract_one``; a batch that
+    timed out is not, so a hung upstream costs one timeout rather than two.
+    """
+
+    def __init__(self, generate: Callable[[str], Awaitable[str]], extract_one: Callable[[str], Awaitable[Dict]],
+                 window: Optional[float] = None, max_docs: Optional[int] = None, token_budget: Optional[int] = None):
+        self.generate = generate
+        self.extract_one = extract_one
+        self.window = window if window is not None else float(os.getenv("LLM_BATCH_WINDOW_MS", "10")) / 1000
+        self.max_docs = max_docs or int(os.getenv("LLM_BATCH_MAX_DOCS", "8"))
+        self.token_budget = token_budget or int(os.getenv("LLM_BATCH_TOKEN_BUDGET", "24000"))
+
+        # Pending documents; identical texts share one slot and all their waiters
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._pending_tokens = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Strong references to in-flight sends; the event loop only keeps weak ones
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Metrics
+        self.batches = 0
+        self.batched_docs = 0
+        self.single_calls = 0
+        self.retried_docs = 0
+        self.failed_batches = 0
+        self.timed_out_batches = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_docs > 1
+
+    async def extract(self, text: str) -> Dict:
+        """Extract skills for one document, sharing an upstream call with concurrent requests"""
+        if not self.enabled:
+            self.single_calls += 1
+            return await self.extract_one(text)
+
+        tokens = estimate_tokens(text)
+        if text not in self._pending and self._pending and self._pending_tokens + tokens > self.token_budget:
+            self._flush()
+
+        future = asyncio.get_running_loop().create_future()
+        if text in self._pending:
+            self._pending[text].append(future)
+        else:
+            self._pending[text] = [future]
+            self._pending_tokens += tokens
+
+        if len(self._pending) >= self.max_docs or self._pending_tokens >= self.token_budget:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending, self._pending_tokens = self._pending, {}, 0
+        task = asyncio.ensure_future(self._send(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: Dict[str, List[asyncio.Future]]):
+        documents = list(batch.keys())
+        results: Dict[int, Dict] = {}
+        if len(documents) > 1:
+            self.batches += 1
+            self.batched_docs += len(documents)
+            try:
+                results = split_batch_response(await self.generate(build_batch_prompt(documents)), len(documents))
+            except asyncio.TimeoutError as e:
+                # The upstream is hung; single retries would each wait out another full timeout
+                self.failed_batches += 1
+                self.timed_out_batches += 1
+                for waiters in batch.values():
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_exception(e)
+                return
+            except Exception as e:
+                self.failed_batches += 1
+                print(f"Batched extraction error, retrying {len(documents)} documents singly: {e}")
+
+        async def finish(index: int, text: str):
+            waiters = batch[text]
+            try:
+                if index in results:
+                    value = results[index]
+                else:
+                    if len(documents) > 1:
+                        self.retried_docs += 1
+                    else:
+                        self.single_calls += 1
+                    value = await self.extract_one(text)
+            except Exception as e:
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(e)
+                return
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(value)
+
+        await asyncio.gather(*(finish(index, text) for index, text in enumerate(documents)))
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of batching counters"""
+        return {
+            "enabled": self.enabled,
+            "window_ms": round(self.window * 1000, 1),
+            "max_docs": self.max_docs,
+            "token_budget": self.token_budget,
+            "pending": len(self._pending),
+            "batches": self.batches,
+            "batched_docs": self.batched_docs,
+            "avg_batch_size": round(self.batched_docs / self.batches, 2) if self.batches else 0.0,
+            "single_calls": self.single_calls,
+            "retried_docs": self.retried_docs,
+            "failed_batches": self.failed_batches,
+            "timed_out_batches": self.timed_out_batches,
+            "calls_saved": self.batched_docs - self.batches
+        }
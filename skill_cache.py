@@ -0,0 +1,173 @@
+"""
+Content-addressed cache for skill extraction results
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so layout-only differences map to the same key"""
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+class SkillCache:
+    """Two-tier cache: in-process LRU with TTL, plus an optional SQLite tier.
+
+    Keys are SHA-256 digests of the normalized document text combined with a
+    prompt/model version string, so editing the prompt or switching models
+    invalidates old entries automatically. The SQLite tier runs in WAL mode
+    so several uvicorn workers can share it and it survives restarts; its
+    queries run in a worker thread, so only the LRU is touched on the event
+    loop.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None, db_path: Optional[str] = None):
+        self.max_entries = max_entries or int(os.getenv("SKILL_CACHE_SIZE", "1024"))
+        self.ttl = ttl or float(os.getenv("SKILL_CACHE_TTL", "86400"))
+        self.db_path = db_path if db_path is not None else os.getenv("SKILL_CACHE_DB", "")
+
+        self._memory: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Separate lock for the connection so a slow disk query never blocks LRU lookups
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._sets_since_prune = 0
+
+        # Metrics
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(text: str, version: str) -> str:
+        """Build the cache key for a document and prompt/model version"""
+        digest = hashlib.sha256()
+        digest.update(version.encode('utf-8'))
+        digest.update(b'\x00')
+        digest.update(normalize_text(text).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _get_db(self) -> Optional[sqlite3.Connection]:
+        if not self.db_path:
+            return None
+        if self._db is None:
+            self._db = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS skill_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._db.commit()
+        return self._db
+
+    def _remember(self, key: str, created: float, value: Dict):
+        self._memory[key] = (created, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _get_memory(self, key: str, now: float) -> Optional[Dict]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            created, value = entry
+            if now - created < self.ttl:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return value
+            del self._memory[key]
+            return None
+
+    def _load_disk(self, key: str, now: float) -> Optional[Dict]:
+        """Read one entry from the SQLite tier (runs in a worker thread)"""
+        with self._db_lock:
+            try:
+                row = self._get_db().execute(
+                    "SELECT value, created FROM skill_cache WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"Skill cache read error: {e}")
+                row = None
+        if row is None or now - row[1] >= self.ttl:
+            return None
+        value = json.loads(row[0])
+        with self._lock:
+            self._remember(key, row[1], value)
+            self.disk_hits += 1
+        return value
+
+    def _store_disk(self, key: str, value: Dict, now: float):
+        """Write one entry to the SQLite tier (runs in a worker thread)"""
+        with self._db_lock:
+            db = self._get_db()
+            try:
+                db.execute(
+                    "INSERT OR REPLACE INTO skill_cache (key, value, created) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), now)
+                )
+                self._sets_since_prune += 1
+                if self._sets_since_prune >= 100:
+                    db.execute("DELETE FROM skill_cache WHERE created < ?", (now - self.ttl,))
+                    self._sets_since_prune = 0
+                db.commit()
+            except sqlite3.Error as e:
+                print(f"Skill cache write error: {e}")
+
+    async def get(self, key: str) -> Optional[Dict]:
+        """Return the cached extraction for ``key`` or None"""
+        now = time.time()
+        value = self._get_memory(key, now)
+        if value is None and self.db_path:
+            value = await asyncio.to_thread(self._load_disk, key, now)
+        if value is None:
+            with self._lock:
+                self.misses += 1
+        return value
+
+    async def set(self, key: str, value: Dict):
+        """Store an extraction result in every enabled tier"""
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, value)
+        if self.db_path:
+            await asyncio.to_thread(self._store_disk, key, value, now)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of cache counters"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "disk_enabled": bool(self.db_path),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0
+        }
+
+    def close(self):
+        """Close the SQLite connection if one was opened"""
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+# Global skill cache instance
+skill_cache = SkillCache()
@@ -0,0 +1,202 @@
+"""
+Vectorized fuzzy skill matching with character n-gram TF-IDF
+"""
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from skill_taxonomy import SkillTaxonomy, normalize_skill, skill_taxonomy
+
+_CAMEL_CASE_RE = re.compile(r'(?<=[a-z])(?=[A-Z])')
+
+
+@lru_cache(maxsize=4096)
+def skill_ngrams(skill: str, ngram: int = 3) -> Tuple[str, ...]:
+    """Character n-grams of each word, padded so word boundaries count"""
+    features = []
+    for word in normalize_skill(skill).split():
+        padded = f" {word} "
+        if len(padded) <= ngram:
+            features.append(padded)
+        else:
+            features.extend(padded[i:i + ngram] for i in range(len(padded) - ngram + 1))
+    return tuple(features)
+
+
+@lru_cache(maxsize=4096)
+def skill_acronyms(skill: str) -> Tuple[Optional[str], Optional[str]]:
+    """Return (short_form, expanded_acronym) for acronym matching.
+
+    "ML" has short form "ml"; "Machine Learning" and "JavaScript" (split on
+    camel case) expand to "ml" and "js". Camel-case parts that are already
+    upper case ("PostgreSQL", "FastAPI") or shorter than three letters
+    ("MySQL") are not expanded, to avoid spurious acronyms.
+    """
+    words = normalize_skill(skill).split()
+    short_form = words[0] if len(words) == 1 and len(words[0]) <= 5 else None
+    if len(words) > 1:
+        return short_form, "".join(word[0] for word in words)
+    parts = _CAMEL_CASE_RE.sub(' ', skill).split()
+    if len(parts) > 1 and all(len(part) >= 3 and not part.isupper() for part in parts):
+        return short_form, "".join(part[0].lower() for part in parts)
+    return short_form, None
+
+
+@lru_cache(maxsize=8192)
+def word_similarity(left: str, right: str) -> float:
+    """Cosine similarity of the character n-grams of two single words"""
+    if left == right:
+        return 1.0
+    left_grams, right_grams = skill_ngrams(left), skill_ngrams(right)
+    shared = sum(min(left_grams.count(gram), right_grams.count(gram)) for gram in set(left_grams))
+    return shared / (len(left_grams) * len(right_grams)) ** 0.5 if left_grams and right_grams else 0.0
+
+
+@lru_cache(maxsize=8192)
+def word_alignment(left: str, right: str, word_threshold: float = 0.5) -> float:
+    """Score two skills word for word: the mean similarity of their paired words, or 0.
+
+    Whole-string n-gram similarity rewards a long shared word, so "Project
+    Management" looks like "Product Management" and "Java" like "Java EE".
+    Here every word must pair up with a word of the other skill at least
+    ``word_threshold`` similar, and neither skill may have extra words
+    ("Communication" is not "Stakeholder Communication"). Spellings that
+    only differ in spacing ("Node JS" / "NodeJS") score 1.
+    """
+    left_words, right_words = normalize_skill(left).split(), normalize_skill(right).split()
+    if "".join(left_words) == "".join(right_words):
+        return 1.0
+    if not left_words or len(left_words) != len(right_words):
+        return 0.0
+    remaining = list(right_words)
+    total = 0.0
+    for word in left_words:
+        best = max(remaining, key=lambda other: word_similarity(word, other))
+        score = word_similarity(word, best)
+        if score < word_threshold:
+            return 0.0
+        total += score
+        remaining.remove(best)
+    return total / len(left_words)
+
+
+class SkillMatcher:
+    """Match resume skills to job skills by cosine similarity of TF-IDF vectors.
+
+    Both skill lists are embedded into one shared n-gram vocabulary and the
+    full resume x job similarity matrix is computed with a single matrix
+    product. Acronyms ("JS" / "JavaScript", "ML" / "Machine Learning") share
+    no n-grams, so they are scored by a second one-hot product and the higher
+    of the two scores wins. The TF-IDF product only preselects candidates
+    (above ``candidate_floor``); each candidate is then rescored word for
+    word (``word_alignment``), so skills sharing one long word ("Linux
+    Administration" / "Windows Administration") do not match. No model
+    download or network access is needed.
+
+    Skills known to the taxonomy are first matched exactly on canonical ID;
+    only the remaining job skills go through the fuzzy comparison.
+    """
+
+    def __init__(self, threshold: Optional[float] = None, acronym_score: float = 0.9,
+                 taxonomy: Optional[SkillTaxonomy] = None, candidate_floor: float = 0.3):
+        self.threshold = threshold if threshold is not None else float(os.getenv("SKILL_MATCH_THRESHOLD", "0.6"))
+        self.acronym_score = acronym_score
+        self.candidate_floor = candidate_floor
+        self.taxonomy = taxonomy or skill_taxonomy
+
+    def _vectorize(self, skills: List[str]) -> np.ndarray:
+        vocab: Dict[str, int] = {}
+        rows = []
+        for skill in skills:
+            counts: Dict[int, int] = {}
+            for feature in skill_ngrams(skill):
+                index = vocab.setdefault(feature, len(vocab))
+                counts[index] = counts.get(index, 0) + 1
+            rows.append(counts)
+
+        matrix = np.zeros((len(skills), max(len(vocab), 1)), dtype=np.float32)
+        for row, counts in enumerate(rows):
+            if counts:
+                matrix[row, list(counts.keys())] = list(counts.values())
+
+        # Smoothed IDF over the combined skill lists, then L2-normalize rows
+        df = np.count_nonzero(matrix, axis=0)
+        idf = np.log((1 + len(skills)) / (1 + df)) + 1
+        matrix *= idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return matrix / norms
+
+    @staticmethod
+    def _acronym_matrices(skills: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        vocab: Dict[str, int] = {}
+        forms = [skill_acronyms(skill) for skill in skills]
+        for short_form, expanded in forms:
+            for key in (short_form, expanded):
+                if key:
+                    vocab.setdefault(key, len(vocab))
+        short = np.zeros((len(skills), max(len(vocab), 1)), dtype=np.float32)
+        expanded = np.zeros_like(short)
+        for row, (short_form, expanded_form) in enumerate(forms):
+            if short_form:
+                short[row, vocab[short_form]] = 1
+            if expanded_form:
+                expanded[row, vocab[expanded_form]] = 1
+        return short, expanded
+
+    def similarity(self, resume_skills: List[str], job_skills: List[str]) -> np.ndarray:
+        """Return the len(resume_skills) x len(job_skills) similarity matrix"""
+        n = len(resume_skills)
+        skills = resume_skills + job_skills
+        vectors = self._vectorize(skills)
+        candidates = vectors[:n] @ vectors[n:].T
+        sims = np.zeros_like(candidates)
+        for row, column in np.argwhere(candidates >= self.candidate_floor):
+            sims[row, column] = word_alignment(resume_skills[row], job_skills[column])
+
+        short, expanded = self._acronym_matrices(skills)
+        if expanded.any():
+            acronym_hits = short[:n] @ expanded[n:].T + expanded[:n] @ short[n:].T
+            sims = np.maximum(sims, np.minimum(acronym_hits, 1) * self.acronym_score)
+        return sims
+
+    def match(self, resume_skills: List[str], job_skills: List[str]) -> List[Dict]:
+        """Pair each job skill with its most similar resume skill above the threshold"""
+        if not resume_skills or not job_skills:
+            return []
+
+        # Exact matches on canonical taxonomy IDs
+        resume_by_id: Dict[int, str] = {}
+        for skill, skill_id in zip(resume_skills, self.taxonomy.resolve_many(resume_skills)):
+            if skill_id is not None:
+                resume_by_id.setdefault(skill_id, skill)
+
+        matches: Dict[int, Dict] = {}
+        remaining = []
+        for index, (skill, skill_id) in enumerate(zip(job_skills, self.taxonomy.resolve_many(job_skills))):
+            if skill_id is not None and skill_id in resume_by_id:
+                matches[index] = {"resume_skill": resume_by_id[skill_id], "job_skill": skill, "score": 1.0}
+            else:
+                remaining.append(index)
+
+        # Fuzzy matches for everything else
+        if remaining:
+            fuzzy_skills = [job_skills[index] for index in remaining]
+            sims = self.similarity(resume_skills, fuzzy_skills)
+            best = sims.argmax(axis=0)
+            best_scores = sims[best, np.arange(len(fuzzy_skills))]
+            for j in np.flatnonzero(best_scores >= self.threshold):
+                matches[remaining[j]] = {
+                    "resume_skill": resume_skills[best[j]],
+                    "job_skill": fuzzy_skills[j],
+                    "score": round(float(best_scores[j]), 3)
+                }
+
+        return [matches[index] for index in sorted(matches)]
+
+
+# Global skill matcher instance
+skill_matcher = SkillMatcher()
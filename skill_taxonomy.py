@@ -0,0 +1,114 @@
+"""
+Canonical skill taxonomy with a precompiled alias index
+"""
+import json
+import os
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+_NON_SKILL_CHARS_RE = re.compile(r'[^a-z0-9+#]+')
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "skill_taxonomy.json")
+
+
+def normalize_skill(skill: str) -> str:
+    """Lowercase and turn punctuation into single spaces, keeping + and # (C++, C#)"""
+    return _NON_SKILL_CHARS_RE.sub(' ', skill.lower()).strip()
+
+
+class SkillTaxonomy:
+    """Canonical skills, their aliases and (hierarchical) categories.
+
+    Every canonical name and alias is normalized once at load time into a
+    single dict, so resolving a raw string costs one O(length) normalization
+    plus one hash lookup. Canonical skills are identified by small integer
+    IDs, which callers use for matching, tagging and dedup.
+    """
+
+    def __init__(self, data: Dict):
+        self.version: str = data.get("version", "unknown")
+        self.names: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._skill_categories: List[FrozenSet[str]] = []
+        self._aliases: List[List[str]] = []
+
+        parents = {category["id"]: category.get("parent") for category in data.get("categories", [])}
+
+        for skill in data.get("skills", []):
+            skill_id = len(self.names)
+            self.names.append(skill["name"])
+            terms = [normalize_skill(skill["name"])] + [normalize_skill(alias) for alias in skill.get("aliases", [])]
+            terms = [term for term in dict.fromkeys(terms) if term]
+            self._aliases.append(terms)
+            for term in terms:
+                # First definition wins so an alias never hijacks another canonical name
+                self._index.setdefault(term, skill_id)
+
+            # Expand each category to include its ancestors once, at load time
+            expanded = set()
+            for category in skill.get("categories", []):
+                while category and category not in expanded:
+                    expanded.add(category)
+                    category = parents.get(category)
+            self._skill_categories.append(frozenset(expanded))
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "SkillTaxonomy":
+        """Load a taxonomy data file (SKILL_TAXONOMY_PATH or the bundled default)"""
+        path = path or os.getenv("SKILL_TAXONOMY_PATH", DEFAULT_TAXONOMY_PATH)
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def resolve(self, raw: str) -> Optional[int]:
+        """Return the canonical skill ID for a raw skill string, or None if unknown"""
+        return self._index.get(normalize_skill(raw))
+
+    def resolve_many(self, raws: Iterable[str]) -> List[Optional[int]]:
+        """Resolve a list of raw skill strings"""
+        return [self.resolve(raw) for raw in raws]
+
+    def canonical_name(self, skill_id: int) -> str:
+        return self.names[skill_id]
+
+    def aliases(self, skill_id: int) -> List[str]:
+        """Normalized canonical name followed by normalized aliases"""
+        return self._aliases[skill_id]
+
+    def text_aliases(self, skill_id: int) -> List[str]:
+        """Aliases to look for in free text: single-letter names ("C", "R") are left out.
+
+        In running text a lone letter is mostly an initial or a fragment
+        ("R&D" normalizes to "r d"), so those skills are only found through
+        their longer aliases ("r programming", "c language").
+        """
+        return [alias for alias in self._aliases[skill_id] if len(alias) > 1]
+
+    def categories(self, skill_id: int) -> FrozenSet[str]:
+        """Categories of a skill, including ancestor categories"""
+        return self._skill_categories[skill_id]
+
+    def in_category(self, raw: str, category: str) -> bool:
+        """True if a raw skill string resolves to a skill in ``category`` (or a subcategory)"""
+        skill_id = self.resolve(raw)
+        return skill_id is not None and category in self._skill_categories[skill_id]
+
+    def dedupe(self, raws: Iterable[str]) -> List[str]:
+        """Strip raw skills and drop blanks and alias duplicates, keeping the first spelling"""
+        seen = set()
+        result = []
+        for raw in raws:
+            raw = raw.strip()
+            skill_id = self.resolve(raw)
+            key = skill_id if skill_id is not None else normalize_skill(raw)
+            if not raw or key in seen:
+                continue
+            seen.add(key)
+            result.append(raw)
+        return result
+
+
+# Global skill taxonomy instance, loaded once per process
+skill_taxonomy = SkillTaxonomy.load()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for the readiness, admin and queueing endpoints (no Gemini key or network needed)
+"""
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import main
+from match_queue import QueueFullError
+from request_profiler import request_profiler
+from warmup import WarmUp
+
+# Not used as a context manager, so startup (warm-up, match workers) does not run
+client = TestClient(main.app)
+
+
+def test_ready_is_503_until_warm_up_finishes(monkeypatch):
+    warm_up = WarmUp()
+    monkeypatch.setattr(main, "warm_up", warm_up)
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "warming"
+
+    async def noop():
+        pass
+
+    async def finish():
+        warm_up.start([{"noop": noop}])
+        while not warm_up.finished:
+            await asyncio.sleep(0)
+
+    asyncio.run(finish())
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+
+def test_profile_dump_requires_admin_token(monkeypatch):
+    monkeypatch.setattr(request_profiler, "enabled", True)
+    monkeypatch.setattr(request_profiler, "token", "")
+    response = client.get("/admin/profile")
+    assert response.status_code == 403
+    assert "ADMIN_TOKEN" in response.json()["detail"]
+
+    monkeypatch.setattr(request_profiler, "token", "s3cret")
+    assert client.get("/admin/profile").status_code == 403
+    assert client.get("/admin/profile", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    assert client.get("/admin/profile", headers={"X-Admin-Token": "s3cret"}).status_code == 200
+
+
+def test_full_match_queue_answers_429_with_retry_after(monkeypatch):
+    def full():
+        raise QueueFullError(7)
+
+    monkeypatch.setattr(main, "require_gemini", lambda: None)
+    monkeypatch.setattr(main.match_queue, "check_capacity", full)
+    files = {
+        "resume": ("resume.pdf", b"%PDF-1.4", "application/pdf"),
+        "job_desc": ("job.pdf", b"%PDF-1.4", "application/pdf"),
+    }
+    response = client.post("/match/async", files=files)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "7"
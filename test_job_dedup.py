@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for near-duplicate job detection
+"""
+from job_dedup import NearDuplicateDetector, title_blockers
+
+
+def make_job(title, company, link="#", source="Indeed", snippet="", salary="Not specified"):
+    return {"title": title, "company": company, "link": link, "source": source,
+            "snippet": snippet, "salary": salary, "posted_date": "Recently"}
+
+
+def titles(jobs):
+    return sorted((job["title"], job["company"]) for job in jobs)
+
+
+def test_same_posting_on_two_boards_is_merged():
+    detector = NearDuplicateDetector()
+    jobs = [
+        make_job("Senior Python Developer", "Acme, Inc.", "https://www.indeed.com/rc/clk?jk=1"),
+        make_job("Senior Python Developer", "Acme", "https://www.glassdoor.com/job-listing/acme-2",
+                 source="Glassdoor", salary="$150K"),
+    ]
+    kept = detector.deduplicate(jobs)
+    assert len(kept) == 1
+    # The richer Glassdoor copy (salary, direct link) wins
+    assert kept[0]["source"] == "Glassdoor"
+
+
+def test_different_roles_at_the_same_company_are_kept():
+    detector = NearDuplicateDetector()
+    jobs = [
+        make_job("Backend Engineer", "Stripe"),
+        make_job("Frontend Engineer", "Stripe"),
+        make_job("Software Engineer", "Acme"),
+        make_job("Senior Software Engineer", "Acme"),
+        make_job("Software Engineer II", "Google"),
+        make_job("Software Engineer III", "Google"),
+        make_job("Data Engineer", "Meta"),
+        make_job("Data Scientist", "Meta"),
+    ]
+    assert len(detector.deduplicate(jobs)) == len(jobs)
+
+
+def test_unknown_company_with_different_direct_links_is_kept():
+    detector = NearDuplicateDetector()
+    jobs = [
+        make_job("Data Engineer", "Unknown Company", "https://www.glassdoor.com/job-listing/a-1", "Glassdoor"),
+        make_job("Data Engineer", "Unknown Company", "https://www.glassdoor.com/job-listing/b-2", "Glassdoor"),
+    ]
+    assert len(detector.deduplicate(jobs)) == 2
+
+
+def test_unknown_company_does_not_bridge_two_companies():
+    detector = NearDuplicateDetector()
+    jobs = [
+        make_job("Data Engineer", "Acme"),
+        make_job("Data Engineer", "Unknown Company"),
+        make_job("Data Engineer", "Globex"),
+    ]
+    assert titles(detector.deduplicate(jobs)) == [("Data Engineer", "Acme"), ("Data Engineer", "Globex")]
+
+
+def test_conflicting_snippets_are_kept_apart():
+    detector = NearDuplicateDetector()
+    jobs = [
+        make_job("Python Developer", "Acme", snippet="Build payment APIs with Django and PostgreSQL"),
+        make_job("Python Developer", "Acme", snippet="Maintain data pipelines on Airflow and Spark clusters"),
+    ]
+    assert len(detector.deduplicate(jobs)) == 2
+
+
+def test_title_blockers_normalize_aliases():
+    assert title_blockers("Sr. Back-End Engineer 2") == title_blockers("Senior Backend Engineer II")
+    assert title_blockers("Software Engineer") != title_blockers("Senior Software Engineer")
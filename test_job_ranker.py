@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Tests for job listing relevance ranking
+"""
+from job_ranker import JobRanker, parse_posted_age
+
+
+def make_job(title, snippet="", posted_date="Recently"):
+    return {"title": title, "company": "Acme", "snippet": snippet, "posted_date": posted_date}
+
+
+def test_more_and_rarer_keyword_hits_rank_first():
+    ranker = JobRanker(recency_weight=0.0)
+    jobs = [
+        make_job("Office Manager", "Schedules meetings"),
+        make_job("Backend Developer", "Python services"),
+        make_job("Python Developer", "Python, Django and Kafka"),
+    ]
+    hits = [
+        {},
+        {"python": [18]},
+        {"python": [0, 17], "django": [25], "kafka": [36]},
+    ]
+    ranked = ranker.rank(jobs, hits, roles=[])
+    assert [job["title"] for job in ranked] == ["Python Developer", "Backend Developer", "Office Manager"]
+    assert ranked[0]["relevance_score"] == 1.0
+    assert ranked[-1]["relevance_score"] == 0.0
+
+
+def test_recency_breaks_ties_between_equal_matches():
+    ranker = JobRanker()
+    jobs = [
+        make_job("Python Developer", posted_date="30+ days ago"),
+        make_job("Python Developer", posted_date="Recently"),
+        make_job("Python Developer", posted_date="Just posted"),
+    ]
+    hits = [{"python": [0]}] * 3
+    ranked = ranker.rank(jobs, hits, roles=[])
+    assert [job["posted_date"] for job in ranked] == ["Just posted", "Recently", "30+ days ago"]
+
+
+def test_parse_posted_age():
+    assert parse_posted_age("Just posted") == 0.0
+    assert parse_posted_age("Posted 3 days ago") == 3
+    assert parse_posted_age("2w") == 14
+    assert parse_posted_age("Recently") is None
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Tests for the multi-keyword matcher
+"""
+from keyword_matcher import KeywordMatcher
+from skill_taxonomy import normalize_skill
+
+
+def keys(matcher, text):
+    return sorted({key for _, _, key in matcher.find_all(normalize_skill(text))})
+
+
+def test_keywords_only_match_whole_words():
+    matcher = KeywordMatcher([("go", "go"), ("java", "java"), ("sql", "sql")])
+    assert keys(matcher, "Worked at Google on JavaScript and NoSQL stores") == []
+    assert keys(matcher, "Go, Java and SQL") == ["go", "java", "sql"]
+
+
+def test_multi_word_and_overlapping_keywords():
+    matcher = KeywordMatcher([("machine learning", "ml"), ("learning", "learning"), ("c++", "cpp")])
+    assert keys(matcher, "Machine-learning models in C++") == ["cpp", "learning", "ml"]
+    assert keys(matcher, "C++17 experience") == []
+
+
+def test_count_reports_every_occurrence():
+    matcher = KeywordMatcher([("python", "python"), ("python3", "python")])
+    text = normalize_skill("Python, python3 and more Python")
+    assert matcher.count(text) == {"python": [0, 7, 24]}
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for the /match/async job queue
+"""
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+from match_queue import MatchJobStore, MatchJobQueue, QueueFullError, WebhookURLError
+
+
+def make_queue(**kwargs):
+    store = MatchJobStore(db_path=os.path.join(tempfile.mkdtemp(), "match_jobs.db"))
+    return MatchJobQueue(store=store, **kwargs)
+
+
+def check(queue, url):
+    asyncio.run(queue.check_webhook_url(url))
+
+
+@pytest.mark.parametrize("url", [
+    "http://127.0.0.1:8000/hook",
+    "http://169.254.169.254/latest/meta-data/",
+    "http://10.0.0.5/hook",
+    "http://[::1]/hook",
+    "ftp://8.8.8.8/hook",
+    "not a url",
+])
+def test_webhooks_to_internal_or_non_http_urls_are_rejected(url):
+    with pytest.raises(WebhookURLError):
+        check(make_queue(), url)
+
+
+def test_public_and_allowlisted_webhooks_are_accepted():
+    queue = make_queue()
+    check(queue, "https://8.8.8.8/hook")
+    queue.webhook_allowed_hosts = {"127.0.0.1"}
+    check(queue, "http://127.0.0.1:8000/hook")
+
+
+def test_full_queue_rejects_with_retry_after():
+    async def run():
+        release = asyncio.Event()
+
+        async def handler(payload):
+            await release.wait()
+            return {}
+
+        queue = make_queue(max_queue=1, workers=1)
+        queue.drain_timeout = 0
+        await queue.start(handler)
+        try:
+            await queue.submit({})
+            await asyncio.sleep(0)  # the worker takes the first job
+            await queue.submit({})
+            with pytest.raises(QueueFullError) as excinfo:
+                await queue.submit({})
+            assert excinfo.value.retry_after >= 1
+            assert queue.stats()["rejected"] == 1
+        finally:
+            release.set()
+            await queue.close()
+
+    asyncio.run(run())
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Tests for fuzzy skill matching
+"""
+from skill_matcher import SkillMatcher
+from skill_taxonomy import SkillTaxonomy
+
+
+def fuzzy_matcher():
+    # A taxonomy that resolves nothing, so only the fuzzy path is exercised
+    return SkillMatcher(taxonomy=SkillTaxonomy({"skills": [{"name": "placeholder"}]}))
+
+
+def matched(matcher, resume_skill, job_skill):
+    return bool(matcher.match([resume_skill], [job_skill]))
+
+
+def test_skills_sharing_one_word_do_not_match():
+    matcher = fuzzy_matcher()
+    for resume_skill, job_skill in [
+        ("Project Management", "Product Management"),
+        ("Linux Administration", "Windows Administration"),
+        ("Java", "Java EE"),
+        ("Java", "JavaScript"),
+        ("Communication", "Stakeholder Communication"),
+    ]:
+        assert not matched(matcher, resume_skill, job_skill), (resume_skill, job_skill)
+
+
+def test_acronyms_match():
+    matcher = fuzzy_matcher()
+    assert matched(matcher, "JS", "JavaScript")
+    assert matched(matcher, "ML", "Machine Learning")
+
+
+def test_spelling_variants_match():
+    matcher = fuzzy_matcher()
+    for resume_skill, job_skill in [
+        ("Postgres", "PostgreSQL"),
+        ("Kubernets", "Kubernetes"),
+        ("Micro services", "Microservices"),
+        ("Rest APIs", "REST API"),
+        ("Behaviour Driven Development", "Behavior Driven Development"),
+        ("Optimisation", "Optimization"),
+    ]:
+        assert matched(matcher, resume_skill, job_skill), (resume_skill, job_skill)
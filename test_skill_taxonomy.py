@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Tests for the skill taxonomy
+"""
+from job_ranker import skill_weights_from_text
+from skill_taxonomy import skill_taxonomy
+
+
+def test_scrum_and_kanban_are_related_to_agile_not_aliases():
+    agile, scrum, kanban = (skill_taxonomy.resolve(name) for name in ("Agile", "Scrum", "Kanban"))
+    assert len({agile, scrum, kanban}) == 3
+    assert "agile" in skill_taxonomy.categories(scrum) & skill_taxonomy.categories(kanban)
+
+
+def test_single_letter_languages_need_context_in_free_text():
+    assert skill_taxonomy.resolve("R") is not None
+    # Weight 1.0 means no mentions found for the first-listed skill
+    assert skill_weights_from_text(["R"], "Our R&D team reports to C-level staff")["r"] == 1.0
+    assert skill_weights_from_text(["C"], "Our R&D team reports to C-level staff")["c"] == 1.0
+    assert skill_weights_from_text(["R"], "R programming and RStudio experience")["r"] > 1.0
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for extracted text cleanup
+"""
+from text_preprocessor import TextPreprocessor, is_boilerplate_heading
+
+
+def prepare(text):
+    cleaned, _ = TextPreprocessor(token_budget=0).prepare(text)
+    return cleaned
+
+
+def test_boilerplate_sections_are_dropped():
+    cleaned = prepare("\n".join([
+        "Requirements:",
+        "5 years of Python and PostgreSQL",
+        "Benefits:",
+        "Unlimited PTO and a gym stipend",
+        "About Us",
+        "We are a fast-growing fintech startup",
+    ]))
+    assert "Python and PostgreSQL" in cleaned
+    assert "gym stipend" not in cleaned
+    assert "fintech startup" not in cleaned
+
+
+def test_skill_sections_mentioning_boilerplate_words_survive():
+    cleaned = prepare("\n".join([
+        "Data Privacy:",
+        "GDPR compliance, data masking, DLP tooling",
+        "Benefits Administration:",
+        "Workday, ADP",
+    ]))
+    assert "GDPR compliance" in cleaned
+    assert "Workday, ADP" in cleaned
+
+
+def test_boilerplate_headings_match_whole_heading_only():
+    assert is_boilerplate_heading("Privacy Policy:")
+    assert is_boilerplate_heading("- BENEFITS & PERKS")
+    assert not is_boilerplate_heading("Data Privacy")
+    assert not is_boilerplate_heading("Privacy Engineering")
+
+
+def test_headers_footers_and_page_numbers_are_stripped():
+    pages = [
+        "Jane Doe - Resume\nPython developer with Django experience\nPage 1 of 2",
+        "Jane Doe - Resume\nBuilt Kafka pipelines on AWS\nPage 2 of 2",
+    ]
+    cleaned = prepare("\f".join(pages))
+    # The repeated header is kept once; page numbers go entirely
+    assert cleaned.count("Jane Doe - Resume") == 1
+    assert "Page" not in cleaned
+    assert "Django" in cleaned and "Kafka" in cleaned
+
+
+def test_stock_eeo_sentences_are_stripped():
+    cleaned = prepare("\n".join([
+        "We use Terraform and Kubernetes daily.",
+        "Acme is an equal opportunity employer.",
+    ]))
+    assert "Terraform" in cleaned
+    assert "equal opportunity" not in cleaned
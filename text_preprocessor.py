@@ -0,0 +1,212 @@
+"""
+Token-budgeted cleanup of document text before it is sent to Gemini
+"""
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from keyword_matcher import KeywordMatcher
+from skill_batcher import estimate_tokens
+from skill_taxonomy import SkillTaxonomy, normalize_skill, skill_taxonomy
+
+PAGE_BREAK = "\f"
+
+_WHITESPACE_RE = re.compile(r'[ \t\u00a0\u200b]+')
+_PAGE_NUMBER_RE = re.compile(r'^(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?$', re.IGNORECASE)
+_BULLET_RE = re.compile(r'^[•●▪‣⁃\-\*·]+\s*')
+
+# Stock EEO / legal sentences that never carry skills. Only whole phrasings are matched, so a line that
+# merely mentions a topic ("experience with background check systems") is kept; boilerplate sections
+# (see BOILERPLATE_SECTION_RE) are dropped as a whole instead.
+BOILERPLATE_PATTERNS = [
+    r'\b(is|are) an? (proud )?equal (employment )?opportunity( (and|/) affirmative action)? employer',
+    r'\beeo(/aa)? (employer|statement)',
+    r'\baffirmative action employer',
+    r'without regard to (their )?(race|color|colour|religion|creed|sex|gender|age|national origin)',
+    r'\b(provide|make|offer) reasonable accommodations? (to|for) (qualified )?(individuals|applicants|candidates|'
+    r'employees|people)',
+    r'\b(request|need|require) an? reasonable accommodation',
+    r'\bparticipates? in (the )?e-?verify',
+    r'\b(contingent (up)?on|subject to) (the )?(successful (completion of )?|satisfactory )?(an? )?'
+    r'(criminal )?background (check|screening)',
+    r'\b(see|read|review|consult) (our|the) (applicant |candidate )?privacy (policy|notice)',
+    r'\bby (applying|submitting)\b.*\bprivacy (policy|notice)',
+    r'\bpay transparency (nondiscrimination )?(policy|provision|statement|notice)',
+    r'\b(is|are|maintain) an? drug[- ]free (workplace|work environment)',
+]
+_BOILERPLATE_RE = re.compile('|'.join(BOILERPLATE_PATTERNS), re.IGNORECASE)
+
+# Section headings whose content is kept first when the text must be cut
+SKILL_SECTION_RE = re.compile(
+    r'skill|requirement|qualification|technolog|technical|tools|stack|experience|responsibilit|'
+    r'project|certification|competenc|expertise|what you', re.IGNORECASE
+)
+# Matched against the whole heading, so "Data Privacy" or "Benefits Administration" stay
+BOILERPLATE_SECTION_RE = re.compile(
+    r'(equal (employment )?opportunity( employer| statement)?|eeo( statement)?|about us|about the company|'
+    r'who we are|(our |employee )?benefits( (and|&) perks)?|perks( (and|&) benefits)?|'
+    r'privacy (notice|policy|statement)|(legal )?disclaimer|how to apply)', re.IGNORECASE
+)
+# Other common resume / job description headings
+_OTHER_SECTION_RE = re.compile(
+    r'summary|overview|profile|objective|education|about|role|position|contact|languages|interests|'
+    r'awards|publications|volunteer|references|compensation|salary|location', re.IGNORECASE
+)
+
+
+def is_boilerplate_heading(heading: str) -> bool:
+    """True if a heading, minus bullet and trailing colon, is a boilerplate section title"""
+    return BOILERPLATE_SECTION_RE.fullmatch(_BULLET_RE.sub('', heading).rstrip(': ')) is not None
+
+
+def _is_heading(line: str) -> bool:
+    """Short line ending in a colon or in capitals, or a title-case line naming a known section"""
+    words = line.rstrip(':').split()
+    if not 0 < len(words) <= 6 or line.endswith('.'):
+        return False
+    if line.endswith(':') or (line.isupper() and len(line) > 3):
+        return True
+    return (len(words) <= 4 and all(word[0].isupper() for word in words if word[0].isalpha())
+            and (is_boilerplate_heading(line)
+                 or any(pattern.search(line) for pattern in (SKILL_SECTION_RE, _OTHER_SECTION_RE))))
+
+
+class TextPreprocessor:
+    """Shrink extracted PDF text to what the skill extraction prompt needs.
+
+    Steps, in order: collapse whitespace; drop page numbers and lines that
+    repeat across pages (headers and footers, keeping the first); drop
+    stock EEO, accommodation and privacy sentences and boilerplate
+    sections (benefits, about us); then, if the text is still
+    over ``token_budget`` estimated tokens, keep whole sections in order of
+    priority (skills-style headings first, then sections dense in known
+    skills) and cut the last one at a line boundary. Kept sections stay in
+    their original order.
+    """
+
+    def __init__(self, token_budget: Optional[int] = None, taxonomy: Optional[SkillTaxonomy] = None):
+        self.token_budget = token_budget if token_budget is not None else int(os.getenv("LLM_TEXT_TOKEN_BUDGET", "6000"))
+        taxonomy = taxonomy or skill_taxonomy
+        self._skill_matcher = KeywordMatcher(
+            (alias, skill_id) for skill_id in range(len(taxonomy)) for alias in taxonomy.text_aliases(skill_id)
+        )
+
+        # Metrics
+        self.documents = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+        self.truncated = 0
+
+    def _clean_lines(self, text: str) -> Tuple[List[str], int]:
+        pages = [
+            [_WHITESPACE_RE.sub(' ', line).strip() for line in page.splitlines()]
+            for page in text.split(PAGE_BREAK)
+        ]
+        pages = [[line for line in page if line] for page in pages]
+
+        # Headers and footers: short lines on at least half of the pages (min. 2)
+        page_counts = Counter(line for page in pages for line in set(page))
+        repeat_floor = max(2, (len(pages) + 1) // 2)
+        repeated = {line for line, count in page_counts.items() if count >= repeat_floor and len(line) <= 100}
+
+        kept, removed, seen_repeated = [], 0, set()
+        for page in pages:
+            for line in page:
+                if _PAGE_NUMBER_RE.match(line) or _BOILERPLATE_RE.search(line):
+                    removed += 1
+                    continue
+                # Repeated headings stay, so the lines after them keep their section
+                if line in repeated and not _is_heading(_BULLET_RE.sub('', line)):
+                    if line in seen_repeated:
+                        removed += 1
+                        continue
+                    seen_repeated.add(line)
+                kept.append(line)
+        return kept, removed
+
+    def _sections(self, lines: List[str]) -> List[Tuple[Optional[str], List[str]]]:
+        sections: List[Tuple[Optional[str], List[str]]] = [(None, [])]
+        for line in lines:
+            if _is_heading(_BULLET_RE.sub('', line)):
+                sections.append((line, [line]))
+            else:
+                sections[-1][1].append(line)
+        return [section for section in sections if section[1]]
+
+    def _section_priority(self, heading: Optional[str], lines: List[str]) -> float:
+        body = " ".join(lines)
+        skills = len(self._skill_matcher.find_all(normalize_skill(body)))
+        density = skills / max(estimate_tokens(body), 1)
+        if heading is not None and SKILL_SECTION_RE.search(heading):
+            return 2.0 + density
+        if heading is None:
+            # The untitled opening (name, title, summary) is usually informative
+            return 1.0 + density
+        return density
+
+    def _fit(self, sections: List[Tuple[Optional[str], List[str]]]) -> List[str]:
+        order = sorted(range(len(sections)), key=lambda i: self._section_priority(*sections[i]), reverse=True)
+        remaining = self.token_budget
+        chosen: Dict[int, List[str]] = {}
+        for index in order:
+            if remaining <= 0:
+                break
+            taken = []
+            for line in sections[index][1]:
+                cost = estimate_tokens(line)
+                if cost > remaining:
+                    break
+                taken.append(line)
+                remaining -= cost
+            if taken:
+                chosen[index] = taken
+        return [line for index in sorted(chosen) for line in chosen[index]]
+
+    def prepare(self, text: str) -> Tuple[str, Dict[str, Any]]:
+        """Return the cleaned, budgeted text and a before/after size report"""
+        lines, removed = self._clean_lines(text)
+        sections, headings = [], set()
+        for heading, section_lines in self._sections(lines):
+            if heading is not None:
+                # Boilerplate sections, and repeated headings left with nothing under them, are dropped
+                if is_boilerplate_heading(heading) or (len(section_lines) == 1 and heading in headings):
+                    continue
+                headings.add(heading)
+            sections.append((heading, section_lines))
+        removed += len(lines) - sum(len(section_lines) for _, section_lines in sections)
+        lines = [line for _, section_lines in sections for line in section_lines]
+
+        truncated = False
+        if self.token_budget > 0 and sum(estimate_tokens(line) for line in lines) > self.token_budget:
+            lines, truncated = self._fit(sections), True
+
+        cleaned = "\n".join(lines)
+        report = {
+            "chars_before": len(text),
+            "chars_after": len(cleaned),
+            "tokens_before": estimate_tokens(text),
+            "tokens_after": estimate_tokens(cleaned),
+            "lines_removed": removed,
+            "truncated": truncated
+        }
+        self.documents += 1
+        self.tokens_before += report["tokens_before"]
+        self.tokens_after += report["tokens_after"]
+        self.truncated += truncated
+        return cleaned, report
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of preprocessing counters"""
+        return {
+            "token_budget": self.token_budget,
+            "documents": self.documents,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "tokens_saved_pct": round((1 - self.tokens_after / self.tokens_before) * 100, 1) if self.tokens_before else 0.0,
+            "truncated": self.truncated
+        }
+
+
+# Global text preprocessor instance
+text_preprocessor = TextPreprocessor()
@@ -0,0 +1,84 @@
+"""
+Background warm-up of heavy clients and worker pools after the server starts accepting requests
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+Step = Callable[[], Awaitable[Any]]
+
+
+class WarmUp:
+    """Run named initialization steps in the background.
+
+    Steps are grouped into stages: the steps of a stage run concurrently
+    and each stage starts once the previous one finished. Startup only
+    schedules them, so the server (and its health
+    endpoints) answer immediately while the Gemini SDK, the HTTP session
+    and the worker pools load. Each component still initializes itself on
+    first use, so a request arriving before its step finished just pays
+    that cost itself. A failing step is recorded and does not stop the
+    others.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.state: Dict[str, str] = {}
+        self.seconds: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._finished_at: Optional[float] = None
+
+    def start(self, stages: List[Dict[str, Step]]):
+        """Schedule ``stages`` (each a dict of name -> coroutine function) on the running event loop"""
+        self.started = time.time()
+        self.state = {name: "pending" for steps in stages for name in steps}
+        self._task = asyncio.create_task(self._run(stages))
+
+    async def _run(self, stages: List[Dict[str, Step]]):
+        async def run_step(name: str, step: Step):
+            start = time.perf_counter()
+            try:
+                await step()
+                self.state[name] = "ready"
+            except Exception as e:
+                self.state[name] = f"error: {e}"
+                print(f"Warm-up step {name} failed: {e}")
+            self.seconds[name] = round(time.perf_counter() - start, 3)
+
+        for steps in stages:
+            await asyncio.gather(*(run_step(name, step) for name, step in steps.items()))
+        self._finished_at = time.time()
+
+    @property
+    def finished(self) -> bool:
+        return self._finished_at is not None
+
+    async def cancel(self):
+        """Stop unfinished steps (called at application shutdown)"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Readiness snapshot: overall status and the state and duration of every step"""
+        if not self.finished:
+            status = "warming"
+        elif all(state == "ready" for state in self.state.values()):
+            status = "ready"
+        else:
+            status = "degraded"
+        return {
+            "status": status,
+            "uptime_seconds": round(time.time() - self.started, 3),
+            "warmup_seconds": round(self._finished_at - self.started, 3) if self.finished else None,
+            "components": {
+                name: {"state": state, "seconds": self.seconds.get(name)} for name, state in self.state.items()
+            }
+        }
+
+
+# Global warm-up instance
+warm_up = WarmUp()
@@ -0,0 +1,85 @@
+"""
+Request-count recycling of multi-worker server processes without dropping keep-alive requests
+"""
+import asyncio
+import os
+import signal
+import time
+from typing import Any, Dict, Optional
+
+
+class WorkerRecycler:
+    """Restart a worker process after it served a number of requests.
+
+    gunicorn's own ``max_requests`` makes the worker exit as soon as the
+    count is reached, closing idle keep-alive connections that a client
+    may be sending its next request on. Instead, once ``limit`` requests
+    were served the worker starts draining: every response carries
+    ``Connection: close`` so clients reconnect (to another worker) after
+    their current request, and after ``drain_seconds`` the worker stops
+    itself with SIGTERM, the same graceful shutdown gunicorn uses, and the
+    master forks a replacement. Only armed in gunicorn workers (see
+    gunicorn.conf.py); a single-process server never recycles.
+    """
+
+    def __init__(self):
+        self.limit: Optional[int] = None
+        self.drain_seconds = 0.0
+        self.requests = 0
+        self.draining_since: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def arm(self, limit: int, drain_seconds: float):
+        """Recycle this process after ``limit`` requests (0 disables)"""
+        self.limit = limit or None
+        self.drain_seconds = drain_seconds
+
+    @property
+    def draining(self) -> bool:
+        return self.draining_since is not None
+
+    def count_request(self):
+        self.requests += 1
+        if self.limit is not None and self.requests >= self.limit and not self.draining:
+            self.draining_since = time.time()
+            self._task = asyncio.get_running_loop().create_task(self._stop_after_drain())
+
+    async def _stop_after_drain(self):
+        await asyncio.sleep(self.drain_seconds)
+        print(f"Recycling worker {os.getpid()} after {self.requests} requests")
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    def stats(self) -> Dict[str, Any]:
+        """Recycling state of this worker process"""
+        return {
+            "pid": os.getpid(),
+            "requests": self.requests,
+            "recycle_after": self.limit,
+            "draining": self.draining
+        }
+
+
+class RecyclingMiddleware:
+    """ASGI middleware counting requests for the recycler and closing connections while it drains"""
+
+    def __init__(self, app, recycler: WorkerRecycler):
+        self.app = app
+        self.recycler = recycler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self.recycler.count_request()
+
+        async def send_with_close(message):
+            if message["type"] == "http.response.start" and self.recycler.draining:
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"connection", b"close")]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_close)
+
+
+# Global worker recycler instance
+worker_recycler = WorkerRecycler()